@@ -27,13 +27,13 @@ __author__ = 'Thang Quach'
 __date__ = '2024-11-20'
 __copyright__ = '(L) 2024 by Thang Quach'
 
-from PyQt5.QtWidgets import QInputDialog
-
 # noinspection PyPep8Naming
 def classFactory(iface):  # pylint: disable=invalid-name  
   try:
       import vgrid
   except ImportError:
+    # Imported here so that worker processes importing the package do not load Qt
+    from PyQt5.QtWidgets import QInputDialog
     command = "import pip\npip.main(['install','vgrid'])"   
     text, ok = QInputDialog.getMultiLineText(None, "Vgrid DGGS - Vgrid module not found", 
                                             "To run Vgrid Tools, please copy and run this code in the Python console to install vgrid package and reload QGIS:", 
@@ -26,9 +26,12 @@ from qgis.PyQt.QtCore import QCoreApplication,QSettings,Qt
 from PyQt5.QtCore import QVariant
 import os, statistics
 from shapely.geometry import  Polygon
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from collections import defaultdict, Counter    
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 from vgrid.utils import geohash
 from vgrid.conversion.latlon2dggs import latlon2geohash
 
@@ -170,11 +173,13 @@ class GeohashBin(QgsProcessingAlgorithm):
         geohash_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         geohash_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             geohash_id = latlon2geohash(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -193,19 +198,9 @@ class GeohashBin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_geohash_bins = len(geohash_bins)
         for i, geohash_id in enumerate(geohash_bins.keys()):
-            geohash_bbox =  geohash.bbox(geohash_id)
-            min_lat, min_lon = geohash_bbox['s'], geohash_bbox['w']  # Southwest corner
-            max_lat, max_lon = geohash_bbox['n'], geohash_bbox['e']  # Northeast corner        
-            # Define the polygon based on the bounding box
-            cell_polygon = Polygon([
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat]   # Closing the polygon (same as the first point)
-            ])
-
-            geohash_geometries[geohash_id] = cell_polygon
+            cell = get_cell('geohash', geohash_id)
+            if cell:
+                geohash_geometries[geohash_id] = cell[1]
 
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_geohash_bins * 100))
@@ -231,7 +226,7 @@ class GeohashBin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each geohash bin and update progress
         total_geohash_geometries = len(geohash_geometries)
@@ -269,7 +264,7 @@ class GeohashBin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             geohash_feature = QgsFeature(out_fields)
-            geohash_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            geohash_feature.setGeometry(geom)
             geohash_feature.setAttributes([props.get(f.name(), None) if f.name() != 'geohash' else geohash_id for f in out_fields])
             sink.addFeature(geohash_feature, QgsFeatureSink.FastInsert)
 
@@ -27,9 +27,12 @@ from PyQt5.QtCore import QVariant
 import os, statistics
 import h3
 from shapely.geometry import Point, Polygon, shape
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from collections import defaultdict, Counter    
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 
 class H3Bin(QgsProcessingAlgorithm):
     INPUT = 'INPUT'
@@ -169,11 +172,13 @@ class H3Bin(QgsProcessingAlgorithm):
         h3_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         h3_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             h3_id = h3.latlng_to_cell(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -192,8 +197,9 @@ class H3Bin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_h3_bins = len(h3_bins)
         for i, h3_id in enumerate(h3_bins.keys()):
-            coords = [(lng, lat) for lat, lng in h3.cell_to_boundary(h3_id)]
-            h3_geometries[h3_id] = Polygon(coords)
+            cell = get_cell('h3', h3_id)
+            if cell:
+                h3_geometries[h3_id] = cell[1]
 
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_h3_bins * 100))
@@ -219,7 +225,7 @@ class H3Bin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each H3 bin and update progress
         total_h3_geometries = len(h3_geometries)
@@ -257,7 +263,7 @@ class H3Bin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             h3_feature = QgsFeature(out_fields)
-            h3_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            h3_feature.setGeometry(geom)
             h3_feature.setAttributes([props.get(f.name(), None) if f.name() != 'h3' else h3_id for f in out_fields])
             sink.addFeature(h3_feature, QgsFeatureSink.FastInsert)
 
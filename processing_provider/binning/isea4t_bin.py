@@ -27,9 +27,12 @@ from PyQt5.QtCore import QVariant
 import os, statistics
 from collections import defaultdict, Counter    
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 from shapely.geometry import Polygon
 from shapely.wkt import loads
+from ...utils.geometry import shapely_to_qgsgeometry
 
 import platform
 if (platform.system() == 'Windows'):
@@ -182,11 +185,13 @@ class ISEA4TBin(QgsProcessingAlgorithm):
             isea4t_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
             isea4t_geometries = {}
 
-            total_points = sum(1 for _ in self.point_layer.getFeatures())
+            total_points = self.point_layer.featureCount()
+            # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+            request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
             feedback.setProgress(0)  # Initial progress value
 
             # Process each point and update progress
-            for i, point_feature in enumerate(self.point_layer.getFeatures()):
+            for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
                 point = point_feature.geometry().asPoint()
                 isea4t_id = latlon2isea4t(point.y(), point.x(), self.resolution)
                 props = point_feature.attributes()
@@ -205,15 +210,10 @@ class ISEA4TBin(QgsProcessingAlgorithm):
             # Generate geometries and update progress
             total_isea4t_bins = len(isea4t_bins)
             for i, isea4t_id in enumerate(isea4t_bins.keys()):
-                cell_to_shape = isea4t_dggs.convert_dggs_cell_outline_to_shape_string(DggsCell(isea4t_id),ShapeStringFormat.WKT)
-                cell_to_shape_fixed = loads(fix_isea4t_wkt(cell_to_shape))
-                if isea4t_id.startswith('00') or isea4t_id.startswith('09') or isea4t_id.startswith('14')\
-                    or isea4t_id.startswith('04') or isea4t_id.startswith('19'):
-                    cell_to_shape_fixed = fix_isea4t_antimeridian_cells(cell_to_shape_fixed)
-                
-                cell_polygon = Polygon(list(cell_to_shape_fixed.exterior.coords))
-            
-                isea4t_geometries[isea4t_id] = cell_polygon
+                cell = get_cell('isea4t', isea4t_id)
+                if cell:
+                    isea4t_geometries[isea4t_id] = cell[1]
+
                 # Update progress after each geometry is generated
                 feedback.setProgress(int((i + 1) / total_isea4t_bins * 100))
 
@@ -238,7 +238,7 @@ class ISEA4TBin(QgsProcessingAlgorithm):
                     out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
             # Create the sink for the output
-            (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+            (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
             # Process each isea4t bin and update progress
             total_isea4t_geometries = len(isea4t_geometries)
@@ -276,7 +276,7 @@ class ISEA4TBin(QgsProcessingAlgorithm):
                         props[f'{prefix}variety'] = len(set(values['values']))
 
                 isea4t_feature = QgsFeature(out_fields)
-                isea4t_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+                isea4t_feature.setGeometry(geom)
                 isea4t_feature.setAttributes([props.get(f.name(), None) if f.name() != 'isea4t' else isea4t_id for f in out_fields])
                 sink.addFeature(isea4t_feature, QgsFeatureSink.FastInsert)
 
@@ -26,9 +26,12 @@ from qgis.PyQt.QtCore import QCoreApplication,QSettings,Qt
 from PyQt5.QtCore import QVariant
 import os, statistics
 from shapely.geometry import  Polygon
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from collections import defaultdict, Counter    
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 from vgrid.utils import olc
 from vgrid.conversion.latlon2dggs import latlon2olc
 
@@ -174,11 +177,13 @@ class OLCBin(QgsProcessingAlgorithm):
         olc_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         olc_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             olc_id = latlon2olc(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -197,20 +202,9 @@ class OLCBin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_olc_bins = len(olc_bins)
         for i, olc_id in enumerate(olc_bins.keys()):
-            coord = olc.decode(olc_id)    
-            # Create the bounding box coordinates for the polygon
-            min_lat, min_lon = coord.latitudeLo, coord.longitudeLo
-            max_lat, max_lon = coord.latitudeHi, coord.longitudeHi        
-            # Define the polygon based on the bounding box
-            cell_polygon = Polygon([
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat]   # Closing the polygon (same as the first point)
-            ])  
-            
-            olc_geometries[olc_id] = cell_polygon
+            cell = get_cell('olc', olc_id)
+            if cell:
+                olc_geometries[olc_id] = cell[1]
 
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_olc_bins * 100))
@@ -236,7 +230,7 @@ class OLCBin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each olc bin and update progress
         total_olc_geometries = len(olc_geometries)
@@ -274,7 +268,7 @@ class OLCBin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             olc_feature = QgsFeature(out_fields)
-            olc_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            olc_feature.setGeometry(geom)
             olc_feature.setAttributes([props.get(f.name(), None) if f.name() != 'olc' else olc_id for f in out_fields])
             sink.addFeature(olc_feature, QgsFeatureSink.FastInsert)
 
@@ -28,6 +28,8 @@ from collections import defaultdict, Counter
 from shapely.geometry import shape
 import json
 from ...utils.imgs import Imgs
+from ...utils.geometry import qgsgeometry_to_shapely
+from ...utils.reproject import crs_request
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
 
 class PolygonBin(QgsProcessingAlgorithm):
@@ -150,18 +152,20 @@ class PolygonBin(QgsProcessingAlgorithm):
         bin_results = {}
 
         total_polygons = self.polygon_layer.featureCount()
+        # Points are reprojected to the polygon layer's CRS on the fly by the feature iterator
+        point_request = crs_request(self.point_layer.sourceCrs(), self.polygon_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)
 
         for i, polygon_feature in enumerate(self.polygon_layer.getFeatures()):
-            poly_geom = shape(json.loads(polygon_feature.geometry().asJson()))
+            poly_geom = qgsgeometry_to_shapely(polygon_feature.geometry())
             bin_key = polygon_feature.id()
             bin_results[bin_key] = defaultdict(get_default_stats_structure)
 
             progress = int((i / total_polygons) * 100)
             feedback.setProgress(progress)
 
-            for point_feature in self.point_layer.getFeatures():
-                pt_geom = shape(json.loads(point_feature.geometry().asJson()))
+            for point_feature in self.point_layer.getFeatures(point_request):
+                pt_geom = qgsgeometry_to_shapely(point_feature.geometry())
                 if poly_geom.contains(pt_geom):
                     props = point_feature.attributes()
                     props_dict = {self.point_layer.fields().at(i).name(): props[i] for i in range(len(props))}
@@ -27,9 +27,12 @@ from PyQt5.QtCore import QVariant
 import os, statistics
 from vgrid.utils import qtm
 from shapely.geometry import Point, Polygon, shape
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from collections import defaultdict, Counter    
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 
 class QTMBin(QgsProcessingAlgorithm):
     INPUT = 'INPUT'
@@ -169,11 +172,13 @@ class QTMBin(QgsProcessingAlgorithm):
         qtm_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         qtm_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             qtm_id = qtm.latlon_to_qtm_id(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -192,9 +197,9 @@ class QTMBin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_qtm_bins = len(qtm_bins)
         for i, qtm_id in enumerate(qtm_bins.keys()):
-            facet = qtm.qtm_id_to_facet(qtm_id)
-            cell_polygon = qtm.constructGeometry(facet)  
-            qtm_geometries[qtm_id] = cell_polygon
+            cell = get_cell('qtm', qtm_id)
+            if cell:
+                qtm_geometries[qtm_id] = cell[1]
 
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_qtm_bins * 100))
@@ -220,7 +225,7 @@ class QTMBin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each qtm bin and update progress
         total_qtm_geometries = len(qtm_geometries)
@@ -258,7 +263,7 @@ class QTMBin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             qtm_feature = QgsFeature(out_fields)
-            qtm_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            qtm_feature.setGeometry(geom)
             qtm_feature.setAttributes([props.get(f.name(), None) if f.name() != 'qtm' else qtm_id for f in out_fields])
             sink.addFeature(qtm_feature, QgsFeatureSink.FastInsert)
 
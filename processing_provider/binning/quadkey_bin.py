@@ -26,9 +26,12 @@ from qgis.PyQt.QtCore import QCoreApplication,QSettings,Qt
 from PyQt5.QtCore import QVariant
 import os,re, statistics
 from shapely.geometry import  Polygon
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from collections import defaultdict, Counter    
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 from vgrid.utils import mercantile
 from vgrid.conversion.latlon2dggs import latlon2quadkey
 
@@ -170,11 +173,13 @@ class QuadkeyBin(QgsProcessingAlgorithm):
         quadkey_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         quadkey_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             quadkey_id = latlon2quadkey(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -193,24 +198,9 @@ class QuadkeyBin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_quadkey_bins = len(quadkey_bins)
         for i, quadkey_id in enumerate(quadkey_bins.keys()):
-            tile = mercantile.quadkey_to_tile(quadkey_id)  
-            z = tile.z
-            x = tile.x
-            y = tile.y
-            # Get the bounds of the tile in (west, south, east, north)
-            bounds = mercantile.bounds(x, y, z)    
-            min_lat, min_lon = bounds.south, bounds.west
-            max_lat, max_lon = bounds.north, bounds.east
-
-            cell_polygon = Polygon([
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat]   # Closing the polygon (same as the first point)
-            ])
-
-            quadkey_geometries[quadkey_id] = cell_polygon
+            cell = get_cell('quadkey', quadkey_id)
+            if cell:
+                quadkey_geometries[quadkey_id] = cell[1]
 
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_quadkey_bins * 100))
@@ -236,7 +226,7 @@ class QuadkeyBin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each quadkey bin and update progress
         total_quadkey_geometries = len(quadkey_geometries)
@@ -274,7 +264,7 @@ class QuadkeyBin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             quadkey_feature = QgsFeature(out_fields)
-            quadkey_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            quadkey_feature.setGeometry(geom)
             quadkey_feature.setAttributes([props.get(f.name(), None) if f.name() != 'quadkey' else quadkey_id for f in out_fields])
             sink.addFeature(quadkey_feature, QgsFeatureSink.FastInsert)
 
@@ -27,7 +27,10 @@ from PyQt5.QtCore import QVariant
 import os, statistics
 from collections import defaultdict, Counter    
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 
 from vgrid.conversion.latlon2dggs import latlon2rhealpix
 from vgrid.utils.rhealpixdggs.dggs import RHEALPixDGGS
@@ -175,11 +178,13 @@ class rHEALPixBin(QgsProcessingAlgorithm):
         rhealpix_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         rhealpix_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             rhealpix_id = latlon2rhealpix(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -198,10 +203,10 @@ class rHEALPixBin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_rhealpix_bins = len(rhealpix_bins)
         for i, rhealpix_id in enumerate(rhealpix_bins.keys()):
-            rhealpix_uids = (rhealpix_id[0],) + tuple(map(int, rhealpix_id[1:]))
-            rhealpix_cell = rhealpix_dggs.cell(rhealpix_uids)
-            cell_polygon = rhealpix_cell_to_polygon(rhealpix_cell)
-            rhealpix_geometries[rhealpix_id] = cell_polygon
+            cell = get_cell('rhealpix', rhealpix_id)
+            if cell:
+                rhealpix_geometries[rhealpix_id] = cell[1]
+
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_rhealpix_bins * 100))
 
@@ -226,7 +231,7 @@ class rHEALPixBin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each rhealpix bin and update progress
         total_rhealpix_geometries = len(rhealpix_geometries)
@@ -264,7 +269,7 @@ class rHEALPixBin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             rhealpix_feature = QgsFeature(out_fields)
-            rhealpix_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            rhealpix_feature.setGeometry(geom)
             rhealpix_feature.setAttributes([props.get(f.name(), None) if f.name() != 'rhealpix' else rhealpix_id for f in out_fields])
             sink.addFeature(rhealpix_feature, QgsFeatureSink.FastInsert)
 
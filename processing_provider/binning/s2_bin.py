@@ -28,9 +28,12 @@ import os, statistics
 from vgrid.utils import s2
 from vgrid.conversion.latlon2dggs import latlon2s2
 from shapely.geometry import Point, Polygon, shape
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from collections import defaultdict, Counter    
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 from vgrid.utils.antimeridian import fix_polygon
  
 class S2Bin(QgsProcessingAlgorithm):
@@ -171,11 +174,13 @@ class S2Bin(QgsProcessingAlgorithm):
         s2_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         s2_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             s2_token = latlon2s2(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -194,24 +199,9 @@ class S2Bin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_s2_bins = len(s2_bins)
         for i, s2_token in enumerate(s2_bins.keys()):
-            s2_id = s2.CellId.from_token(s2_token)
-            s2_cell = s2.Cell(s2_id)
-        
-            vertices = [s2_cell.get_vertex(i) for i in range(4)]
-            # Prepare vertices in (longitude, latitude) format for Shapely
-            shapely_vertices = []
-            for vertex in vertices:
-                lat_lng = s2.LatLng.from_point(vertex)  # Convert Point to LatLng
-                longitude = lat_lng.lng().degrees  # Access longitude in degrees
-                latitude = lat_lng.lat().degrees   # Access latitude in degrees
-                shapely_vertices.append((longitude, latitude))
-
-            # Close the polygon by adding the first vertex again
-            shapely_vertices.append(shapely_vertices[0])  # Closing the polygon
-            # Create a Shapely Polygon
-            cell_polygon = fix_polygon(Polygon(shapely_vertices)) # Fix antimeridian        
-            # coords = [(lng, lat) for lat, lng in s2.cell_to_boundary(s2_token)]
-            s2_geometries[s2_token] = cell_polygon
+            cell = get_cell('s2', s2_token)
+            if cell:
+                s2_geometries[s2_token] = cell[1]
 
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_s2_bins * 100))
@@ -237,7 +227,7 @@ class S2Bin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each s2 bin and update progress
         total_s2_geometries = len(s2_geometries)
@@ -275,7 +265,7 @@ class S2Bin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             s2_feature = QgsFeature(out_fields)
-            s2_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            s2_feature.setGeometry(geom)
             s2_feature.setAttributes([props.get(f.name(), None) if f.name() != 's2' else s2_token for f in out_fields])
             sink.addFeature(s2_feature, QgsFeatureSink.FastInsert)
 
@@ -26,9 +26,12 @@ from qgis.PyQt.QtCore import QCoreApplication,QSettings,Qt
 from PyQt5.QtCore import QVariant
 import os,re, statistics
 from shapely.geometry import  Polygon
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
+from ...utils.conversion.dggscell import get_cell
 from collections import defaultdict, Counter    
 from ...utils.binning.bin_helper import append_stats_value, get_default_stats_structure
+from ...utils.reproject import wgs84_request, WGS84_CRS
 from vgrid.utils import mercantile
 from vgrid.conversion.latlon2dggs import latlon2tilecode
 
@@ -170,11 +173,13 @@ class TilecodeBin(QgsProcessingAlgorithm):
         tilecode_bins = defaultdict(lambda: defaultdict(get_default_stats_structure))
         tilecode_geometries = {}
 
-        total_points = sum(1 for _ in self.point_layer.getFeatures())
+        total_points = self.point_layer.featureCount()
+        # Points are reprojected to EPSG:4326 on the fly by the feature iterator
+        request = wgs84_request(self.point_layer.sourceCrs(), context.transformContext())
         feedback.setProgress(0)  # Initial progress value
 
         # Process each point and update progress
-        for i, point_feature in enumerate(self.point_layer.getFeatures()):
+        for i, point_feature in enumerate(self.point_layer.getFeatures(request)):
             point = point_feature.geometry().asPoint()
             tilecode_id = latlon2tilecode(point.y(), point.x(), self.resolution)
             props = point_feature.attributes()
@@ -193,23 +198,9 @@ class TilecodeBin(QgsProcessingAlgorithm):
         # Generate geometries and update progress
         total_tilecode_bins = len(tilecode_bins)
         for i, tilecode_id in enumerate(tilecode_bins.keys()):
-            match = re.match(r'z(\d+)x(\d+)y(\d+)', tilecode_id)    
-            # Convert matched groups to integers
-            z = int(match.group(1))
-            x = int(match.group(2))
-            y = int(match.group(3))
-            bounds = mercantile.bounds(x, y, z)    
-            min_lat, min_lon = bounds.south, bounds.west
-            max_lat, max_lon = bounds.north, bounds.east
-            cell_polygon = Polygon([
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat]   # Closing the polygon (same as the first point)
-            ])
-
-            tilecode_geometries[tilecode_id] = cell_polygon
+            cell = get_cell('tilecode', tilecode_id)
+            if cell:
+                tilecode_geometries[tilecode_id] = cell[1]
 
             # Update progress after each geometry is generated
             feedback.setProgress(int((i + 1) / total_tilecode_bins * 100))
@@ -235,7 +226,7 @@ class TilecodeBin(QgsProcessingAlgorithm):
                 out_fields.append(QgsField(f"{prefix}variety", QVariant.Int))
 
         # Create the sink for the output
-        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, self.point_layer.sourceCrs())
+        (sink, dest_id) = self.parameterAsSink(parameters, self.OUTPUT, context, out_fields, QgsWkbTypes.Polygon, WGS84_CRS)
 
         # Process each tilecode bin and update progress
         total_tilecode_geometries = len(tilecode_geometries)
@@ -273,7 +264,7 @@ class TilecodeBin(QgsProcessingAlgorithm):
                     props[f'{prefix}variety'] = len(set(values['values']))
 
             tilecode_feature = QgsFeature(out_fields)
-            tilecode_feature.setGeometry(QgsGeometry.fromWkt(geom.wkt))
+            tilecode_feature.setGeometry(geom)
             tilecode_feature.setAttributes([props.get(f.name(), None) if f.name() != 'tilecode' else tilecode_id for f in out_fields])
             sink.addFeature(tilecode_feature, QgsFeatureSink.FastInsert)
 
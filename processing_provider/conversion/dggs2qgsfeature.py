@@ -23,7 +23,8 @@ from qgis.core import (
     QgsProcessingFeatureBasedAlgorithm,
     QgsProcessingParameterEnum,
     QgsWkbTypes ,
-    QgsCoordinateReferenceSystem
+    QgsCoordinateReferenceSystem,
+    QgsFeatureRequest
     )
 
 from qgis.core import QgsApplication
@@ -34,6 +35,8 @@ import platform
 
 from ...utils.imgs import Imgs
 from ...utils.conversion.dggs2qgsfeature import *
+from ...utils.cellcache import cell_cache
+from ...utils.featurereader import read_column
 
 class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
     """
@@ -154,6 +157,8 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
         source = self.parameterAsSource(parameters, self.INPUT, context)
         self.total_features = source.featureCount()
         self.num_bad = 0
+        # The cell cache lives for the whole session; its counters are reported relative to this run
+        self.cache_stats = cell_cache.stats()
         
         self.CELL_ID = self.parameterAsString(parameters, self.CELL_ID, context)
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
@@ -177,6 +182,24 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
             self.DGGS_TYPE_functions['isea4t'] = isea4t2qgsfeature
             self.DGGS_TYPE_functions['isea3h'] = isea3h2qgsfeature
 
+        dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
+        if dggs_type == 'mgrs' or dggs_type in GRATICULE_BATCH_DECODERS:
+            cell_ids = read_column(source, self.CELL_ID)
+
+        if dggs_type == 'mgrs':
+            # Decode all MGRS IDs upfront so each UTM zone is transformed in a single batch
+            mgrs_bounds = mgrs_cells_to_bounds(cell_ids)
+            self.DGGS_TYPE_functions['mgrs'] = lambda feature, mgrs_id: mgrs2qgsfeature(feature, mgrs_id, mgrs_bounds)
+        elif dggs_type in GRATICULE_BATCH_DECODERS:
+            # Rectangular grids: decode the whole ID column into bounds arrays in one pass,
+            # IDs the batch decoder rejects go through the per-cell decoder (and its error reporting)
+            cell_bounds = graticule_cells_to_bounds(dggs_type, cell_ids)
+            decode_cell = self.DGGS_TYPE_functions[dggs_type]
+            self.DGGS_TYPE_functions[dggs_type] = lambda feature, cell_id: (
+                graticule2qgsfeature(feature, dggs_type, cell_id, cell_bounds) if cell_id in cell_bounds
+                else decode_cell(feature, cell_id)
+            )
+
         return True
     
 
@@ -218,6 +241,10 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
         return output_fields
 
     
+    def request(self):
+        # Cell geometries are rebuilt in EPSG:4326 from the ID, so the input geometry is never read or reprojected
+        return QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+
     def processFeature(self, feature, context, feedback):
         try:
             cell_id = feature[self.CELL_ID]
@@ -235,4 +262,8 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
     def postProcessAlgorithm(self, context, feedback):
         if self.num_bad:
             feedback.pushInfo(self.tr("{} out of {} features had invalid parameters and were ignored.".format(self.num_bad, self.total_features)))
+        stats = cell_cache.stats()
+        hits = stats['hits'] - self.cache_stats['hits']
+        misses = stats['misses'] - self.cache_stats['misses']
+        feedback.pushInfo("Cell cache: {} hits, {} misses, {}/{} cells cached.".format(hits, misses, stats['size'], stats['maxsize']))
         return {}
\ No newline at end of file
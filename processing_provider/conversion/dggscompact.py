@@ -35,16 +35,21 @@ from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtCore import QCoreApplication
 
 from ...utils.imgs import Imgs
+from ...utils.featurewriter import SinkFactory
 from ...utils.conversion.dggscompact import * 
 
 class DGGSCompact(QgsProcessingFeatureBasedAlgorithm):
     INPUT = 'INPUT'
     DGGS_FIELD = 'DGGS_FIELD'
     DGGS_TYPE = 'DGGS_TYPE'
+    MERGE_FIELD = 'MERGE_FIELD'
+    AGGREGATE = 'AGGREGATE'
+    AGGREGATE_FIELDS = 'AGGREGATE_FIELDS'
     OUTPUT = 'OUTPUT'
 
     DGGS_TYPES = ['H3','S2','rHEALPix', 
                   'QTM','OLC', 'Geohash', 'Tilecode', 'Quadkey']
+    AGGREGATES = ['None', 'Sum', 'Mean', 'Min', 'Max']
 
     if platform.system() == 'Windows':
         index = DGGS_TYPES.index('rHEALPix') + 1
@@ -132,11 +137,47 @@ class DGGSCompact(QgsProcessingFeatureBasedAlgorithm):
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.MERGE_FIELD,
+                "Merge only cells with equal value in",
+                parentLayerParameterName=self.INPUT,
+                optional=True
+            )
+        )
+
+        self.addParameter(QgsProcessingParameterEnum(
+            self.AGGREGATE,
+            "Aggregate numeric fields of merged cells",
+            options=self.AGGREGATES,
+            defaultValue=0
+        ))
+
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.AGGREGATE_FIELDS,
+                "Numeric fields to aggregate (default: all)",
+                parentLayerParameterName=self.INPUT,
+                type=QgsProcessingParameterField.Numeric,
+                allowMultiple=True,
+                optional=True
+            )
+        )
 
     def prepareAlgorithm(self, parameters, context, feedback):
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
         self.dggs_field = self.parameterAsString(parameters, self.DGGS_FIELD, context)
+        self.merge_field = self.parameterAsString(parameters, self.MERGE_FIELD, context) or None
+        self.aggregate = self.AGGREGATES[self.parameterAsEnum(parameters, self.AGGREGATE, context)].lower()
+        self.aggregate_fields = self.parameterAsFields(parameters, self.AGGREGATE_FIELDS, context) or None
+        if self.aggregate == 'none':
+            self.aggregate = 'mean'
+            self.aggregate_fields = []
+        self.keep_attributes = bool(self.merge_field or self.aggregate_fields != [])
+        if self.keep_attributes and self.dggs_type not in DGGS_RESOLUTIONS:
+            raise QgsProcessingException(f"Attribute compaction is not supported for {self.dggs_type.upper()}.")
+
         self.DGGS_TYPE_functions = {
             'h3': h3compact,
             's2': s2compact,
@@ -162,22 +203,18 @@ class DGGSCompact(QgsProcessingFeatureBasedAlgorithm):
 
         feedback.pushInfo(f"Compacting {self.dggs_type.upper()}")
 
-        memory_layer = conversion_function(dggs_layer, self.dggs_field,feedback)
-
-        if not isinstance(memory_layer, QgsVectorLayer) or not memory_layer.isValid():
+        # Features are written straight to the output sink in batches
+        create_sink = SinkFactory(self, parameters, self.OUTPUT, context)
+        if self.keep_attributes:
+            output = attributecompact(dggs_layer, self.dggs_type, self.dggs_field, self.merge_field, self.aggregate_fields,
+                                      self.aggregate, feedback, create_sink)
+        else:
+            output = conversion_function(dggs_layer, self.dggs_field,feedback, create_sink)
+
+        if output is None or create_sink.sink is None:
+            if feedback.isCanceled():
+                return {}
             raise QgsProcessingException("Invalid output layer returned from compact function.")
 
-        (sink, sink_id) = self.parameterAsSink(
-            parameters,
-            self.OUTPUT,
-            context,
-            memory_layer.fields(),
-            memory_layer.wkbType(),
-            memory_layer.crs()
-        )
-
-        for feature in memory_layer.getFeatures():
-            sink.addFeature(feature, QgsFeatureSink.FastInsert)
-
-        return {self.OUTPUT: sink_id}
+        return {self.OUTPUT: create_sink.sink_id}
     
@@ -24,6 +24,7 @@ from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtCore import QCoreApplication
 
 from ...utils.imgs import Imgs
+from ...utils.featurewriter import SinkFactory
 from ...utils.conversion.dggsexpand import * 
 
 class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
@@ -31,6 +32,7 @@ class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
     DGGS_FIELD = 'DGGS_FIELD'
     DGGS_TYPE = 'DGGS_TYPE'
     RESOLUTION = 'RESOLUTION'
+    MAX_CELLS = 'MAX_CELLS'
     OUTPUT = 'OUTPUT'
 
     DGGS_TYPES = ['H3','S2', 'rHEALPix', 'ISEA4T', 'ISEA3H', 'QTM',
@@ -126,9 +128,18 @@ class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
             maxValue=40
         ))
 
+        self.addParameter(QgsProcessingParameterNumber(
+            self.MAX_CELLS,
+            "Maximum output cells (0 = no limit)",
+            QgsProcessingParameterNumber.Integer,
+            0,
+            minValue=0
+        ))
+
     def prepareAlgorithm(self, parameters, context, feedback):
         selected_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
+        self.max_cells = self.parameterAsInt(parameters, self.MAX_CELLS, context)
                       
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
@@ -160,21 +171,13 @@ class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
 
         feedback.pushInfo(f"Expanding {self.dggs_type.upper()} at resolution {self.resolution}")
 
-        memory_layer = conversion_function(dggs_layer, self.resolution, self.dggs_field, feedback)
+        # Features are written straight to the output sink in batches
+        create_sink = SinkFactory(self, parameters, self.OUTPUT, context)
+        output = conversion_function(dggs_layer, self.resolution, self.dggs_field, feedback, create_sink, self.max_cells)
 
-        if not isinstance(memory_layer, QgsVectorLayer) or not memory_layer.isValid():
+        if output is None or create_sink.sink is None:
+            if feedback.isCanceled():
+                return {}
             raise QgsProcessingException("Invalid output layer returned from conversion function.")
 
-        (sink, sink_id) = self.parameterAsSink(
-            parameters,
-            self.OUTPUT,
-            context,
-            memory_layer.fields(),
-            memory_layer.wkbType(),
-            memory_layer.crs()
-        )
-
-        for feature in memory_layer.getFeatures():
-            sink.addFeature(feature, QgsFeatureSink.FastInsert)
-
-        return {self.OUTPUT: sink_id}
+        return {self.OUTPUT: create_sink.sink_id}
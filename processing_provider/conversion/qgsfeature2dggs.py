@@ -12,7 +12,9 @@ from qgis.core import (
     QgsProcessingParameterEnum,
     QgsProcessingParameterNumber,
     QgsProcessingParameterBoolean,
-    QgsWkbTypes    
+    QgsProcessingParameterFile,
+    QgsWkbTypes,
+    QgsCoordinateReferenceSystem
     )
 
 from qgis.core import QgsApplication
@@ -22,6 +24,9 @@ from qgis.PyQt.QtCore import QCoreApplication,QVariant
 import platform
 from ...utils.imgs import Imgs
 from ...utils.conversion.qgsfeature2dggs import *
+from ...utils.reproject import wgs84_request
+from ...utils.conversion.conversioncache import ConversionCache
+from ...utils.conversion import dggs2qgsfeature as cellid2qgsfeature
 from .dggs_settings import settings, DGGSettingsDialog
 
 class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
@@ -32,6 +37,9 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
     DGGS_TYPE = 'DGGS_TYPE'
     RESOLUTION = 'RESOLUTION'
     COMPACT = 'COMPACT'
+    CACHE = 'CACHE'
+    CACHE_MAX_SIZE = 'CACHE_MAX_SIZE'
+    CACHE_MAX_AGE = 'CACHE_MAX_AGE'
     
     DGGS_TYPES = [
         'H3', 'S2','rHEALPix','QTM', 'OLC', 'Geohash', 
@@ -104,6 +112,9 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
     def outputName(self):
         return self.tr('Vector2DGGS')
     
+    def outputCrs(self, input_crs):
+        return QgsCoordinateReferenceSystem("EPSG:4326")
+
     def outputWkbType(self, input_wkb_type):
         return (QgsWkbTypes.Polygon)   
     
@@ -143,6 +154,31 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
             defaultValue=False  
         ))
 
+        # Optional on-disk cache of cell IDs per feature geometry for incremental re-runs
+        self.addParameter(QgsProcessingParameterFile(
+            self.CACHE,
+            "Conversion cache (SQLite)",
+            behavior=QgsProcessingParameterFile.File,
+            fileFilter='SQLite (*.sqlite *.db)',
+            optional=True
+        ))
+
+        self.addParameter(QgsProcessingParameterNumber(
+            self.CACHE_MAX_SIZE,
+            "Conversion cache max size (MB)",
+            QgsProcessingParameterNumber.Double,
+            256,
+            minValue=0
+        ))
+
+        self.addParameter(QgsProcessingParameterNumber(
+            self.CACHE_MAX_AGE,
+            "Conversion cache max age (days)",
+            QgsProcessingParameterNumber.Integer,
+            30,
+            minValue=0
+        ))
+
     def checkParameterValues(self, parameters, context):
         """Dynamically update resolution limits before execution"""
         selected_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
@@ -207,6 +243,9 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
 
         self.total_features = source.featureCount()
         self.num_bad = 0
+        # Input geometries are reprojected to EPSG:4326 by the feature iterator (see request())
+        self.source_crs = source.sourceCrs()
+        self.transform_context = context.transformContext()
         
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.DGGS_TYPE_functions = {
@@ -225,8 +264,51 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
             self.DGGS_TYPE_functions['isea4t'] = qgsfeature2isea4t # Need to check polyline/ polygon2isea4t --> QGIS crashed
             self.DGGS_TYPE_functions['isea3h'] = qgsfeature2isea3h # Need to check polyline/ polygon2isea3h --> QGIS crashed
 
+        self.cache = None
+        cache_path = self.parameterAsFile(parameters, self.CACHE, context)
+        if cache_path:
+            self.cache = ConversionCache(
+                cache_path,
+                self.parameterAsDouble(parameters, self.CACHE_MAX_SIZE, context),
+                self.parameterAsInt(parameters, self.CACHE_MAX_AGE, context)
+            )
+            # Cached cell IDs are turned back into features with the CellID2DGGS decoders
+            self.DGGS_TYPE_decoders = {
+                'h3': cellid2qgsfeature.h32qgsfeature,
+                's2': cellid2qgsfeature.s22qgsfeature,
+                'rhealpix': rhealpixid2qgsfeature,
+                'qtm': cellid2qgsfeature.qtm2qgsfeature,
+                'olc': cellid2qgsfeature.olc2qgsfeature,
+                'geohash': cellid2qgsfeature.geohash2qgsfeature,
+                'tilecode': cellid2qgsfeature.tilecode2qgsfeature,
+                'quadkey': cellid2qgsfeature.quadkey2qgsfeature
+            }
+            if platform.system() == 'Windows':
+                self.DGGS_TYPE_decoders['isea4t'] = cellid2qgsfeature.isea4t2qgsfeature
+                self.DGGS_TYPE_decoders['isea3h'] = cellid2qgsfeature.isea3h2qgsfeature
+
         return True
 
+    def request(self):
+        return wgs84_request(self.source_crs, self.transform_context)
+
+    def convertFeature(self, conversion_function, feature, feedback):
+        if self.cache is None:
+            return conversion_function(feature, self.resolution, self.compact, feedback)
+
+        key = ConversionCache.make_key(feature.geometry(), self.dggs_type, self.resolution, self.compact)
+        cell_ids = self.cache.get(key)
+        if cell_ids is not None:
+            decode = self.DGGS_TYPE_decoders[self.dggs_type]
+            return [cell_feature for cell_feature in (decode(feature, cell_id) for cell_id in cell_ids) if cell_feature]
+
+        cell_features = conversion_function(feature, self.resolution, self.compact, feedback)
+        if not feedback.isCanceled():
+            # The DGGS ID is the first attribute after the input feature's own attributes
+            id_index = len(feature.attributes())
+            self.cache.put(key, [cell_feature.attributes()[id_index] for cell_feature in cell_features])
+        return cell_features
+
     def processFeature(self, feature, context, feedback):
         try:     
             self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
@@ -245,7 +327,7 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
                 for point in feature_geom.asMultiPoint():
                     point_feature = QgsFeature(feature)  # Copy original feature
                     point_feature.setGeometry(QgsGeometry.fromPointXY(point))  # Set individual point geometry
-                    cell_polygons = conversion_function(point_feature, self.resolution, self.compact, feedback)
+                    cell_polygons = self.convertFeature(conversion_function, point_feature, feedback)
                     multi_cell_polygons.extend(cell_polygons)          
                 return multi_cell_polygons
             
@@ -255,7 +337,7 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
                 for line in feature_geom.asMultiPolyline():
                     line_feature = QgsFeature(feature)
                     line_feature.setGeometry(QgsGeometry.fromPolylineXY(line))
-                    cell_polygons = conversion_function(line_feature, self.resolution,self.compact, feedback)
+                    cell_polygons = self.convertFeature(conversion_function, line_feature, feedback)
                     multi_cell_polygons.extend(cell_polygons)
                 return multi_cell_polygons
             
@@ -264,12 +346,12 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
                 for polygon in feature_geom.asMultiPolygon():
                     polygon_feature = QgsFeature(feature)
                     polygon_feature.setGeometry(QgsGeometry.fromPolygonXY(polygon))
-                    cell_polygons = conversion_function(polygon_feature, self.resolution,self.compact, feedback)
+                    cell_polygons = self.convertFeature(conversion_function, polygon_feature, feedback)
                     multi_cell_polygons.extend(cell_polygons)                
                 return multi_cell_polygons
             
             else: # Single part features
-                return conversion_function(feature, self.resolution,self.compact, feedback)
+                return self.convertFeature(conversion_function, feature, feedback)
             
         except Exception as e:
             self.num_bad += 1
@@ -278,4 +360,8 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
     def postProcessAlgorithm(self, context, feedback):
         if self.num_bad:
             feedback.pushInfo(self.tr("{} out of {} features had invalid parameters and were ignored.".format(self.num_bad, self.total_features)))
+        if self.cache is not None:
+            feedback.pushInfo(f"Conversion cache: {self.cache.hits} hits, {self.cache.misses} misses.")
+            self.cache.close()
+            self.cache = None
         return {}
\ No newline at end of file
@@ -12,8 +12,11 @@ from qgis.core import (
     QgsProcessingAlgorithm,
     QgsProcessingParameterEnum,
     QgsProcessingParameterNumber,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterRasterDestination,
     QgsProcessing,
-    QgsProcessingException
+    QgsProcessingException,
+    QgsWkbTypes
     )
 
 from qgis.core import QgsApplication
@@ -22,16 +25,10 @@ from qgis.PyQt.QtCore import QCoreApplication
 
 import platform
 from ...utils.imgs import Imgs
+from ...utils.featurewriter import SinkFactory, FeatureBatchWriter
 from ...utils.conversion.raster2dggs import *
-from vgrid.stats.s2stats import s2_metrics
-from vgrid.stats.rhealpixstats import rhealpix_metrics
-from vgrid.stats.isea4tstats import isea4t_metrics
-
-from vgrid.stats.qtmstats import qtm_metrics
-from vgrid.stats.olcstats import olc_metrics
-from vgrid.stats.geohashstats import geohash_metrics
-from vgrid.stats.tilecodestats import tilecode_metrics
-from vgrid.stats.quadkeystats import quadkey_metrics
+from ...utils.dggsmetrics import dggs_metrics, pixel_area
+from ...utils.conversion.dggsbatch import can_batch_encode
 
 
 class Raster2DGGS(QgsProcessingAlgorithm):
@@ -41,6 +38,13 @@ class Raster2DGGS(QgsProcessingAlgorithm):
     INPUT = 'INPUT'
     DGGS_TYPE = 'DGGS_TYPE'
     RESOLUTION = 'RESOLUTION'
+    STATS = 'STATS'
+    WORKERS = 'WORKERS'
+    MIN_RESOLUTION = 'MIN_RESOLUTION'
+    COMPACT = 'COMPACT'
+    COMPACT_TOLERANCE = 'COMPACT_TOLERANCE'
+    OUTPUT_RASTER = 'OUTPUT_RASTER'
+    INDEX_BAND = 'INDEX_BAND'
     OUTPUT = 'OUTPUT'
     
     DGGS_TYPES = [
@@ -64,6 +68,7 @@ class Raster2DGGS(QgsProcessingAlgorithm):
             'ISEA4T': (0, 23, 18)
         })
 
+    STATISTICS = ['mean', 'min', 'max', 'sum', 'count', 'majority', 'std', 'centroid']
       
     LOC = QgsApplication.locale()[:2]
 
@@ -144,62 +149,98 @@ class Raster2DGGS(QgsProcessingAlgorithm):
             maxValue=40
         ))
 
+        self.addParameter(QgsProcessingParameterEnum(
+            self.STATS,
+            "Statistic of contributing pixels (centroid: pixel at cell centre)",
+            options=self.STATISTICS,
+            defaultValue=0
+        ))
+
+        # Pyramid: scan once at Resolution, roll the aggregates up to parent cells down to this resolution
+        self.addParameter(QgsProcessingParameterNumber(
+            self.MIN_RESOLUTION,
+            "Pyramid down to resolution (leave -1 for a single resolution)",
+            QgsProcessingParameterNumber.Integer,
+            -1,
+            minValue=-1,
+            maxValue=40
+        ))
+
+        # Merge complete sets of children holding the same values into their parent
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.COMPACT,
+            "Compact homogeneous cells",
+            defaultValue=False
+        ))
+
+        self.addParameter(QgsProcessingParameterNumber(
+            self.COMPACT_TOLERANCE,
+            "Compaction tolerance (0 for categorical rasters)",
+            QgsProcessingParameterNumber.Double,
+            0,
+            minValue=0
+        ))
+
+        # Tiled mode (OLC, Geohash, Tilecode, Quadkey): block rows aggregated in a thread pool, cells streamed to the output as their tile rows complete
+        self.addParameter(QgsProcessingParameterNumber(
+            self.WORKERS,
+            "Tiled processing threads (0 = off)",
+            QgsProcessingParameterNumber.Integer,
+            0,
+            minValue=0,
+            maxValue=64
+        ))
+
         
         self.addParameter(QgsProcessingParameterFeatureSink(
             self.OUTPUT,
             self.tr('Raster2DGGS'),
-            QgsProcessing.TypeVectorPolygon
+            QgsProcessing.TypeVectorPolygon,
+            optional=True
     ))
 
-    def get_nearest_resolution(self, dggs_type, pixel_size):        
-        if dggs_type == 'h3':
-            resolutions = range(16)
-            get_area = lambda res: h3.average_hexagon_area(res, unit='m^2')
-        elif dggs_type == 's2':
-            resolutions = range(25)
-            get_area = lambda res: s2_metrics(res)[2]  # avg_area
-        elif dggs_type == 'rhealpix':
-            resolutions = range(16)
-            get_area = lambda res: rhealpix_metrics(res)[2]  # avg_area
-        elif dggs_type == 'isea4t':
-            isea4t_dggs = Eaggr(Model.ISEA4T) 
-            resolutions = range(24)
-            get_area = lambda res: isea4t_metrics(isea4t_dggs, res)[2]  # avg_area
-        elif dggs_type == 'qtm':
-            resolutions = range(2,25)
-            get_area = lambda res: qtm_metrics(res)[2]  # avg_area
-        elif dggs_type == 'olc':
-            resolutions = [2, 4, 6, 8, 10, 11, 12]
-            get_area = lambda res: olc_metrics(res)[2]  # avg_area
-        elif dggs_type == 'geohash':
-            resolutions = range(1,11)
-            get_area = lambda res: geohash_metrics(res)[2]  # avg_area
-        elif dggs_type == 'tilecode':
-            resolutions = range(27)
-            get_area = lambda res: tilecode_metrics(res)[2]  # avg_area
-        elif dggs_type == 'quadkey':
-            resolutions = range(27)
-            get_area = lambda res: quadkey_metrics(res)[2]  # avg_area
-            
-        else:
-            raise ValueError(f"Unsupported DGGS type: {dggs_type}")
+        # Regular-grid DGGS can be written as a raster of cell values instead of polygons
+        self.addParameter(QgsProcessingParameterRasterDestination(
+            self.OUTPUT_RASTER,
+            "Cell raster (OLC, Geohash, Tilecode, Quadkey)",
+            optional=True,
+            createByDefault=False
+        ))
+
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.INDEX_BAND,
+            "Add cell key band to cell raster",
+            defaultValue=False
+        ))
 
-        nearest_res = None
-        min_diff = float('inf')
-        for res in resolutions:
-            area = get_area(res)
-            diff = abs(area - pixel_size)
-            if diff < min_diff:
-                min_diff = diff
-                nearest_res = res
+    # Resolutions offered for automatic selection: (min, max), None for the whole catalog range
+    AUTO_RESOLUTION_RANGES = {
+        's2': (None, 24),
+        'isea4t': (None, 23),
+        'qtm': (2, None),
+        'olc': (None, 12),
+        'tilecode': (None, 26),
+        'quadkey': (None, 26)
+    }
 
-        return nearest_res
+    def get_nearest_resolution(self, dggs_type, pixel_size):        
+        min_resolution, max_resolution = self.AUTO_RESOLUTION_RANGES.get(dggs_type, (None, None))
+        return dggs_metrics(dggs_type).nearest(pixel_size, min_resolution, max_resolution)
 
 
     def prepareAlgorithm(self, parameters, context, feedback):       
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context) 
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
+        self.stats = self.STATISTICS[self.parameterAsEnum(parameters, self.STATS, context)]
+        self.workers = self.parameterAsInt(parameters, self.WORKERS, context)
+        self.min_resolution = self.parameterAsInt(parameters, self.MIN_RESOLUTION, context)
+        self.compact_tolerance = None
+        if self.parameterAsBoolean(parameters, self.COMPACT, context):
+            self.compact_tolerance = self.parameterAsDouble(parameters, self.COMPACT_TOLERANCE, context)
+        if self.workers and self.stats == 'centroid':
+            feedback.pushInfo("Tiled processing is not available for the centroid statistic. Running in a single pass.")
+            self.workers = 0
 
         raster_layer = self.parameterAsRasterLayer(parameters, self.INPUT, context)
         crs = raster_layer.crs()
@@ -209,10 +250,11 @@ class Raster2DGGS(QgsProcessingAlgorithm):
             feedback.reportError("Only rasters with geographic CRS (e.g., EPSG:4326) are supported.")
             return False
         
-        # Get pixel size of raster layer (in map units)
+        # Get pixel size of raster layer (m2, at the centre of the raster extent)
         pixel_size_x = raster_layer.rasterUnitsPerPixelX()
         pixel_size_y = raster_layer.rasterUnitsPerPixelY()
-        pixel_size = abs(pixel_size_x * pixel_size_y)
+        center = raster_layer.extent().center()
+        pixel_size = pixel_area(center.x(), center.y(), pixel_size_x, pixel_size_y)
         # feedback.pushInfo(f"pixel_size: {pixel_size}")
 
         user_res = self.parameterAsInt(parameters, self.RESOLUTION, context)
@@ -233,7 +275,48 @@ class Raster2DGGS(QgsProcessingAlgorithm):
         if self.dggs_type == 'geohash' and self.resolution == 0:
             feedback.pushInfo("Resolution 0 is not supported for Geohash. Automatically changed to resolution 1.")
             self.resolution = 1
+
+        if self.workers and not can_batch_encode(self.dggs_type, self.resolution):
+            # Per-pixel encoding is a Python loop that holds the GIL, so threads would not run it in parallel
+            feedback.pushInfo(f"Tiled processing needs a vectorized {self.dggs_type} encoder at resolution {self.resolution}. Running in a single pass.")
+            self.workers = 0
             
+        if self.min_resolution >= 0:
+            if self.stats == 'centroid':
+                feedback.reportError("A resolution pyramid needs an aggregate statistic (not centroid).")
+                return False
+            if self.min_resolution > self.resolution:
+                feedback.reportError(f"Pyramid resolution must not be finer than the resolution ({self.resolution}).")
+                return False
+            if self.workers:
+                feedback.pushInfo("Pyramid output runs in a single pass. Tiled processing is turned off.")
+                self.workers = 0
+
+        if self.compact_tolerance is not None:
+            if self.stats in ('sum', 'count'):
+                feedback.reportError("Compaction needs a statistic that stays the same on merged cells (not sum or count).")
+                return False
+            if self.min_resolution >= 0:
+                feedback.reportError("Compaction and a resolution pyramid cannot be combined.")
+                return False
+            if self.workers:
+                feedback.pushInfo("Compaction runs in a single pass. Tiled processing is turned off.")
+                self.workers = 0
+
+        self.output_raster = self.parameterAsOutputLayer(parameters, self.OUTPUT_RASTER, context)
+        self.index_band = self.parameterAsBoolean(parameters, self.INDEX_BAND, context)
+        # Both outputs are optional, but one of them must be requested
+        if not self.output_raster and not self.parameterAsOutputLayer(parameters, self.OUTPUT, context):
+            feedback.reportError("Set the Raster2DGGS output or the cell raster output.")
+            return False
+        if self.output_raster:
+            if not can_write_cell_raster(self.dggs_type, self.resolution):
+                feedback.reportError("Cell raster output is only available for OLC, Geohash, Tilecode and Quadkey.")
+                return False
+            if self.stats == 'centroid' or self.min_resolution >= 0 or self.compact_tolerance is not None:
+                feedback.reportError("Cell raster output needs an aggregate statistic, a single resolution and no compaction.")
+                return False
+
         self.DGGS_TYPE_functions = {
             'h3': raster2h3,
             's2': raster2s2,
@@ -257,27 +340,35 @@ class Raster2DGGS(QgsProcessingAlgorithm):
         if conversion_function is None:
             return {}
 
-        feedback.pushInfo(f"Processing raster: {raster_layer.name()} at resolution: {self.resolution}")
-
-        # conversion_function returns a memory layer (QgsVectorLayer)
-        memory_layer = conversion_function(raster_layer, self.resolution,feedback)
-        # memory_layer = conversion_function(raster_layer)
-
-        if not isinstance(memory_layer, QgsVectorLayer) or not memory_layer.isValid():
+        feedback.pushInfo(f"Processing raster: {raster_layer.name()} at resolution: {self.resolution} ({self.stats})")
+
+        if self.output_raster:
+            output_raster = raster_to_cell_raster(raster_layer, self.dggs_type, self.resolution, self.output_raster,
+                                                  self.stats, self.index_band, feedback)
+            if output_raster is None:
+                return {}
+            return {self.OUTPUT_RASTER: output_raster}
+
+        # Features are written straight to the output sink in batches
+        create_sink = SinkFactory(self, parameters, self.OUTPUT, context)
+
+        if self.workers:
+            feedback.pushInfo(f"Tiled processing with {self.workers} threads")
+            fields = raster_cell_fields(self.dggs_type, raster_layer.bandCount())
+            writer = FeatureBatchWriter(create_sink(fields, QgsWkbTypes.Polygon, raster_layer.crs()))
+            writer.addFeatures(raster_tiled_features(raster_layer, self.dggs_type, self.resolution,
+                                                     RASTER_LATLON_TO_CELL[self.dggs_type], self.stats, self.workers, feedback))
+            if feedback.isCanceled():
+                return {}
+            writer.flush()
+            return {self.OUTPUT: create_sink.sink_id}
+
+        output = conversion_function(raster_layer, self.resolution, feedback, self.stats, self.min_resolution,
+                                     self.compact_tolerance, create_sink)
+
+        if output is None or create_sink.sink is None:
+            if feedback.isCanceled():
+                return {}
             raise QgsProcessingException("Invalid output layer returned from conversion function.")
 
-        # Create output sink with the same fields and CRS
-        (sink, sink_id) = self.parameterAsSink(
-            parameters,
-            self.OUTPUT,
-            context,
-            memory_layer.fields(),
-            memory_layer.wkbType(),
-            memory_layer.crs()
-        )
-
-        # Copy features
-        for feature in memory_layer.getFeatures():
-            sink.addFeature(feature, QgsFeatureSink.FastInsert)
-
-        return {self.OUTPUT: sink_id}
\ No newline at end of file
+        return {self.OUTPUT: create_sink.sink_id}
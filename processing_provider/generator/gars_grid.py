@@ -45,6 +45,7 @@ from ...utils.imgs import Imgs
 import numpy as np
 from vgrid.utils.gars.garsgrid import GARSGrid as GARSGRID 
 from shapely.geometry import Polygon
+from ...utils.geometry import shapely_to_qgsgeometry
 from vgrid.generator.settings import graticule_dggs_metrics
         
 class GARSGrid(QgsProcessingAlgorithm):
@@ -200,7 +201,7 @@ class GARSGrid(QgsProcessingAlgorithm):
                         (lon + resolution_degrees, lat + resolution_degrees),
                         (lon, lat + resolution_degrees),
                         (lon, lat) ])
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
                     gars_feature = QgsFeature()
                     gars_feature.setGeometry(cell_geometry)
                     
@@ -240,7 +241,7 @@ class GARSGrid(QgsProcessingAlgorithm):
                         (lon, lat + resolution_degrees),
                         (lon, lat) ])
                    
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
                     gars_feature = QgsFeature()
                     gars_feature.setGeometry(cell_geometry)
                     
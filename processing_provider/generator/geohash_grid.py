@@ -43,6 +43,7 @@ from vgrid.utils import geohash
 from ...utils.imgs import Imgs
 from vgrid.generator.settings import graticule_dggs_metrics
 from shapely.geometry import box
+from ...utils.geometry import shapely_to_qgsgeometry
 from vgrid.generator.geohashgrid import geohash_to_polygon
 
 
@@ -153,7 +154,7 @@ class GeohashGrid(QgsProcessingAlgorithm):
         """Recursive function to expand geohashes to target RESOLUTION and write them."""
         if len(gh) == target_length:
             cell_polygon = geohash_to_polygon(gh)
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geometry = shapely_to_qgsgeometry(cell_polygon)
             geohash_feature = QgsFeature(fields)
             geohash_feature.setGeometry(cell_geometry)
             
@@ -178,7 +179,7 @@ class GeohashGrid(QgsProcessingAlgorithm):
             return
    
         if len(gh) == target_length:
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geometry = shapely_to_qgsgeometry(cell_polygon)
             geohash_feature = QgsFeature(fields)
             geohash_feature.setGeometry(cell_geometry)
             
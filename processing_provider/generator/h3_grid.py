@@ -47,6 +47,7 @@ import h3
 from ...utils.imgs import Imgs
 from vgrid.generator.h3grid import fix_h3_antimeridian_cells
 from shapely.geometry import Polygon,box
+from ...utils.geometry import shapely_to_qgsgeometry
 from vgrid.generator.settings import geodesic_dggs_metrics
 
 
@@ -186,7 +187,7 @@ class H3Grid(QgsProcessingAlgorithm):
                 filtered_boundary = fix_h3_antimeridian_cells(hex_boundary)
                 reversed_boundary = [(lon, lat) for lat, lon in filtered_boundary]
                 cell_polygon = Polygon(reversed_boundary)
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
                 if not cell_geometry.intersects(QgsGeometry.fromRect(self.grid_extent)):
                     continue
@@ -222,7 +223,7 @@ class H3Grid(QgsProcessingAlgorithm):
                     # Reverse lat/lon to lon/lat for GeoJSON compatibility
                     reversed_boundary = [(lon, lat) for lat, lon in filtered_boundary]
                     cell_polygon = Polygon(reversed_boundary) 
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
                 
                     h3_feature = QgsFeature()
                     h3_feature.setGeometry(cell_geometry)
@@ -56,6 +56,7 @@ if (platform.system() == 'Windows'):
     
 from ...utils.imgs import Imgs
 from shapely.geometry import box
+from ...utils.geometry import shapely_to_qgsgeometry
 from vgrid.generator.settings import isea4t_res_accuracy_dict, geodesic_dggs_metrics
 from vgrid.utils.antimeridian import fix_polygon
 
@@ -210,7 +211,7 @@ class ISEA4TGrid(QgsProcessingAlgorithm):
                         cell_polygon = fix_isea4t_antimeridian_cells(cell_polygon)
                                                     
                     # if cell_polygon.intersects(extent_bbox):
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)            
+                    cell_geometry = shapely_to_qgsgeometry(cell_polygon)            
                     isea4t_feature = QgsFeature()
                     isea4t_feature.setGeometry(cell_geometry)                     
                     
@@ -240,7 +241,7 @@ class ISEA4TGrid(QgsProcessingAlgorithm):
                         or isea4t_id.startswith('14') or isea4t_id.startswith('04') or isea4t_id.startswith('19'):
                         cell_polygon = fix_isea4t_antimeridian_cells(cell_polygon)
                     
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)            
+                    cell_geometry = shapely_to_qgsgeometry(cell_polygon)            
                     isea4t_feature = QgsFeature()
                     isea4t_feature.setGeometry(cell_geometry)                     
                         
@@ -45,6 +45,7 @@ import os, random
 from vgrid.utils import maidenhead
 from ...utils.imgs import Imgs
 from shapely.geometry import Polygon
+from ...utils.geometry import shapely_to_qgsgeometry
 from vgrid.generator.settings import graticule_dggs_metrics
 
 grid_params = { 
@@ -199,7 +200,7 @@ class MaidenheadGrid(QgsProcessingAlgorithm):
                         [min_lon_maiden, min_lat_maiden]   # Closing the polygon (same as the first point)
                     ])
                     
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
                     maidenhead_feature = QgsFeature()
                     maidenhead_feature.setGeometry(cell_geometry)
                     
@@ -247,7 +248,7 @@ class MaidenheadGrid(QgsProcessingAlgorithm):
                         [min_lon_maiden, min_lat_maiden]   # Closing the polygon (same as the first point)
                     ])
                     
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
                     maidenhead_feature = QgsFeature()
                     maidenhead_feature.setGeometry(cell_geometry)
                     
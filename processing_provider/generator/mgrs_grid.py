@@ -50,7 +50,7 @@ from ...utils.imgs import Imgs
 from vgrid.generator.mgrsgrid import is_valid_gzd
 import json
 from shapely.geometry import shape, Polygon
-from shapely.wkt import loads
+from ...utils.geometry import bounds_to_qgsgeometry, shapely_to_qgsgeometry, qgsgeometry_to_shapely
 import numpy as np
 from vgrid.generator.settings import graticule_dggs_metrics
 
@@ -224,21 +224,14 @@ class MGRSGrid(QgsProcessingAlgorithm):
                 progress = int((current_step / total_cells) * 100)
                 feedback.setProgress(progress)                
               
-                cell_polygon_utm = Polygon([
-                    (x, y),
-                    (x + cell_size, y),
-                    (x + cell_size, y + cell_size),
-                    (x, y + cell_size),
-                    (x, y)  # Close the polygon
-                ])            
-                cell_geometry_utm = QgsGeometry.fromWkt(cell_polygon_utm.wkt) 
+                cell_geometry_utm = bounds_to_qgsgeometry(x, y, x + cell_size, y + cell_size)
                 cell_geometry_utm.transform(transformer)               
-                cell_polygon = loads(cell_geometry_utm.asWkt() )
+                cell_polygon = qgsgeometry_to_shapely(cell_geometry_utm)
 
                 if cell_polygon.intersects(gzd_geom):
                     centroid_lat, centroid_lon  =  cell_polygon.centroid.y, cell_polygon.centroid.x,
                     mgrs_id = mgrs.toMgrs(centroid_lat, centroid_lon, self.resolution)
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)                
+                    cell_geometry = cell_geometry_utm
                     
                     mgrs_feature = QgsFeature()
                     mgrs_feature.setGeometry(cell_geometry)
@@ -250,7 +243,7 @@ class MGRSGrid(QgsProcessingAlgorithm):
                             intersected_centroid_lat, intersected_centroid_lon  =  intersected_polygon.centroid.y, intersected_polygon.centroid.x,
                             interescted_mgrs_id = mgrs.toMgrs(intersected_centroid_lat, intersected_centroid_lon, self.resolution)            
                             center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(intersected_polygon)                     
-                            cell_geometry = QgsGeometry.fromWkt(intersected_polygon.wkt)       
+                            cell_geometry = shapely_to_qgsgeometry(intersected_polygon)       
                             mgrs_feature.setGeometry(cell_geometry)
                             mgrs_feature.setAttributes([interescted_mgrs_id,self.resolution,center_lat,center_lon,cell_width, cell_height,cell_area])
                 
@@ -47,6 +47,7 @@ from vgrid.generator.settings import graticule_dggs_metrics, graticule_dggs_to_f
 
 from ...utils.imgs import Imgs
 from shapely.geometry import Polygon,box
+from ...utils.geometry import shapely_to_qgsgeometry
 
 
 class OLCGrid(QgsProcessingAlgorithm):
@@ -272,7 +273,7 @@ class OLCGrid(QgsProcessingAlgorithm):
             for feature in final_features:
                 cell_polygon = Polygon(feature["geometry"]["coordinates"][0])
                 olc_id = feature["properties"]["olc"]
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                cell_geometry = shapely_to_qgsgeometry(cell_polygon)
                 
                 olc_feature = QgsFeature()
                 olc_feature.setGeometry(cell_geometry)
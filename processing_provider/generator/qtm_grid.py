@@ -44,6 +44,7 @@ import os, random
 from vgrid.utils import qtm   
 from vgrid.generator.settings import geodesic_dggs_metrics  
 from shapely.geometry import box
+from ...utils.geometry import shapely_to_qgsgeometry
 from ...utils.imgs import Imgs
 
 class QTMGrid(QgsProcessingAlgorithm):
@@ -200,7 +201,7 @@ class QTMGrid(QgsProcessingAlgorithm):
                         facet_geom = qtm.constructGeometry(facet)                        
                         levelFacets[0].append(facet)                                         
                         if facet_geom.intersects(extent_bbox) and self.resolution == 1:
-                            cell_geometry = QgsGeometry.fromWkt(facet_geom.wkt) 
+                            cell_geometry = shapely_to_qgsgeometry(facet_geom) 
                             qtm_feature = QgsFeature()
                             qtm_feature.setGeometry(cell_geometry)
                             qtm_id = QTMID[0][i]
@@ -216,7 +217,7 @@ class QTMGrid(QgsProcessingAlgorithm):
                         for j, subfacet in enumerate(subdivided_facets):
                             subfacet_geom = qtm.constructGeometry(subfacet)
                             if subfacet_geom.intersects(extent_bbox):  # Only keep intersecting facets
-                                cell_geometry = QgsGeometry.fromWkt(subfacet_geom.wkt)  
+                                cell_geometry = shapely_to_qgsgeometry(subfacet_geom)  
                                 new_id = QTMID[lvl - 1][i] + str(j)
                                 QTMID[lvl].append(new_id)
                                 levelFacets[lvl].append(subfacet)
@@ -259,7 +260,7 @@ class QTMGrid(QgsProcessingAlgorithm):
                             qtm_id = QTMID[0][i]
                             num_edges = 3
                             center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(facet_geom, num_edges)                       
-                            cell_geometry = QgsGeometry.fromWkt(facet_geom.wkt) 
+                            cell_geometry = shapely_to_qgsgeometry(facet_geom) 
                             qtm_feature = QgsFeature()
                             qtm_feature.setGeometry(cell_geometry)
                             qtm_feature.setAttributes([qtm_id,self.resolution,center_lat,center_lon,avg_edge_len,cell_area])
@@ -282,7 +283,7 @@ class QTMGrid(QgsProcessingAlgorithm):
                                 num_edges = 3
                                 center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(subfacet_geom, num_edges)
                             
-                                cell_geometry = QgsGeometry.fromWkt(subfacet_geom.wkt) 
+                                cell_geometry = shapely_to_qgsgeometry(subfacet_geom) 
                                 qtm_feature = QgsFeature()
                                 qtm_feature.setGeometry(cell_geometry)
                                 qtm_feature.setAttributes([qtm_id,self.resolution,center_lat,center_lon,avg_edge_len,cell_area])
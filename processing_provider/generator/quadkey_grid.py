@@ -45,6 +45,7 @@ from vgrid.utils import mercantile
 from ...utils.imgs import Imgs
 from vgrid.generator.settings import graticule_dggs_metrics
 from shapely.geometry import Polygon
+from ...utils.geometry import shapely_to_qgsgeometry
 
 
 class QuadkeyGrid(QgsProcessingAlgorithm):
@@ -192,7 +193,7 @@ class QuadkeyGrid(QgsProcessingAlgorithm):
                 (bounds.west, bounds.north),
                 (bounds.west, bounds.south)  # Closing the polygon
             ])
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geometry = shapely_to_qgsgeometry(cell_polygon)
             quadkey_feature = QgsFeature()
             quadkey_feature.setGeometry(cell_geometry)
             
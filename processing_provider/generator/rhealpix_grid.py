@@ -46,6 +46,7 @@ from vgrid.conversion.dggs2geojson import rhealpix_cell_to_polygon
 from vgrid.utils.rhealpixdggs.dggs import RHEALPixDGGS
 from ...utils.imgs import Imgs
 from shapely.geometry import box
+from ...utils.geometry import shapely_to_qgsgeometry
 from vgrid.generator.settings import geodesic_dggs_metrics
 rhealpix_dggs = RHEALPixDGGS()
 
@@ -187,7 +188,7 @@ class rHEALPixGrid(QgsProcessingAlgorithm):
                 if seed_cell.ellipsoidal_shape() == 'dart':
                     num_edges = 3
                 
-                seed_cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
+                seed_cell_geometry = shapely_to_qgsgeometry(seed_cell_polygon)
             
                 rhealpix_feature = QgsFeature()
                 rhealpix_feature.setGeometry(seed_cell_geometry) 
@@ -230,7 +231,7 @@ class rHEALPixGrid(QgsProcessingAlgorithm):
                     cell = rhealpix_dggs.cell(rhealpix_uids)    
                     cell_polygon = rhealpix_cell_to_polygon(cell)          
                     if cell_polygon.intersects(extent_bbox):
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)            
+                        cell_geometry = shapely_to_qgsgeometry(cell_polygon)            
                         rhealpix_feature = QgsFeature()
                         rhealpix_feature.setGeometry(cell_geometry) 
                         
@@ -254,7 +255,7 @@ class rHEALPixGrid(QgsProcessingAlgorithm):
                 progress = int((idx / total_cells) * 100)
                 feedback.setProgress(progress)            
                 cell_polygon = rhealpix_cell_to_polygon(cell)
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+                cell_geometry = shapely_to_qgsgeometry(cell_polygon)
             
                 rhealpix_feature = QgsFeature()
                 rhealpix_feature.setGeometry(cell_geometry)                
@@ -45,6 +45,7 @@ from vgrid.utils import s2
 from ...utils.imgs import Imgs
 from vgrid.utils.antimeridian import fix_polygon
 from shapely.geometry import Polygon, box
+from ...utils.geometry import shapely_to_qgsgeometry
 import random
 from vgrid.generator.settings import geodesic_dggs_metrics
 
@@ -211,7 +212,7 @@ class S2Grid(QgsProcessingAlgorithm):
                 if not cell_polygon.intersects(extent_bbox):
                     continue
             
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geometry = shapely_to_qgsgeometry(cell_polygon)
             s2_feature = QgsFeature()
             s2_feature.setGeometry(cell_geometry)
             
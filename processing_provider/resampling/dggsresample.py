@@ -24,6 +24,7 @@ from qgis.core import (
     QgsProcessingParameterField,
     QgsProcessingParameterEnum,
     QgsProcessingParameterNumber,
+    QgsProcessingParameterFileDestination,
     QgsProcessingFeatureBasedAlgorithm,
     QgsProcessingException,
     QgsWkbTypes,
@@ -36,19 +37,24 @@ from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtCore import QCoreApplication
 
 from ...utils.imgs import Imgs
+from ...utils.featurewriter import SinkFactory
 from ...utils.resampling.dggsresample import * 
 
 class DGGSResample(QgsProcessingFeatureBasedAlgorithm):
     INPUT = 'INPUT'
     DGGS_FIELD = 'DGGS_FIELD'
     RESAMPLE_FIELD = 'RESAMPLE_FIELD'
+    METHOD = 'METHOD'
     DGGSTYPE_FROM = 'DGGSTYPE_FROM'
     DGGSTYPE_TO = 'DGGSTYPE_TO'
     RESOLUTION = 'RESOLUTION'
+    WEIGHTS = 'WEIGHTS'
+    WORKERS = 'WORKERS'
     OUTPUT = 'OUTPUT'
 
     DGGS_TYPES = ['H3','S2', 'rHEALPix','QTM',
                   'OLC','Geohash','Tilecode','Quadkey']
+    METHODS = ['Sum (area-weighted share)', 'Mean (area-weighted)', 'Min', 'Max', 'Majority', 'Count']
     
     if platform.system() == 'Windows':
         index = DGGS_TYPES.index('rHEALPix') + 1
@@ -138,14 +144,22 @@ class DGGSResample(QgsProcessingFeatureBasedAlgorithm):
         self.addParameter(
             QgsProcessingParameterField(
                 self.RESAMPLE_FIELD,
-                self.tr("Input resample field"),
+                self.tr("Input resample fields"),
                 parentLayerParameterName=self.INPUT,
-                type=QgsProcessingParameterField.Numeric,
+                type=QgsProcessingParameterField.Any,
+                allowMultiple=True,
                 optional=True,
                 defaultValue=None
             )
         )
         
+        self.addParameter(QgsProcessingParameterEnum(
+            self.METHOD,
+            self.tr("Resampling method (Sum, Mean, Min and Max need numeric fields)"),
+            options=self.METHODS,
+            defaultValue=0
+        ))
+
         self.addParameter(QgsProcessingParameterEnum(
             self.DGGSTYPE_TO,
             self.tr("Output DGGS type"),
@@ -162,6 +176,24 @@ class DGGSResample(QgsProcessingFeatureBasedAlgorithm):
             maxValue=40
         ))
 
+        self.addParameter(QgsProcessingParameterFileDestination(
+            self.WEIGHTS,
+            self.tr("Overlap weight table (reused when it matches the DGGS pair and resolution)"),
+            fileFilter='SQLite (*.sqlite)',
+            optional=True,
+            createByDefault=False
+        ))
+
+        # Chunked mode: target cells partitioned by coarse parent cell, resampled in a process pool and streamed to the output
+        self.addParameter(QgsProcessingParameterNumber(
+            self.WORKERS,
+            self.tr("Chunked processing workers (0 = off)"),
+            QgsProcessingParameterNumber.Integer,
+            0,
+            minValue=0,
+            maxValue=64
+        ))
+
 
     def prepareAlgorithm(self, parameters, context, feedback):
         self.DGGSTYPE_FROM_index = self.parameterAsEnum(parameters, self.DGGSTYPE_FROM, context)
@@ -174,28 +206,29 @@ class DGGSResample(QgsProcessingFeatureBasedAlgorithm):
             return False
 
         self.dggs_field = self.parameterAsString(parameters, self.DGGS_FIELD, context)
-        self.resample_field = self.parameterAsString(parameters, self.RESAMPLE_FIELD, context)
+        self.resample_fields = self.parameterAsFields(parameters, self.RESAMPLE_FIELD, context)
+        self.method = RESAMPLE_METHODS[self.parameterAsEnum(parameters, self.METHOD, context)]
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)                
+        self.weights_path = self.parameterAsFileOutput(parameters, self.WEIGHTS, context) or None
+        self.workers = self.parameterAsInt(parameters, self.WORKERS, context)
+        if self.workers and self.weights_path:
+            feedback.pushInfo("Chunked processing is not available with an overlap weight table. Running in a single pass.")
+            self.workers = 0
         return True
 
     def processAlgorithm(self, parameters, context, feedback):
         dggs_layer = self.parameterAsVectorLayer(parameters, self.INPUT, context)
         feedback.pushInfo(f"Resampling from {self.dggstype_from.title()} to {self.dggstype_to.title()}")
-        memory_layer = resample(dggs_layer, self.dggstype_from, self.dggstype_to, self.resolution, self.dggs_field, self.resample_field, feedback)
+        # Features are written straight to the output sink in batches
+        create_sink = SinkFactory(self, parameters, self.OUTPUT, context)
+        output = resample(dggs_layer, self.dggstype_from, self.dggstype_to, self.resolution, self.dggs_field, self.resample_fields, feedback, create_sink, self.weights_path, self.method, self.workers)
 
-        if not isinstance(memory_layer, QgsVectorLayer) or not memory_layer.isValid():
+        if output is None or create_sink.sink is None:
+            if feedback.isCanceled():
+                return {}
             raise QgsProcessingException("Invalid output layer returned from resampling function.")
 
-        (sink, sink_id) = self.parameterAsSink(
-            parameters,
-            self.OUTPUT,
-            context,
-            memory_layer.fields(),
-            memory_layer.wkbType(),
-            memory_layer.crs()
-        )
-
-        for feature in memory_layer.getFeatures():
-            sink.addFeature(feature, QgsFeatureSink.FastInsert)
-
-        return {self.OUTPUT: sink_id}
\ No newline at end of file
+        results = {self.OUTPUT: create_sink.sink_id}
+        if self.weights_path:
+            results[self.WEIGHTS] = self.weights_path
+        return results
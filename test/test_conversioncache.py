@@ -0,0 +1,48 @@
+# coding=utf-8
+"""Vector2DGGS conversion cache tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+import os
+import tempfile
+import unittest
+
+from qgis.core import QgsFeature, QgsGeometry, QgsPointXY
+
+from ..utils.conversion.conversioncache import ConversionCache
+from ..utils.conversion.qgsfeature2dggs import qgsfeature2rhealpix, rhealpixid2qgsfeature
+
+
+class RHEALPixCacheTest(unittest.TestCase):
+    """Cell IDs read back from the cache decode to the cells Vector2DGGS computed."""
+
+    def test_polar_cell_hit_matches_miss(self):
+        feature = QgsFeature()
+        # Inside the north polar square, where rHEALPix layouts differ
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(33.5, 80)))
+        resolution = 2
+        computed = qgsfeature2rhealpix(feature, resolution)
+        self.assertEqual(len(computed), 1)
+        cell_id = computed[0].attributes()[0]
+        self.assertTrue(cell_id.startswith('N'))
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ConversionCache(os.path.join(directory, 'cache.sqlite'))
+            key = ConversionCache.make_key(feature.geometry(), 'rhealpix', resolution, False)
+            cache.put(key, [cell_id])
+            cached_ids = cache.get(key)
+            cache.close()
+
+        self.assertEqual(cached_ids, [cell_id])
+        decoded = rhealpixid2qgsfeature(feature, cached_ids[0])
+        self.assertEqual(decoded.attributes()[0], cell_id)
+        self.assertTrue(decoded.geometry().isGeosEqual(computed[0].geometry()))
+
+
+if __name__ == '__main__':
+    unittest.main()
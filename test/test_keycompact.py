@@ -0,0 +1,67 @@
+# coding=utf-8
+"""Integer-key compaction and expansion tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+import unittest
+
+from ..utils.conversion.keycompact import key_compact, key_expand
+
+
+def no_fallback(*args):
+    raise AssertionError("The vgrid fallback was used for IDs that fit an integer key.")
+
+
+def expand(dggs_type, cell_ids, resolution, chunk_size=100000):
+    return [cell_id for chunk in key_expand(dggs_type, cell_ids, resolution, no_fallback, chunk_size) for cell_id in chunk]
+
+
+class KeyCompactRoundTripTest(unittest.TestCase):
+    """Expanding a cell and compacting its children gives the cell back."""
+
+    # (parent ID, child resolution, number of children)
+    CELLS = {
+        'qtm': [('4213', 6, 16)],
+        'olc': [('7P28QP00+', 8, 400), ('7P28QPG4+RG', 11, 20)],
+        'geohash': [('w3gv', 6, 1024)],
+        'tilecode': [('z5x25y14', 7, 16)],
+        'quadkey': [('1320', 6, 16)]
+    }
+
+    def test_expand_compact(self):
+        for dggs_type, cells in self.CELLS.items():
+            for parent_id, resolution, count in cells:
+                with self.subTest(dggs_type=dggs_type, parent_id=parent_id):
+                    children = expand(dggs_type, [parent_id], resolution)
+                    self.assertEqual(len(set(children)), count)
+                    self.assertEqual(key_compact(dggs_type, children, no_fallback), [parent_id])
+
+    def test_incomplete_siblings(self):
+        for dggs_type, cells in self.CELLS.items():
+            for parent_id, resolution, _ in cells:
+                with self.subTest(dggs_type=dggs_type, parent_id=parent_id):
+                    children = sorted(expand(dggs_type, [parent_id], resolution))[1:]
+                    compacted = key_compact(dggs_type, children, no_fallback)
+                    self.assertNotIn(parent_id, compacted)
+                    self.assertEqual(compacted, sorted(compacted))
+                    self.assertEqual(sorted(expand(dggs_type, compacted, resolution)), children)
+
+    def test_expand_chunks(self):
+        for dggs_type, cells in self.CELLS.items():
+            for parent_id, resolution, _ in cells:
+                with self.subTest(dggs_type=dggs_type, parent_id=parent_id):
+                    chunks = list(key_expand(dggs_type, [parent_id], resolution, no_fallback, 7))
+                    self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+                    self.assertEqual([cell_id for chunk in chunks for cell_id in chunk], expand(dggs_type, [parent_id], resolution))
+
+    def test_cells_at_resolution_are_kept(self):
+        self.assertEqual(expand('geohash', ['w3gv', 'w3gvk'], 4), ['w3gv', 'w3gvk'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+# coding=utf-8
+"""Overlap weight and resampling aggregation tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from shapely import STRtree, box
+
+from ..utils.resampling import weighttable
+from ..utils.resampling.weighttable import OverlapWeights, overlap_weights, aggregate_overlaps, weighted_sums
+
+
+def overlaps(target_geoms, source_geoms):
+    target_geoms = np.array(target_geoms, dtype=object)
+    source_geoms = np.array(source_geoms, dtype=object)
+    source_areas = np.array([geom.area for geom in source_geoms])
+    target_index, source_index, weights = overlap_weights(target_geoms, STRtree(source_geoms), source_geoms, source_areas)
+    return target_index, source_index, weights, source_areas
+
+
+class AdjacentCellsTest(unittest.TestCase):
+    """Cells sharing only an edge or a corner with a target do not contribute to it."""
+
+    def setUp(self):
+        # Target 0 is source A; B shares an edge with A and C a corner.
+        # Target 1 only touches the sources.
+        self.sources = [box(0, 0, 1, 1), box(1, 0, 2, 1), box(1, 1, 2, 2)]
+        self.targets = [box(0, 0, 1, 1), box(-1, 0, 0, 1)]
+        self.numeric = np.array([[1.], [100.], [50.]])
+        self.categories = np.array([['a'], ['b'], ['c']], dtype=object)
+        self.weights = overlaps(self.targets, self.sources)
+
+    def aggregate(self, method, values):
+        target_index, source_index, weights, source_areas = self.weights
+        return aggregate_overlaps(method, target_index, source_index, weights, source_areas, values, len(self.targets))
+
+    def test_touching_cells_have_no_overlap(self):
+        target_index, source_index, weights, _ = self.weights
+        self.assertEqual(target_index.tolist(), [0])
+        self.assertEqual(source_index.tolist(), [0])
+        self.assertEqual(weights.tolist(), [1.])
+
+    def test_sum(self):
+        result = self.aggregate('sum', self.numeric)
+        self.assertEqual(result[0, 0], 1.)
+        self.assertTrue(np.isnan(result[1, 0]))
+
+    def test_mean(self):
+        result = self.aggregate('mean', self.numeric)
+        self.assertEqual(result[0, 0], 1.)
+        self.assertTrue(np.isnan(result[1, 0]))
+
+    def test_min(self):
+        result = self.aggregate('min', self.numeric)
+        self.assertEqual(result[0, 0], 1.)
+        self.assertTrue(np.isnan(result[1, 0]))
+
+    def test_max(self):
+        result = self.aggregate('max', self.numeric)
+        self.assertEqual(result[0, 0], 1.)
+        self.assertTrue(np.isnan(result[1, 0]))
+
+    def test_count(self):
+        result = self.aggregate('count', self.categories)
+        self.assertEqual(result[:, 0].tolist(), [1, 0])
+
+    def test_majority(self):
+        result = self.aggregate('majority', self.categories)
+        self.assertEqual(result[:, 0].tolist(), ['a', None])
+
+
+class ZeroOverlapTest(unittest.TestCase):
+    """Batches and weight tables where no target overlaps a source with positive area."""
+
+    def setUp(self):
+        # Both targets only touch the source
+        self.sources = [box(0, 0, 1, 1)]
+        self.targets = [box(1, 0, 2, 1), box(1, 1, 2, 2)]
+        self.values = np.array([[1., 10.]])
+        self.matrix = weighttable.csr_matrix
+
+    def tearDown(self):
+        weighttable.csr_matrix = self.matrix
+
+    def test_aggregate_overlaps(self):
+        target_index, source_index, weights, source_areas = overlaps(self.targets, self.sources)
+        self.assertEqual(len(target_index), 0)
+        for method in ('sum', 'mean', 'min', 'max'):
+            result = aggregate_overlaps(method, target_index, source_index, weights, source_areas, self.values, len(self.targets))
+            self.assertEqual(result.shape, (2, 2))
+            self.assertTrue(np.isnan(result).all(), method)
+        result = aggregate_overlaps('count', target_index, source_index, weights, source_areas, self.values, len(self.targets))
+        self.assertEqual(result.tolist(), [[0, 0], [0, 0]])
+
+    def test_empty_weight_table(self):
+        weights = OverlapWeights.build({}, ['a'], self.sources, ['t0', 't1'], self.targets)
+        self.assertEqual(len(weights.fractions), 0)
+        for matrix in (self.matrix, None):
+            weighttable.csr_matrix = matrix
+            weights._matrix = None
+            result = weights.aggregate('sum', self.values, np.ones(1))
+            self.assertEqual(result.shape, (2, 2))
+            self.assertTrue(np.isnan(result).all())
+
+
+class OverlapWeightsTest(unittest.TestCase):
+    """Weight tables between a 2 x 2 grid and a 3 x 3 grid over the same square."""
+
+    def setUp(self):
+        self.key = {'from_dggs': 'quadkey', 'to_dggs': 'geohash', 'to_resolution': 3}
+        self.from_ids = ['a', 'b', 'c', 'd']
+        from_geoms = [box(x, y, x + 3, y + 3) for y in (0, 3) for x in (0, 3)]
+        self.to_ids = [f"t{i}" for i in range(9)]
+        to_geoms = [box(x, y, x + 2, y + 2) for y in (0, 2, 4) for x in (0, 2, 4)]
+        self.weights = OverlapWeights.build(self.key, self.from_ids, from_geoms, self.to_ids, to_geoms)
+        self.from_areas = np.full(4, 9.)
+        self.values = np.array([[1., 10.], [2., 20.], [3., 30.], [4., 40.]])
+        self.matrix = weighttable.csr_matrix
+
+    def tearDown(self):
+        weighttable.csr_matrix = self.matrix
+
+    def test_save_load_aggregate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'weights.sqlite')
+            self.weights.save(path)
+            loaded = OverlapWeights.load(path, self.key)
+            self.assertIsNone(OverlapWeights.load(path, dict(self.key, to_resolution=4)))
+        self.assertEqual(loaded.from_ids, self.from_ids)
+        order = [loaded.to_ids.index(to_id) for to_id in self.to_ids]
+        for method in ('sum', 'mean', 'min', 'max', 'count'):
+            expected = self.weights.aggregate(method, self.values, self.from_areas)
+            np.testing.assert_allclose(loaded.aggregate(method, self.values, self.from_areas)[order], expected)
+        # Area-proportional sums keep the totals
+        np.testing.assert_allclose(loaded.aggregate('sum', self.values, self.from_areas).sum(axis=0), self.values.sum(axis=0))
+
+    def test_source_positions(self):
+        self.assertEqual(self.weights.source_positions(['c', 'a']).tolist(), [2, 0])
+        self.assertIsNone(self.weights.source_positions(['a', 'e']))
+
+    def test_apply_matches_weighted_sums(self):
+        expected = weighted_sums(self.weights.to_index, self.weights.from_index, self.weights.fractions, self.values, len(self.to_ids))
+        if self.matrix is not None:
+            np.testing.assert_allclose(self.weights.apply(self.values), expected)
+        weighttable.csr_matrix = None
+        self.weights._matrix = None
+        np.testing.assert_allclose(self.weights.apply(self.values), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
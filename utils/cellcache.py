@@ -0,0 +1,53 @@
+from collections import OrderedDict
+import threading
+
+##########################
+# Session-wide LRU cache of decoded cells
+# ########################
+class CellCache:
+    """
+    Bounded LRU cache keyed by (DGGS type, cell ID).
+    hits/misses are kept so the cache size can be tuned from the Processing log.
+    """
+    def __init__(self, maxsize=200000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cells = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, dggs_type, cell_id, decode):
+        key = (dggs_type, cell_id)
+        with self._lock:
+            value = self._cells.get(key)
+            if value is not None:
+                self._cells.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = decode(cell_id)
+        if value is not None and self.maxsize > 0:
+            with self._lock:
+                self._cells[key] = value
+                while len(self._cells) > self.maxsize:
+                    self._cells.popitem(last=False)
+        return value
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._cells) > max(maxsize, 0):
+                self._cells.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cells.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cells), 'maxsize': self.maxsize}
+
+
+cell_cache = CellCache()
@@ -0,0 +1,231 @@
+import platform, re
+from shapely.geometry import Polygon
+from shapely.wkt import loads
+
+import h3
+from vgrid.generator.h3grid import fix_h3_antimeridian_cells
+from vgrid.utils import s2, qtm, olc, geohash, georef, maidenhead, mercantile
+from vgrid.utils.gars.garsgrid import GARSGrid
+from vgrid.conversion.dggs2geojson import rhealpix_cell_to_polygon
+from vgrid.utils.rhealpixdggs.dggs import RHEALPixDGGS
+from vgrid.utils.rhealpixdggs.ellipsoids import WGS84_ELLIPSOID
+from vgrid.utils.antimeridian import fix_polygon
+from vgrid.generator.settings import geodesic_dggs_metrics, graticule_dggs_metrics
+
+if (platform.system() == 'Windows'):
+    from vgrid.utils.eaggr.eaggr import Eaggr
+    from vgrid.utils.eaggr.shapes.dggs_cell import DggsCell
+    from vgrid.utils.eaggr.enums.shape_string_format import ShapeStringFormat
+    from vgrid.utils.eaggr.enums.model import Model
+    from vgrid.generator.isea4tgrid import fix_isea4t_wkt, fix_isea4t_antimeridian_cells
+    from vgrid.conversion.dggs2geojson import isea3h_cell_to_polygon
+    from vgrid.generator.settings import isea3h_accuracy_res_dict
+    isea4t_dggs = Eaggr(Model.ISEA4T)
+    isea3h_dggs = Eaggr(Model.ISEA3H)
+
+from pyproj import Geod
+
+# Cell polygons without QGIS: this module is also imported by resampling worker processes,
+# which must start without qgis.core. dggscell adds the QgsGeometry of each cell.
+
+geod = Geod(ellps="WGS84")
+rhealpix_dggs = RHEALPixDGGS(ellipsoid=WGS84_ELLIPSOID, north_square=1, south_square=3, N_side=3)
+# Layout of the rHEALPix grid generator, Vector2DGGS, compact and expand (polar squares differ from rhealpix_dggs)
+rhealpix_grid_dggs = RHEALPixDGGS()
+
+# DGGS instance target cells of the DGGS grid generators are decoded with, where it differs from the default
+GRID_DGGS = {'rhealpix': rhealpix_grid_dggs}
+
+GEODESIC_DGGS = ('h3', 's2', 'rhealpix', 'isea4t', 'isea3h', 'ease', 'qtm')
+
+# Each decoder returns (cell_polygon, attributes) or None, where attributes are
+# [resolution, center_lat, center_lon, avg_edge_len, cell_area] for geodesic DGGS and
+# [resolution, center_lat, center_lon, cell_width, cell_height, cell_area] for graticule DGGS.
+
+def bounds_cell(min_lon, min_lat, max_lon, max_lat, resolution):
+    cell_polygon = Polygon([
+        [min_lon, min_lat],  # Bottom-left corner
+        [max_lon, min_lat],  # Bottom-right corner
+        [max_lon, max_lat],  # Top-right corner
+        [min_lon, max_lat],  # Top-left corner
+        [min_lon, min_lat]   # Closing the polygon (same as the first point)
+    ])
+    center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
+    return cell_polygon, [resolution, center_lat, center_lon, cell_width, cell_height, cell_area]
+
+
+##########################
+# Geodesic DGGS
+# ########################
+def decode_h3(h3_id):
+    cell_boundary = h3.cell_to_boundary(h3_id)
+    if not cell_boundary:
+        return None
+    filtered_boundary = fix_h3_antimeridian_cells(cell_boundary)
+    # Reverse lat/lon to lon/lat
+    cell_polygon = Polygon([(lon, lat) for lat, lon in filtered_boundary])
+    num_edges = 5 if h3.is_pentagon(h3_id) else 6
+    center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
+    return cell_polygon, [h3.get_resolution(h3_id), center_lat, center_lon, avg_edge_len, cell_area]
+
+def decode_s2(s2_token):
+    cell_id = s2.CellId.from_token(s2_token)
+    cell = s2.Cell(cell_id)
+    if not cell:
+        return None
+    vertices = []
+    for i in range(4):
+        lat_lng = s2.LatLng.from_point(cell.get_vertex(i))
+        vertices.append((lat_lng.lng().degrees, lat_lng.lat().degrees))
+    vertices.append(vertices[0])  # Closing the polygon
+    cell_polygon = fix_polygon(Polygon(vertices)) # Fix antimeridian
+    center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, 4)
+    return cell_polygon, [cell_id.level(), center_lat, center_lon, avg_edge_len, cell_area]
+
+def decode_rhealpix(rhealpix_id, rhealpix_dggs=rhealpix_dggs):
+    rhealpix_id = str(rhealpix_id)
+    rhealpix_uids = (rhealpix_id[0],) + tuple(map(int, rhealpix_id[1:]))
+    rhealpix_cell = rhealpix_dggs.cell(rhealpix_uids)
+    if not rhealpix_cell:
+        return None
+    cell_polygon = rhealpix_cell_to_polygon(rhealpix_cell)
+    num_edges = 3 if rhealpix_cell.ellipsoidal_shape() == 'dart' else 4
+    center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
+    return cell_polygon, [rhealpix_cell.resolution, center_lat, center_lon, avg_edge_len, cell_area]
+
+def decode_isea4t(isea4t_id):
+    if (platform.system() != 'Windows'):
+        return None
+    cell_to_shape = isea4t_dggs.convert_dggs_cell_outline_to_shape_string(DggsCell(isea4t_id), ShapeStringFormat.WKT)
+    cell_to_shape_fixed = loads(fix_isea4t_wkt(cell_to_shape))
+    if isea4t_id.startswith('00') or isea4t_id.startswith('09') or isea4t_id.startswith('14')\
+        or isea4t_id.startswith('04') or isea4t_id.startswith('19'):
+        cell_to_shape_fixed = fix_isea4t_antimeridian_cells(cell_to_shape_fixed)
+    if not cell_to_shape_fixed:
+        return None
+    cell_polygon = Polygon(list(cell_to_shape_fixed.exterior.coords))
+    center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, 3)
+    return cell_polygon, [len(isea4t_id) - 2, center_lat, center_lon, avg_edge_len, cell_area]
+
+def decode_isea3h(isea3h_id):
+    if (platform.system() != 'Windows'):
+        return None
+    cell_polygon = isea3h_cell_to_polygon(isea3h_id)
+    cell_centroid = cell_polygon.centroid
+    center_lat = round(cell_centroid.y, 7)
+    center_lon = round(cell_centroid.x, 7)
+
+    cell_area, cell_perimeter = geod.geometry_area_perimeter(cell_polygon)
+    cell_area, cell_perimeter = abs(cell_area), abs(cell_perimeter)
+    accuracy = isea3h_dggs.convert_dggs_cell_to_point(DggsCell(isea3h_id))._accuracy
+
+    avg_edge_len = cell_perimeter / 6
+    resolution = isea3h_accuracy_res_dict.get(accuracy)
+    if (resolution == 0): # icosahedron faces at resolution = 0
+        avg_edge_len = cell_perimeter / 3
+
+    if accuracy == 0.0:
+        if round(avg_edge_len,2) == 0.06:
+            resolution = 33
+        elif round(avg_edge_len,2) == 0.03:
+            resolution = 34
+        elif round(avg_edge_len,2) == 0.02:
+            resolution = 35
+        elif round(avg_edge_len,2) == 0.01:
+            resolution = 36
+        elif round(avg_edge_len,3) == 0.007:
+            resolution = 37
+        elif round(avg_edge_len,3) == 0.004:
+            resolution = 38
+        elif round(avg_edge_len,3) == 0.002:
+            resolution = 39
+        elif round(avg_edge_len,3) <= 0.001:
+            resolution = 40
+
+    return cell_polygon, [resolution, center_lat, center_lon, round(avg_edge_len,3), round(cell_area,3)]
+
+def decode_qtm(qtm_id):
+    facet = qtm.qtm_id_to_facet(qtm_id)
+    if not facet:
+        return None
+    cell_polygon = qtm.constructGeometry(facet)
+    center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, 3)
+    return cell_polygon, [len(qtm_id), center_lat, center_lon, avg_edge_len, cell_area]
+
+
+##########################
+# Graticule DGGS
+# ########################
+def decode_olc(olc_id):
+    coord = olc.decode(olc_id)
+    if not coord:
+        return None
+    return bounds_cell(coord.longitudeLo, coord.latitudeLo, coord.longitudeHi, coord.latitudeHi, coord.codeLength)
+
+def decode_geohash(geohash_id):
+    bbox = geohash.bbox(geohash_id)
+    if not bbox:
+        return None
+    return bounds_cell(bbox['w'], bbox['s'], bbox['e'], bbox['n'], len(geohash_id))
+
+def decode_georef(georef_id):
+    center_lat, center_lon, min_lat, min_lon, max_lat, max_lon, resolution = georef.georefcell(georef_id)
+    if not center_lat:
+        return None
+    return bounds_cell(min_lon, min_lat, max_lon, max_lat, resolution)
+
+def decode_tilecode(tilecode_id):
+    match = re.match(r'z(\d+)x(\d+)y(\d+)', tilecode_id)
+    if not match:
+        raise ValueError("Invalid tilecode format. Expected format: 'zXxYyZ'")
+    z, x, y = int(match.group(1)), int(match.group(2)), int(match.group(3))
+    bounds = mercantile.bounds(x, y, z)
+    if not bounds:
+        return None
+    return bounds_cell(bounds.west, bounds.south, bounds.east, bounds.north, z)
+
+def decode_quadkey(quadkey_id):
+    tile = mercantile.quadkey_to_tile(quadkey_id)
+    bounds = mercantile.bounds(tile.x, tile.y, tile.z)
+    if not bounds:
+        return None
+    return bounds_cell(bounds.west, bounds.south, bounds.east, bounds.north, tile.z)
+
+def decode_maidenhead(maidenhead_id):
+    center_lat, center_lon, min_lat, min_lon, max_lat, max_lon, _ = maidenhead.maidenGrid(maidenhead_id)
+    if not center_lat:
+        return None
+    return bounds_cell(min_lon, min_lat, max_lon, max_lat, int(len(maidenhead_id) / 2))
+
+def decode_gars(gars_id):
+    gars_grid = GARSGrid(gars_id)
+    gars_polygon = gars_grid.polygon
+    if not gars_polygon:
+        return None
+    x, y = gars_polygon.exterior.xy
+    resolution = {30: 1, 15: 2, 5: 3, 1: 4}.get(gars_grid.resolution, 1)
+    return bounds_cell(min(x), min(y), max(x), max(y), resolution)
+
+
+DGGS_CELL_POLYGONS = {
+    'h3': decode_h3,
+    's2': decode_s2,
+    'rhealpix': decode_rhealpix,
+    'isea4t': decode_isea4t,
+    'isea3h': decode_isea3h,
+    'qtm': decode_qtm,
+    'olc': decode_olc,
+    'geohash': decode_geohash,
+    'georef': decode_georef,
+    'tilecode': decode_tilecode,
+    'quadkey': decode_quadkey,
+    'maidenhead': decode_maidenhead,
+    'gars': decode_gars
+}
+
+
+def cell_polygon(dggs_type, cell_id, dggs=None):
+    """(cell_polygon, attributes) of a cell or None; dggs is the DGGS instance to decode with instead of the default one."""
+    if dggs is None:
+        return DGGS_CELL_POLYGONS[dggs_type](cell_id)
+    return DGGS_CELL_POLYGONS[dggs_type](cell_id, dggs)
@@ -0,0 +1,82 @@
+import hashlib, json, sqlite3, time
+
+CACHE_COMMIT_INTERVAL = 100
+
+##########################
+# Vector2DGGS conversion cache
+# ########################
+class ConversionCache:
+    """
+    On-disk SQLite cache of the cell IDs covering a feature geometry, keyed by
+    (geometry hash, DGGS type, resolution, compact flag, containment mode).
+    Entries are evicted by age and, least recently used first, by total size.
+    New entries are committed every CACHE_COMMIT_INTERVAL puts, so a cancelled or
+    crashed run keeps most of what it computed.
+    """
+    def __init__(self, path, max_size_mb=256, max_age_days=30):
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024) if max_size_mb and max_size_mb > 0 else 0
+        self.max_age = max_age_days * 86400 if max_age_days and max_age_days > 0 else 0
+        self.hits = 0
+        self.misses = 0
+        self.pending = 0
+        # Processing prepares, runs and finalizes algorithms on different threads
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cells ("
+            "key TEXT PRIMARY KEY, cell_ids TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS cells_accessed ON cells (accessed)")
+        self.evict()
+
+    @staticmethod
+    def make_key(geometry, dggs_type, resolution, compact, mode='intersects'):
+        digest = hashlib.sha1(bytes(geometry.asWkb())).hexdigest()
+        return f"{digest}|{dggs_type}|{resolution}|{int(bool(compact))}|{mode}"
+
+    def get(self, key):
+        row = self.conn.execute("SELECT cell_ids, created FROM cells WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or (self.max_age and row[1] < now - self.max_age):
+            self.misses += 1
+            return None
+        self.conn.execute("UPDATE cells SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, cell_ids):
+        payload = json.dumps([str(cell_id) for cell_id in cell_ids])
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cells (key, cell_ids, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, payload, len(payload), now, now)
+        )
+        self.pending += 1
+        if self.pending >= CACHE_COMMIT_INTERVAL:
+            self.conn.commit()
+            self.pending = 0
+
+    def evict(self):
+        removed = 0
+        if self.max_age:
+            cursor = self.conn.execute("DELETE FROM cells WHERE created < ?", (time.time() - self.max_age,))
+            removed += cursor.rowcount
+        if self.max_size:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cells").fetchone()[0]
+            if total > self.max_size:
+                stale_keys = []
+                for key, size in self.conn.execute("SELECT key, size FROM cells ORDER BY accessed ASC"):
+                    if total <= self.max_size:
+                        break
+                    stale_keys.append((key,))
+                    total -= size
+                self.conn.executemany("DELETE FROM cells WHERE key = ?", stale_keys)
+                removed += len(stale_keys)
+        self.conn.commit()
+        self.pending = 0
+        return removed
+
+    def close(self):
+        self.evict()
+        self.conn.close()
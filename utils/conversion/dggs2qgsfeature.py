@@ -23,11 +23,15 @@ from vgrid.utils.easedggs.dggs.grid_addressing import grid_ids_to_geos
 from vgrid.utils import mercantile
 from shapely.geometry import Polygon,shape
 from shapely.wkt import loads
+from ..geometry import shapely_to_qgsgeometry, bounds_to_qgsgeometry
+from .dggscell import get_cell, GEODESIC_DGGS
+from .dggsbatch import graticule_cells_to_bounds, GRATICULE_BATCH_DECODERS
 import json
 import h3 
 from vgrid.utils.antimeridian import fix_polygon
 from vgrid.generator.settings import geodesic_dggs_metrics, graticule_dggs_metrics
-from pyproj import Geod
+from pyproj import Geod, Transformer
+from shapely.prepared import prep
 
 geod = Geod(ellps="WGS84")
 from qgis.core import (
@@ -38,291 +42,67 @@ from qgis.core import (
 )
 
     
-def h32qgsfeature(feature, h3_id):
-      # Get the boundary coordinates of the H3 cell
-    cell_boundary = h3.cell_to_boundary(h3_id)    
-    if cell_boundary:
-        filtered_boundary = fix_h3_antimeridian_cells(cell_boundary)
-        # Reverse lat/lon to lon/lat for GeoJSON compatibility
-        reversed_boundary = [(lon, lat) for lat, lon in filtered_boundary]
-        cell_polygon = Polygon(reversed_boundary)
-        num_edges = 6       
-        if (h3.is_pentagon(h3_id)):
-            num_edges = 5  
-        resolution = h3.get_resolution(h3_id)       
-            
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)   
-       
-        h3_feature = QgsFeature()
-        h3_feature.setGeometry(cell_geometry)
-        
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("h3", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
+def cell_to_qgsfeature(feature, dggs_type, cell_id, cell):
+    # cell is a (cell_polygon, cell_geometry, attributes) record from dggscell.get_cell
+    _, cell_geometry, cell_attributes = cell
+
+    # Get all attributes from the input feature
+    original_attributes = feature.attributes()
+    original_fields = feature.fields()
+
+    # Define new DGGS-related attributes
+    new_fields = QgsFields()
+    new_fields.append(QgsField(dggs_type, QVariant.String))
+    new_fields.append(QgsField("resolution", QVariant.Int))
+    new_fields.append(QgsField("center_lat", QVariant.Double))
+    new_fields.append(QgsField("center_lon", QVariant.Double))
+    if dggs_type in GEODESIC_DGGS:
         new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        h3_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        
-        new_attributes = [h3_id,resolution, center_lat, center_lon, avg_edge_len,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        h3_feature.setAttributes(all_attributes)    
-        return h3_feature
-   
+    else:
+        new_fields.append(QgsField("cell_width", QVariant.Double))
+        new_fields.append(QgsField("cell_height", QVariant.Double))
+    new_fields.append(QgsField("cell_area", QVariant.Double))
+
+    # Combine original fields and new fields
+    all_fields = QgsFields()
+    for field in original_fields:
+        all_fields.append(field)
+    for field in new_fields:
+        all_fields.append(field)
+
+    cell_feature = QgsFeature()
+    cell_feature.setGeometry(cell_geometry)
+    cell_feature.setFields(all_fields)
+
+    # Combine original attributes with new attributes
+    cell_feature.setAttributes(original_attributes + [cell_id] + cell_attributes)
+    return cell_feature
+
+def h32qgsfeature(feature, h3_id):
+    cell = get_cell('h3', h3_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'h3', h3_id, cell)
+
 def s22qgsfeature(feature, s2_token):
-    # Create an S2 cell from the given cell ID
-    cell_id = s2.CellId.from_token(s2_token)
-    cell = s2.Cell(cell_id)
-    
+    cell = get_cell('s2', s2_token)
     if cell:
-        # Get the vertices of the cell (4 vertices for a rectangular cell)
-        vertices = [cell.get_vertex(i) for i in range(4)]
-        
-        # Convert vertices to QGIS coordinates format [longitude, latitude]
-        shapely_vertices = []
-        for vertex in vertices:
-            lat_lng = s2.LatLng.from_point(vertex)
-            longitude = lat_lng.lng().degrees
-            latitude = lat_lng.lat().degrees
-            shapely_vertices.append(QgsPointXY(longitude, latitude))
-        
-        # Close the polygon by adding the first vertex again
-        shapely_vertices.append(shapely_vertices[0])  # Closing the polygon
-        
-        cell_polygon = fix_polygon(Polygon(shapely_vertices)) # Fix antimeridian
-        resolution = cell_id.level()
-        num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-       
-        s2_feature = QgsFeature()
-        s2_feature.setGeometry(cell_geometry)
-        
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("s2", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        s2_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [s2_token,resolution, center_lat, center_lon, avg_edge_len,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        s2_feature.setAttributes(all_attributes)    
-        return s2_feature
-
-def rhealpix2qgsfeature(feature, rhealpix_id):
-    rhealpix_id = str(rhealpix_id)
-    rhealpix_uids = (rhealpix_id[0],) + tuple(map(int, rhealpix_id[1:]))
-    rhealpix_dggs = RHEALPixDGGS(ellipsoid= WGS84_ELLIPSOID, north_square=1, south_square=3, N_side=3) 
-    rhealpix_cell = rhealpix_dggs.cell(rhealpix_uids)
-    
-    if rhealpix_cell:
-        resolution = rhealpix_cell.resolution        
-        cell_polygon = rhealpix_cell_to_polygon(rhealpix_cell)
-        
-        num_edges = 4
-        if rhealpix_cell.ellipsoidal_shape() == 'dart':
-            num_edges = 3
-        
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-       
-        rhealpix_feature = QgsFeature()
-        rhealpix_feature.setGeometry(cell_geometry)
-        
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("rhealpix", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        rhealpix_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [rhealpix_id, resolution, center_lat, center_lon, avg_edge_len,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        rhealpix_feature.setAttributes(all_attributes)    
-        return rhealpix_feature
-    
+        return cell_to_qgsfeature(feature, 's2', s2_token, cell)
 
-def isea4t2qgsfeature(feature, isea4t_id):
-    if (platform.system() == 'Windows'): 
-        isea4t_dggs = Eaggr(Model.ISEA4T)
-        cell_to_shape = isea4t_dggs.convert_dggs_cell_outline_to_shape_string(DggsCell(isea4t_id),ShapeStringFormat.WKT)
-        cell_to_shape_fixed = loads(fix_isea4t_wkt(cell_to_shape))
-    
-        if isea4t_id.startswith('00') or isea4t_id.startswith('09') or isea4t_id.startswith('14')\
-            or isea4t_id.startswith('04') or isea4t_id.startswith('19'):
-            cell_to_shape_fixed = fix_isea4t_antimeridian_cells(cell_to_shape_fixed)
-        
-        if cell_to_shape_fixed:
-            resolution = len(isea4t_id)-2
-            cell_polygon = Polygon(list(cell_to_shape_fixed.exterior.coords))
+def rhealpix2qgsfeature(feature, rhealpix_id, rhealpix_dggs=None):
+    # rhealpix_dggs: the rHEALPix layout to decode with, instead of the CellID2DGGS one
+    cell = get_cell('rhealpix', rhealpix_id, rhealpix_dggs)
+    if cell:
+        return cell_to_qgsfeature(feature, 'rhealpix', rhealpix_id, cell)
 
-            num_edges = 3              
-            center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-            isea4t_feature = QgsFeature()
-            isea4t_feature.setGeometry(cell_geometry)
-            
-            # Get all attributes from the input feature
-            original_attributes = feature.attributes()
-            original_fields = feature.fields()
-            
-            # Define new H3-related attributes
-            new_fields = QgsFields()
-            new_fields.append(QgsField("isea4t", QVariant.String))
-            new_fields.append(QgsField("resolution", QVariant.Int))
-            new_fields.append(QgsField("center_lat", QVariant.Double))
-            new_fields.append(QgsField("center_lon", QVariant.Double))
-            new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-            new_fields.append(QgsField("cell_area", QVariant.Double))
-            
-            # Combine original fields and new fields
-            all_fields = QgsFields()
-            for field in original_fields:
-                all_fields.append(field)
-            for field in new_fields:
-                all_fields.append(field)
-            
-            isea4t_feature.setFields(all_fields)
-            
-            # Combine original attributes with new attributes
-            new_attributes = [isea4t_id, resolution, center_lat, center_lon, avg_edge_len,cell_area]
-            all_attributes = original_attributes + new_attributes
-            
-            isea4t_feature.setAttributes(all_attributes)    
-            return isea4t_feature
-            
+def isea4t2qgsfeature(feature, isea4t_id):
+    cell = get_cell('isea4t', isea4t_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'isea4t', isea4t_id, cell)
 
 def isea3h2qgsfeature(feature, isea3h_id):
-    if (platform.system() == 'Windows'): 
-        isea3h_dggs = Eaggr(Model.ISEA3H)        
-        cell_polygon = isea3h_cell_to_polygon(isea3h_id)
-
-        cell_centroid = cell_polygon.centroid
-        center_lat =  round(cell_centroid.y, 7)
-        center_lon = round(cell_centroid.x, 7)
-        
-        cell_area = abs(geod.geometry_area_perimeter(cell_polygon)[0])
-        cell_perimeter = abs(geod.geometry_area_perimeter(cell_polygon)[1])
-        isea3h2point = isea3h_dggs.convert_dggs_cell_to_point(DggsCell(isea3h_id))      
-        
-        accuracy = isea3h2point._accuracy
-            
-        avg_edge_len = cell_perimeter / 6
-        
-        resolution  = isea3h_accuracy_res_dict.get(accuracy)
-        
-        if (resolution == 0): # icosahedron faces at resolution = 0
-            avg_edge_len = cell_perimeter / 3
-        
-        if accuracy == 0.0:
-            if round(avg_edge_len,2) == 0.06:
-                resolution = 33
-            elif round(avg_edge_len,2) == 0.03:
-                resolution = 34
-            elif round(avg_edge_len,2) == 0.02:
-                resolution = 35
-            elif round(avg_edge_len,2) == 0.01:
-                resolution = 36
-            
-            elif round(avg_edge_len,3) == 0.007:
-                resolution = 37
-            elif round(avg_edge_len,3) == 0.004:
-                resolution = 38
-            elif round(avg_edge_len,3) == 0.002:
-                resolution = 39
-            elif round(avg_edge_len,3) <= 0.001:
-                resolution = 40
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        isea3h_feature = QgsFeature()
-        isea3h_feature.setGeometry(cell_geometry)
-        
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("isea3h", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        isea3h_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [isea3h_id, resolution, center_lat, center_lon, round(avg_edge_len,3),round(cell_area,3)]
-        all_attributes = original_attributes + new_attributes
-        
-        isea3h_feature.setAttributes(all_attributes)    
-        return isea3h_feature
-        
+    cell = get_cell('isea3h', isea3h_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'isea3h', isea3h_id, cell)
 
 def ease2qgsfeature(feature, ease_id):
     try:
@@ -354,7 +134,7 @@ def ease2qgsfeature(feature, ease_id):
         num_edges = 4        
         center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
         
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon) 
         ease_feature = QgsFeature()
         ease_feature.setGeometry(cell_geometry)
         
@@ -393,128 +173,74 @@ def ease2qgsfeature(feature, ease_id):
   
 
 def qtm2qgsfeature(feature, qtm_cellid):
-    facet = qtm.qtm_id_to_facet(qtm_cellid)
-    if facet:
-        resolution = len(qtm_cellid)
-        cell_polygon = qtm.constructGeometry(facet)   
-        num_edges = 3              
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
-            
-        qtm_feature = QgsFeature()
-        qtm_feature.setGeometry(cell_geometry)
-        
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new s2-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("qtm", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        qtm_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [qtm_cellid, resolution, center_lat, center_lon,  avg_edge_len, cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        qtm_feature.setAttributes(all_attributes)
-        
-        return qtm_feature
+    cell = get_cell('qtm', qtm_cellid)
+    if cell:
+        return cell_to_qgsfeature(feature, 'qtm', qtm_cellid, cell)
 
 def olc2qgsfeature(feature, olc_cellid):
-    # Decode the Open Location Code into a CodeArea object
-    coord = olc.decode(olc_cellid)   
-
-    if coord:
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = coord.latitudeLo, coord.longitudeLo
-        max_lat, max_lon = coord.latitudeHi, coord.longitudeHi        
-      
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
-        resolution = coord.codeLength 
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("olc", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        olc_feature = QgsFeature()
-        olc_feature.setGeometry(cell_geometry)
-        olc_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [olc_cellid, resolution, center_lat, center_lon, cell_width, cell_height,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        olc_feature.setAttributes(all_attributes)    
-        
-        return olc_feature
-
-
-def mgrs2qgsfeature(feature, mgrs_id):           
-    resolution, grid_size = mgrs.get_precision_and_grid_size(mgrs_id)
-    zone, hemisphere, easting, northing = mgrs._mgrsToUtm(mgrs_id)
-
-    min_x, min_y = easting, northing
-    max_x, max_y = min_x + grid_size, min_y + grid_size  # Correct max_x, max_y calculation
-
-    # Determine UTM EPSG code
-    if hemisphere == 'N':
-        epsg_code = 32600 + int(zone)
-    else:
-        epsg_code = 32700 + int(zone)
-
-    utm_crs = QgsCoordinateReferenceSystem(epsg_code)
-    wgs84_crs = QgsCoordinateReferenceSystem(4326)  # WGS84
-
-    transform_context = QgsProject.instance().transformContext()
-    transformer = QgsCoordinateTransform(utm_crs, wgs84_crs, transform_context)
-
-    # utm_crs = CRS.from_epsg(epsg_code)
-    # wgs84_crs = CRS.from_epsg(4326)
-    # # # Create transformer from UTM to WGS84
-    # transformer = Transformer.from_crs(utm_crs, wgs84_crs, always_xy=True)
-
-    # Convert all four corners
-    min_lon, min_lat = transformer.transform(min_x, min_y)
-    max_lon, max_lat = transformer.transform(max_x, max_y)
+    cell = get_cell('olc', olc_cellid)
+    if cell:
+        return cell_to_qgsfeature(feature, 'olc', olc_cellid, cell)
+
+##########################
+# MGRS
+# ########################
+_gzd_index = None
+_mgrs_transformers = {}
+
+def get_gzd_index():
+    # gzd.geojson is parsed once per session: {gzd: (geometry, prepared geometry)}
+    global _gzd_index
+    if _gzd_index is None:
+        gzd_json_path = os.path.join(os.path.dirname(__file__), 'gzd.geojson')
+        with open(gzd_json_path, 'r') as f:
+            gzd_data = json.load(f)
+        _gzd_index = {}
+        for gzd_feature in gzd_data["features"]:
+            gzd = gzd_feature["properties"].get("gzd")
+            if gzd and gzd not in _gzd_index:
+                gzd_geom = shape(gzd_feature["geometry"])
+                _gzd_index[gzd] = (gzd_geom, prep(gzd_geom))
+    return _gzd_index
+
+def get_mgrs_transformer(zone, hemisphere):
+    # One UTM -> WGS84 transformer per zone/hemisphere, reused across cells
+    epsg_code = (32600 if hemisphere == 'N' else 32700) + int(zone)
+    transformer = _mgrs_transformers.get(epsg_code)
+    if transformer is None:
+        transformer = Transformer.from_crs(epsg_code, 4326, always_xy=True)
+        _mgrs_transformers[epsg_code] = transformer
+    return transformer
+
+def mgrs_cells_to_bounds(mgrs_ids):
+    """Decode MGRS IDs to {mgrs_id: (resolution, min_lon, min_lat, max_lon, max_lat)}, one transform call per UTM zone."""
+    zone_cells = {}
+    for mgrs_id in set(mgrs_ids):
+        try:
+            resolution, grid_size = mgrs.get_precision_and_grid_size(mgrs_id)
+            zone, hemisphere, easting, northing = mgrs._mgrsToUtm(mgrs_id)
+        except Exception:
+            continue
+        zone_cells.setdefault((zone, hemisphere), []).append((mgrs_id, resolution, easting, northing, grid_size))
+
+    cell_bounds = {}
+    for (zone, hemisphere), cells in zone_cells.items():
+        transformer = get_mgrs_transformer(zone, hemisphere)
+        # Lower-left corners followed by upper-right corners
+        xs = [easting for _, _, easting, _, _ in cells] + [easting + grid_size for _, _, easting, _, grid_size in cells]
+        ys = [northing for _, _, _, northing, _ in cells] + [northing + grid_size for _, _, _, northing, grid_size in cells]
+        lons, lats = transformer.transform(xs, ys)
+        n = len(cells)
+        for i, (mgrs_id, resolution, _, _, _) in enumerate(cells):
+            cell_bounds[mgrs_id] = (resolution, lons[i], lats[i], lons[n + i], lats[n + i])
+    return cell_bounds
+
+def mgrs2qgsfeature(feature, mgrs_id, cell_bounds=None):
+    if cell_bounds is None or mgrs_id not in cell_bounds:
+        cell_bounds = mgrs_cells_to_bounds([mgrs_id])
+    if mgrs_id not in cell_bounds:
+        return None
+    resolution, min_lon, min_lat, max_lon, max_lat = cell_bounds[mgrs_id]
 
     # Define the polygon coordinates for the MGRS cell
     cell_polygon = Polygon([
@@ -525,24 +251,17 @@ def mgrs2qgsfeature(feature, mgrs_id):
         (min_lon, min_lat)   # Closing the polygon
     ])
     
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
+    cell_geometry = bounds_to_qgsgeometry(min_lon, min_lat, max_lon, max_lat)
     center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
     
     try:
-        gzd_json_path = os.path.join(os.path.dirname(__file__), 'gzd.geojson')    
-              
-        with open(gzd_json_path, 'r') as f:
-            gzd_data = json.load(f)
-    
-        gzd_features = gzd_data["features"]
-        gzd_feature = [feature for feature in gzd_features if feature["properties"].get("gzd") == mgrs_id[:3]][0]
-        gzd_geom = shape(gzd_feature["geometry"])
+        gzd_geom, gzd_prepared = get_gzd_index()[mgrs_id[:3]]
     
         if mgrs_id[2] not in {"A", "B", "Y", "Z"}: # not polar bands
-            if cell_polygon.intersects(gzd_geom) and not gzd_geom.contains(cell_polygon):
+            if gzd_prepared.intersects(cell_polygon) and not gzd_prepared.contains(cell_polygon):
                 intersected_polygon = cell_polygon.intersection(gzd_geom)  
                 if intersected_polygon:
-                    cell_geometry = QgsGeometry.fromWkt(intersected_polygon.wkt) 
+                    cell_geometry = shapely_to_qgsgeometry(intersected_polygon) 
                     center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(intersected_polygon)
     except:
         pass    
@@ -579,340 +298,40 @@ def mgrs2qgsfeature(feature, mgrs_id):
     mgrs_feature.setAttributes(all_attributes)   
     
     return mgrs_feature
-    return None
    
 def geohash2qgsfeature(feature, geohash_id):
-    # Decode the Geohash to get bounding box coordinates
-    bbox = geohash.bbox(geohash_id)        
-    if bbox:
-        # Define the bounding box corners
-        min_lat, min_lon = bbox['s'], bbox['w']  # Southwest corner
-        max_lat, max_lon = bbox['n'], bbox['e']  # Northeast corner
-        resolution = len(geohash_id)
-        
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
+    cell = get_cell('geohash', geohash_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'geohash', geohash_id, cell)
 
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("geohash", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        geohash_feature = QgsFeature()
-        geohash_feature.setGeometry(cell_geometry)
-        geohash_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [geohash_id, resolution, center_lat, center_lon, cell_width, cell_height,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        geohash_feature.setAttributes(all_attributes) 
-        
-        return geohash_feature
-     
 def georef2qgsfeature(feature, georef_id):
-    center_lat, center_lon, min_lat, min_lon, max_lat, max_lon,resolution = georef.georefcell(georef_id)        
-    if center_lat:
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
+    cell = get_cell('georef', georef_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'georef', georef_id, cell)
 
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("georef", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        georef_feature = QgsFeature()
-        georef_feature.setGeometry(cell_geometry)
-        georef_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [georef_id, resolution, center_lat, center_lon, cell_width, cell_height,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        georef_feature.setAttributes(all_attributes) 
-        
-        return georef_feature
-        
-def tilecode2qgsfeature(feature, tilecode_id):   
-    # Extract z, x, y from the tilecode using regex
-    match = re.match(r'z(\d+)x(\d+)y(\d+)', tilecode_id)
-    if not match:
-        raise ValueError("Invalid tilecode format. Expected format: 'zXxYyZ'")
-
-    # Convert matched groups to integers
-    z = int(match.group(1))
-    x = int(match.group(2))
-    y = int(match.group(3))
-
-    # Get the bounds of the tile in (west, south, east, north)
-    bounds = mercantile.bounds(x, y, z)
-    
-    if bounds:
-        # Define bounding box coordinates
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
-        
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("tilecode", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        tilecode_feature = QgsFeature()
-        tilecode_feature.setGeometry(cell_geometry)
-        tilecode_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [tilecode_id, z, center_lat, center_lon, cell_width, cell_height,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        tilecode_feature.setAttributes(all_attributes) 
-        
-        return tilecode_feature
-
-def quadkey2qgsfeature(feature, quadkey_id):   
-    tile = mercantile.quadkey_to_tile(quadkey_id)    
-    z = tile.z
-    x = tile.x
-    y = tile.y    
-    # Get the bounds of the tile in (west, south, east, north)
-    bounds = mercantile.bounds(x, y, z)        
-    if bounds:
-        # Define bounding box coordinates
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
+def tilecode2qgsfeature(feature, tilecode_id):
+    cell = get_cell('tilecode', tilecode_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'tilecode', tilecode_id, cell)
 
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("quadkey", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        quadkey_feature = QgsFeature()
-        quadkey_feature.setGeometry(cell_geometry)
-        quadkey_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [quadkey_id, z, center_lat, center_lon, cell_width, cell_height,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        quadkey_feature.setAttributes(all_attributes) 
-        
-        return quadkey_feature
+def quadkey2qgsfeature(feature, quadkey_id):
+    cell = get_cell('quadkey', quadkey_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'quadkey', quadkey_id, cell)
 
-       
 def maidenhead2qgsfeature(feature, maidenhead_id):
-    # Decode the Maidenhead code to get the bounding box and center coordinates
-    center_lat, center_lon, min_lat, min_lon, max_lat, max_lon, _ = maidenhead.maidenGrid(maidenhead_id)
-    if center_lat:
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
-        resolution = int(len(maidenhead_id) / 2)    
-
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("maidenhead", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        maidenhead_feature = QgsFeature()
-        maidenhead_feature.setGeometry(cell_geometry)
-        maidenhead_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [maidenhead_id,resolution, center_lat, center_lon, cell_width, cell_height,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        maidenhead_feature.setAttributes(all_attributes) 
-        
-        return maidenhead_feature
+    cell = get_cell('maidenhead', maidenhead_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'maidenhead', maidenhead_id, cell)
 
 def gars2qgsfeature(feature, gars_id):
-    # Create a GARS grid object and retrieve the polygon
-    gars_grid = GARSGrid(gars_id)
-    wkt_polygon = gars_grid.polygon  
-
-    if wkt_polygon:
-        # Extract the bounding box coordinates for the polygon
-        x, y = wkt_polygon.exterior.xy  # Assuming exterior.xy returns lists of x and y coordinates
-        resolution_minute = gars_grid.resolution
-        resolution = 1
-        if resolution_minute == 30:
-            resolution = 1
-        elif resolution_minute == 15:
-            resolution = 2
-        elif resolution_minute == 5:
-            resolution = 3
-        elif resolution_minute == 1:
-            resolution = 4
-        
-        # Determine min/max latitudes and longitudes
-        min_lon = min(x)
-        max_lon = max(x)
-        min_lat = min(y)
-        max_lat = max(y)
-       
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
-
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-        
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("gars", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
-        gars_feature = QgsFeature()
-        gars_feature.setGeometry(cell_geometry)
-        gars_feature.setFields(all_fields)
-        
-        # Combine original attributes with new attributes
-        new_attributes = [gars_id,resolution, center_lat, center_lon, cell_width, cell_height,cell_area]
-        all_attributes = original_attributes + new_attributes
-        
-        gars_feature.setAttributes(all_attributes) 
-        
-        return gars_feature              
\ No newline at end of file
+    cell = get_cell('gars', gars_id)
+    if cell:
+        return cell_to_qgsfeature(feature, 'gars', gars_id, cell)
+
+def graticule2qgsfeature(feature, dggs_type, cell_id, cell_bounds):
+    # cell_bounds comes from dggsbatch.graticule_cells_to_bounds, decoded for the whole ID column at once
+    if cell_id not in cell_bounds:
+        return None
+    bounds, cell_attributes = cell_bounds[cell_id]
+    return cell_to_qgsfeature(feature, dggs_type, cell_id, (None, bounds_to_qgsgeometry(*bounds), cell_attributes))
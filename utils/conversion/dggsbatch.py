@@ -0,0 +1,456 @@
+import numpy as np
+from pyproj import Geod
+from vgrid.utils import olc
+
+geod = Geod(ellps="WGS84")
+
+# Every decoder takes a list of cell ID strings and returns NumPy arrays
+# (valid, resolution, min_lon, min_lat, max_lon, max_lat).
+# IDs flagged as invalid are left to the per-cell decoders in dggscell.
+
+def lookup_table(alphabet):
+    table = np.full(256, -1, dtype=np.int64)
+    for i, c in enumerate(alphabet):
+        table[ord(c)] = i
+    return table
+
+def char_codes(cell_ids):
+    # (n, width) matrix of ASCII codes, zero padded to the longest ID
+    lengths = np.fromiter((len(cell_id) for cell_id in cell_ids), dtype=np.int64, count=len(cell_ids))
+    width = max(int(lengths.max()), 1)
+    try:
+        codes = np.array(cell_ids, dtype=f'S{width}').view(np.uint8).reshape(len(cell_ids), width)
+    except UnicodeEncodeError:
+        codes = np.array([cell_id.encode('ascii', 'replace') for cell_id in cell_ids], dtype=f'S{width}')
+        codes = codes.view(np.uint8).reshape(len(cell_ids), width)
+    in_code = np.arange(width) < lengths[:, None]
+    return codes, lengths, in_code
+
+def decode_chars(cell_ids, table):
+    # Digit values per character (0 on padding) and a per-ID flag for unknown characters
+    codes, lengths, in_code = char_codes(cell_ids)
+    values = table[codes]
+    valid = np.all((values >= 0) | ~in_code, axis=1)
+    values[~in_code] = 0
+    return values, lengths, valid
+
+def bits_to_int(bits):
+    # Rows of bits (most significant first) to integers
+    weights = np.left_shift(1, np.arange(bits.shape[1] - 1, -1, -1, dtype=np.int64))
+    return bits @ weights
+
+def tile_bounds(x, y, z):
+    # Vectorized mercantile.bounds
+    z2 = np.ldexp(1.0, z)
+    west = x / z2 * 360.0 - 180.0
+    east = (x + 1) / z2 * 360.0 - 180.0
+    north = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y / z2))))
+    south = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + 1) / z2))))
+    return west, south, east, north
+
+
+##########################
+# Geohash
+# ########################
+GEOHASH_TABLE = lookup_table('0123456789bcdefghjkmnpqrstuvwxyz')
+GEOHASH_MAX_LENGTH = 12  # 30 bits per axis
+
+def geohash_bounds(geohash_ids):
+    values, lengths, valid = decode_chars(geohash_ids, GEOHASH_TABLE)
+    valid &= (lengths > 0) & (lengths <= GEOHASH_MAX_LENGTH)
+    values = values[:, :GEOHASH_MAX_LENGTH]
+
+    # De-interleave the 5-bit characters: even bits are longitude, odd bits latitude
+    bits = (values[:, :, None] >> np.arange(4, -1, -1)) & 1
+    bits = bits.reshape(len(geohash_ids), -1)
+    lon_bits, lat_bits = bits[:, 0::2], bits[:, 1::2]
+    lon_length = (5 * lengths + 1) // 2
+    lat_length = 5 * lengths // 2
+    lon_int = bits_to_int(lon_bits) >> np.clip(lon_bits.shape[1] - lon_length, 0, None)
+    lat_int = bits_to_int(lat_bits) >> np.clip(lat_bits.shape[1] - lat_length, 0, None)
+
+    lon_delta = np.ldexp(360.0, -lon_length)
+    lat_delta = np.ldexp(180.0, -lat_length)
+    min_lon = lon_int * lon_delta - 180.0
+    min_lat = lat_int * lat_delta - 90.0
+    return valid, lengths, min_lon, min_lat, min_lon + lon_delta, min_lat + lat_delta
+
+
+##########################
+# Quadkey
+# ########################
+QUADKEY_TABLE = lookup_table('0123')
+QUADKEY_MAX_LENGTH = 29
+
+def quadkey_bounds(quadkey_ids):
+    values, lengths, valid = decode_chars(quadkey_ids, QUADKEY_TABLE)
+    valid &= lengths <= QUADKEY_MAX_LENGTH
+    values = values[:, :QUADKEY_MAX_LENGTH]
+
+    # Each quadkey digit carries one x bit (low) and one y bit (high)
+    shift = np.clip(values.shape[1] - lengths, 0, None)
+    x = bits_to_int(values & 1) >> shift
+    y = bits_to_int(values >> 1) >> shift
+    west, south, east, north = tile_bounds(x, y, lengths)
+    return valid, lengths, west, south, east, north
+
+
+##########################
+# Tilecode
+# ########################
+def parse_tilecode(tilecode_id):
+    # 'z{z}x{x}y{y}' -> (z, x, y), or None
+    if not tilecode_id.startswith('z'):
+        return None
+    zx, _, y = tilecode_id[1:].partition('y')
+    z, _, x = zx.partition('x')
+    if not (z.isdigit() and x.isdigit() and y.isdigit()):
+        return None
+    z, x, y = int(z), int(x), int(y)
+    if z > QUADKEY_MAX_LENGTH or x >= 1 << z or y >= 1 << z:
+        return None
+    return z, x, y
+
+def tilecode_bounds(tilecode_ids):
+    zxy = np.array([parse_tilecode(tilecode_id) or (-1, 0, 0) for tilecode_id in tilecode_ids], dtype=np.int64).reshape(-1, 3)
+    z, x, y = zxy[:, 0], zxy[:, 1], zxy[:, 2]
+    valid = z >= 0
+    z = np.where(valid, z, 0)
+    west, south, east, north = tile_bounds(x, y, z)
+    return valid, z, west, south, east, north
+
+
+##########################
+# Maidenhead
+# ########################
+MAIDENHEAD_FIELD_TABLE = lookup_table('ABCDEFGHIJKLMNOPQR')
+MAIDENHEAD_SUBSQUARE_TABLE = lookup_table('ABCDEFGHIJKLMNOPQRSTUVWX')
+DIGIT_TABLE = lookup_table('0123456789')
+# Cell size (lon, lat) in degrees of each character pair
+MAIDENHEAD_PAIR_SIZES = ((20., 10.), (2., 1.), (5. / 60, 2.5 / 60), (5. / 600, 2.5 / 600))
+
+def maidenhead_bounds(maidenhead_ids):
+    maidenhead_ids = [maidenhead_id.strip().upper() for maidenhead_id in maidenhead_ids]
+    codes, lengths, in_code = char_codes(maidenhead_ids)
+    codes = np.pad(codes, ((0, 0), (0, max(8 - codes.shape[1], 0))))[:, :8]
+    valid = np.isin(lengths, (2, 4, 6, 8))
+
+    # Accumulate pair by pair, in the same order as maidenhead.maidenGrid
+    min_lon = np.full(len(maidenhead_ids), -180.)
+    min_lat = np.full(len(maidenhead_ids), -90.)
+    lon_size = np.zeros(len(maidenhead_ids))
+    lat_size = np.zeros(len(maidenhead_ids))
+    tables = (MAIDENHEAD_FIELD_TABLE, DIGIT_TABLE, MAIDENHEAD_SUBSQUARE_TABLE, DIGIT_TABLE)
+    for pair, (table, (lon_step, lat_step)) in enumerate(zip(tables, MAIDENHEAD_PAIR_SIZES)):
+        used = lengths > 2 * pair
+        lon_value = table[codes[:, 2 * pair]]
+        lat_value = table[codes[:, 2 * pair + 1]]
+        valid &= ~used | ((lon_value >= 0) & (lat_value >= 0))
+        min_lon = np.where(used, min_lon + lon_value * lon_step, min_lon)
+        min_lat = np.where(used, min_lat + lat_value * lat_step, min_lat)
+        lon_size = np.where(lengths == 2 * pair + 2, lon_step, lon_size)
+        lat_size = np.where(lengths == 2 * pair + 2, lat_step, lat_size)
+    return valid, lengths // 2, min_lon, min_lat, min_lon + lon_size, min_lat + lat_size
+
+
+##########################
+# GARS
+# ########################
+GARS_TABLE = lookup_table('ABCDEFGHJKLMNPQRSTUVWXYZ')
+# GARS ID length -> (cell size in minutes, resolution)
+GARS_LENGTHS = {5: (30, 1), 6: (15, 2), 7: (5, 3), 9: (1, 4)}
+
+def gars_bounds(gars_ids):
+    codes, lengths, in_code = char_codes(gars_ids)
+    codes = np.pad(codes, ((0, 0), (0, max(9 - codes.shape[1], 0))))[:, :9]
+    digits = DIGIT_TABLE[codes]
+    valid = np.isin(lengths, list(GARS_LENGTHS))
+
+    # 30 minute band: 3 digit longitude number and two latitude letters
+    lon_band = digits[:, 0] * 100 + digits[:, 1] * 10 + digits[:, 2]
+    letter1, letter2 = GARS_TABLE[codes[:, 3]], GARS_TABLE[codes[:, 4]]
+    valid &= np.all(digits[:, :3] >= 0, axis=1) & (lon_band >= 1) & (lon_band <= 720)
+    valid &= (letter1 >= 0) & (letter1 <= 14) & (letter2 >= 0)
+    longitude = (lon_band - 1) / 2.0 - 180
+    latitude = (-90.0 + letter1 * 12.0) + letter2 / 2.0
+
+    # 15 minute quadrant (1-4), 5 minute keypad (1-9) and 1 minute quadrant (01-25)
+    q15, q5 = digits[:, 5], digits[:, 6]
+    q1 = digits[:, 7] * 10 + digits[:, 8]
+    has_q15, has_q5, has_q1 = lengths >= 6, lengths >= 7, lengths == 9
+    valid &= ~has_q15 | ((q15 >= 1) & (q15 <= 4))
+    valid &= ~has_q5 | ((q5 >= 1) & (q5 <= 9))
+    valid &= ~has_q1 | ((digits[:, 7] >= 0) & (digits[:, 8] >= 0) & (q1 >= 1) & (q1 <= 25))
+
+    lon_minutes = np.where(has_q15 & np.isin(q15, (2, 4)), 15.0, 0.0)
+    lat_minutes = np.where(has_q15 & np.isin(q15, (1, 2)), 15.0, 0.0)
+    lon_minutes += np.where(has_q5, 5.0 * ((q5 - 1) % 3), 0.0)
+    lat_minutes += np.where(has_q5, 5.0 * (2 - (q5 - 1) // 3), 0.0)
+    lon_minutes += np.where(has_q1, 1.0 * ((q1 - 1) % 5), 0.0)
+    lat_minutes += np.where(has_q1, 4.0 - (q1 - 1) // 5, 0.0)
+
+    cell_minutes = np.array([GARS_LENGTHS.get(length, (30, 1))[0] for length in lengths.tolist()], dtype=float)
+    resolution = np.array([GARS_LENGTHS.get(length, (30, 1))[1] for length in lengths.tolist()], dtype=np.int64)
+    min_lat = latitude + lat_minutes / 60.0
+    min_lon = longitude + lon_minutes / 60.0
+    return valid, resolution, min_lon, min_lat, min_lon + cell_minutes / 60.0, min_lat + cell_minutes / 60.0
+
+
+##########################
+# OLC
+# ########################
+OLC_TABLE = lookup_table(olc.CODE_ALPHABET_)
+OLC_PAIR_PLACE_VALUES = [olc.ENCODING_BASE_ ** (olc.PAIR_CODE_LENGTH_ // 2 - 1 - i) for i in range(olc.PAIR_CODE_LENGTH_ // 2)]
+OLC_GRID_LAT_PLACE_VALUES = [olc.GRID_ROWS_ ** (olc.GRID_CODE_LENGTH_ - 1 - i) for i in range(olc.GRID_CODE_LENGTH_)]
+OLC_GRID_LNG_PLACE_VALUES = [olc.GRID_COLUMNS_ ** (olc.GRID_CODE_LENGTH_ - 1 - i) for i in range(olc.GRID_CODE_LENGTH_)]
+
+def olc_bounds(olc_ids):
+    # Validation stays with olc.isFull; only the decoding arithmetic is vectorized
+    valid = np.array([olc.isFull(olc_id) for olc_id in olc_ids], dtype=bool)
+    codes = [olc_id.replace('+', '').replace('0', '').upper()[:olc.MAX_DIGIT_COUNT_] if is_valid else ''
+             for olc_id, is_valid in zip(olc_ids, valid)]
+    values, lengths, known = decode_chars(codes, OLC_TABLE)
+    valid &= known & (lengths > 0)
+    values = np.pad(values, ((0, 0), (0, max(olc.MAX_DIGIT_COUNT_ - values.shape[1], 0))))
+
+    # Paired digits: latitude then longitude, base 20 (padding decodes as digit 0)
+    pair_values = np.array(OLC_PAIR_PLACE_VALUES, dtype=np.int64)
+    normal_lat = -olc.LATITUDE_MAX_ * olc.PAIR_PRECISION_ + values[:, 0:olc.PAIR_CODE_LENGTH_:2] @ pair_values
+    normal_lng = -olc.LONGITUDE_MAX_ * olc.PAIR_PRECISION_ + values[:, 1:olc.PAIR_CODE_LENGTH_:2] @ pair_values
+    pair_digits = np.minimum(lengths, olc.PAIR_CODE_LENGTH_)
+    last_pair = np.clip((pair_digits - 1) // 2, 0, len(OLC_PAIR_PLACE_VALUES) - 1)
+    lat_precision = pair_values[last_pair] / olc.PAIR_PRECISION_
+    lng_precision = lat_precision.copy()
+
+    # Grid digits: 5 rows x 4 columns per digit
+    grid = values[:, olc.PAIR_CODE_LENGTH_:olc.MAX_DIGIT_COUNT_]
+    grid_lat = (grid // olc.GRID_COLUMNS_) @ np.array(OLC_GRID_LAT_PLACE_VALUES, dtype=np.int64)
+    grid_lng = (grid % olc.GRID_COLUMNS_) @ np.array(OLC_GRID_LNG_PLACE_VALUES, dtype=np.int64)
+    has_grid = lengths > olc.PAIR_CODE_LENGTH_
+    last_grid = np.clip(lengths - olc.PAIR_CODE_LENGTH_ - 1, 0, olc.GRID_CODE_LENGTH_ - 1)
+    lat_precision = np.where(has_grid, np.array(OLC_GRID_LAT_PLACE_VALUES)[last_grid] / olc.FINAL_LAT_PRECISION_, lat_precision)
+    lng_precision = np.where(has_grid, np.array(OLC_GRID_LNG_PLACE_VALUES)[last_grid] / olc.FINAL_LNG_PRECISION_, lng_precision)
+
+    lat = normal_lat / olc.PAIR_PRECISION_ + grid_lat / olc.FINAL_LAT_PRECISION_
+    lng = normal_lng / olc.PAIR_PRECISION_ + grid_lng / olc.FINAL_LNG_PRECISION_
+    return (valid, np.minimum(lengths, olc.MAX_DIGIT_COUNT_),
+            np.round(lng, 14), np.round(lat, 14), np.round(lng + lng_precision, 14), np.round(lat + lat_precision, 14))
+
+
+GRATICULE_BATCH_DECODERS = {
+    'olc': olc_bounds,
+    'geohash': geohash_bounds,
+    'tilecode': tilecode_bounds,
+    'quadkey': quadkey_bounds,
+    'maidenhead': maidenhead_bounds,
+    'gars': gars_bounds
+}
+
+def graticule_metrics(min_lon, min_lat, max_lon, max_lat):
+    """Vectorized graticule_dggs_metrics over arrays of cell bounds."""
+    center_lat = np.round((min_lat + max_lat) / 2, 7)
+    center_lon = np.round((min_lon + max_lon) / 2, 7)
+    cell_width = np.round(geod.inv(min_lon, min_lat, max_lon, min_lat)[2], 3)
+    cell_height = np.round(geod.inv(min_lon, min_lat, min_lon, max_lat)[2], 3)
+
+    # A lat/lon rectangle's area only depends on its latitudes and longitude span,
+    # so the geodesic area is computed once per distinct row of cells
+    keys = np.column_stack([min_lat, max_lat, max_lon - min_lon])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    areas = np.array([
+        abs(geod.polygon_area_perimeter(
+            [min_lon[i], max_lon[i], max_lon[i], min_lon[i]],
+            [min_lat[i], min_lat[i], max_lat[i], max_lat[i]])[0])
+        for i in first
+    ])
+    cell_area = np.round(areas[inverse.ravel()], 3)
+    return center_lat, center_lon, cell_width, cell_height, cell_area
+
+def graticule_cells_to_bounds(dggs_type, cell_ids):
+    """
+    Decode a column of graticule DGGS IDs in one pass:
+    {cell_id: ((min_lon, min_lat, max_lon, max_lat), [resolution, center_lat, center_lon, cell_width, cell_height, cell_area])}.
+    Invalid IDs are left out.
+    """
+    cell_ids = list({cell_id for cell_id in cell_ids if isinstance(cell_id, str) and cell_id})
+    if not cell_ids:
+        return {}
+    valid, resolution, min_lon, min_lat, max_lon, max_lat = GRATICULE_BATCH_DECODERS[dggs_type](cell_ids)
+    keep = np.flatnonzero(valid)
+    if not len(keep):
+        return {}
+    min_lon, min_lat, max_lon, max_lat = min_lon[keep], min_lat[keep], max_lon[keep], max_lat[keep]
+    metrics = graticule_metrics(min_lon, min_lat, max_lon, max_lat)
+
+    columns = [resolution[keep].tolist()] + [metric.tolist() for metric in metrics]
+    bounds = zip(min_lon.tolist(), min_lat.tolist(), max_lon.tolist(), max_lat.tolist())
+    return {
+        cell_ids[i]: (cell_bounds, list(attributes))
+        for i, cell_bounds, attributes in zip(keep.tolist(), bounds, zip(*columns))
+    }
+
+
+##########################
+# Batch encoding of lat/lon arrays
+# ########################
+# Encoders map arrays of points to integer cell keys, so that millions of pixels can be
+# de-duplicated with np.unique before any ID string is built; key_ids turns the unique
+# keys back into cell IDs.
+
+def geohash_keys(lats, lons, resolution):
+    lat_length = 5 * resolution // 2
+    lon_length = (5 * resolution + 1) // 2
+    lons = np.mod(np.asarray(lons, dtype=float) + 180.0, 360.0)
+    lat_int = np.clip(np.floor((np.asarray(lats, dtype=float) + 90.0) / 180.0 * (1 << lat_length)), 0, (1 << lat_length) - 1).astype(np.int64)
+    lon_int = np.clip(np.floor(lons / 360.0 * (1 << lon_length)), 0, (1 << lon_length) - 1).astype(np.int64)
+    # Interleave, longitude first
+    keys = np.zeros(lat_int.shape, dtype=np.int64)
+    for bit in range(5 * resolution):
+        if bit % 2 == 0:
+            lon_length -= 1
+            keys = (keys << 1) | ((lon_int >> lon_length) & 1)
+        else:
+            lat_length -= 1
+            keys = (keys << 1) | ((lat_int >> lat_length) & 1)
+    return keys
+
+def geohash_key_ids(keys, resolution):
+    alphabet = '0123456789bcdefghjkmnpqrstuvwxyz'
+    shifts = range(5 * (resolution - 1), -1, -5)
+    return [''.join(alphabet[(key >> shift) & 31] for shift in shifts) for key in keys.tolist()]
+
+def tile_xy(lats, lons, resolution):
+    # Vectorized mercantile.tile
+    x = np.asarray(lons, dtype=float) / 360.0 + 0.5
+    sinlat = np.sin(np.radians(np.asarray(lats, dtype=float)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = 0.5 - 0.25 * np.log((1.0 + sinlat) / (1.0 - sinlat)) / np.pi
+    z2 = 2.0 ** resolution
+    epsilon = 1e-14
+    xtile = np.where(x <= 0, 0, np.where(x >= 1, z2 - 1, np.floor((x + epsilon) * z2)))
+    ytile = np.where(y <= 0, 0, np.where(y >= 1, z2 - 1, np.floor((y + epsilon) * z2)))
+    return xtile.astype(np.int64), ytile.astype(np.int64)
+
+def tile_keys(lats, lons, resolution):
+    xtile, ytile = tile_xy(lats, lons, resolution)
+    return (ytile << resolution) | xtile
+
+def tilecode_key_ids(keys, resolution):
+    mask = (1 << resolution) - 1
+    return [f"z{resolution}x{key & mask}y{key >> resolution}" for key in keys.tolist()]
+
+def quadkey_key_ids(keys, resolution):
+    mask = (1 << resolution) - 1
+    quadkey_ids = []
+    for key in keys.tolist():
+        x, y = key & mask, key >> resolution
+        quadkey_ids.append(''.join(
+            str(((x >> level) & 1) | (((y >> level) & 1) << 1))
+            for level in range(resolution - 1, -1, -1)
+        ))
+    return quadkey_ids
+
+OLC_MAX_BATCH_LENGTH = 12  # keeps lat/lon cell indices within one int64 key
+
+def olc_units(resolution):
+    # Size of a code of this length in units of the final OLC precision (lat, lng)
+    if resolution > olc.PAIR_CODE_LENGTH_:
+        grid_digits = olc.MAX_DIGIT_COUNT_ - resolution
+        return olc.GRID_ROWS_ ** grid_digits, olc.GRID_COLUMNS_ ** grid_digits
+    pair_unit = olc.ENCODING_BASE_ ** ((olc.PAIR_CODE_LENGTH_ - resolution) // 2)
+    return olc.GRID_ROWS_ ** olc.GRID_CODE_LENGTH_ * pair_unit, olc.GRID_COLUMNS_ ** olc.GRID_CODE_LENGTH_ * pair_unit
+
+def olc_lng_count(resolution):
+    return 2 * olc.LONGITUDE_MAX_ * olc.FINAL_LNG_PRECISION_ // olc_units(resolution)[1] + 1
+
+def olc_keys(lats, lons, resolution):
+    lat_unit, lng_unit = olc_units(resolution)
+    lats = np.clip(np.asarray(lats, dtype=float), -olc.LATITUDE_MAX_, olc.LATITUDE_MAX_)
+    lats = np.where(lats == olc.LATITUDE_MAX_, lats - olc.computeLatitudePrecision(resolution), lats)
+    lons = np.mod(np.asarray(lons, dtype=float) + olc.LONGITUDE_MAX_, 2 * olc.LONGITUDE_MAX_)
+    # Same integer conversion as olc.encode: round to 6 decimals, then truncate
+    lat_val = np.floor(np.round((lats + olc.LATITUDE_MAX_) * olc.FINAL_LAT_PRECISION_, 6)).astype(np.int64)
+    lng_val = np.floor(np.round(lons * olc.FINAL_LNG_PRECISION_, 6)).astype(np.int64)
+    return (lat_val // lat_unit) * olc_lng_count(resolution) + lng_val // lng_unit
+
+def olc_key_ids(keys, resolution):
+    # Encode the centre of each unique cell, which is unambiguous
+    lat_unit, lng_unit = olc_units(resolution)
+    lat_index, lng_index = np.divmod(keys, olc_lng_count(resolution))
+    lats = ((lat_index + 0.5) * lat_unit / olc.FINAL_LAT_PRECISION_ - olc.LATITUDE_MAX_).tolist()
+    lons = ((lng_index + 0.5) * lng_unit / olc.FINAL_LNG_PRECISION_ - olc.LONGITUDE_MAX_).tolist()
+    return [olc.encode(lat, lon, resolution) for lat, lon in zip(lats, lons)]
+
+
+GRATICULE_BATCH_ENCODERS = {
+    'olc': (olc_keys, olc_key_ids),
+    'geohash': (geohash_keys, geohash_key_ids),
+    'tilecode': (tile_keys, tilecode_key_ids),
+    'quadkey': (tile_keys, quadkey_key_ids)
+}
+
+def can_batch_encode(dggs_type, resolution):
+    if dggs_type not in GRATICULE_BATCH_ENCODERS:
+        return False
+    if dggs_type == 'olc':
+        return resolution <= OLC_MAX_BATCH_LENGTH
+    if dggs_type == 'geohash':
+        return 1 <= resolution <= GEOHASH_MAX_LENGTH
+    return resolution <= QUADKEY_MAX_LENGTH
+
+
+##########################
+# Key grids
+# ########################
+# At a given resolution the graticule DGGS are regular grids: geohash and OLC in
+# EPSG:4326, quadkey and tilecode in EPSG:3857. A grid is described as
+# (crs, west, north, cell_width, cell_height, columns, rows) and key_grid maps
+# integer cell keys to (column, row) with rows counted from the north.
+
+WEB_MERCATOR_HALF_WORLD = 20037508.342789244
+
+def geohash_grid(resolution):
+    lat_length = 5 * resolution // 2
+    lon_length = (5 * resolution + 1) // 2
+    return 'EPSG:4326', -180.0, 90.0, 360.0 / (1 << lon_length), 180.0 / (1 << lat_length), 1 << lon_length, 1 << lat_length
+
+def geohash_key_grid(keys, resolution):
+    # De-interleave, longitude first
+    lat_length = 5 * resolution // 2
+    keys = np.asarray(keys, dtype=np.int64)
+    lon_int = np.zeros(keys.shape, dtype=np.int64)
+    lat_int = np.zeros(keys.shape, dtype=np.int64)
+    for bit in range(5 * resolution):
+        shift = 5 * resolution - 1 - bit
+        if bit % 2 == 0:
+            lon_int = (lon_int << 1) | ((keys >> shift) & 1)
+        else:
+            lat_int = (lat_int << 1) | ((keys >> shift) & 1)
+    return lon_int, (1 << lat_length) - 1 - lat_int
+
+def tile_grid(resolution):
+    tile_size = 2 * WEB_MERCATOR_HALF_WORLD / (1 << resolution)
+    return 'EPSG:3857', -WEB_MERCATOR_HALF_WORLD, WEB_MERCATOR_HALF_WORLD, tile_size, tile_size, 1 << resolution, 1 << resolution
+
+def tile_key_grid(keys, resolution):
+    keys = np.asarray(keys, dtype=np.int64)
+    return keys & ((1 << resolution) - 1), keys >> resolution
+
+def olc_grid(resolution):
+    lat_unit, lng_unit = olc_units(resolution)
+    rows = 2 * olc.LATITUDE_MAX_ * olc.FINAL_LAT_PRECISION_ // lat_unit
+    columns = 2 * olc.LONGITUDE_MAX_ * olc.FINAL_LNG_PRECISION_ // lng_unit
+    return ('EPSG:4326', -float(olc.LONGITUDE_MAX_), float(olc.LATITUDE_MAX_),
+            lng_unit / olc.FINAL_LNG_PRECISION_, lat_unit / olc.FINAL_LAT_PRECISION_, columns, rows)
+
+def olc_key_grid(keys, resolution):
+    lat_index, lng_index = np.divmod(np.asarray(keys, dtype=np.int64), olc_lng_count(resolution))
+    return lng_index, olc_grid(resolution)[6] - 1 - lat_index
+
+
+GRATICULE_KEY_GRIDS = {
+    'olc': (olc_grid, olc_key_grid),
+    'geohash': (geohash_grid, geohash_key_grid),
+    'tilecode': (tile_grid, tile_key_grid),
+    'quadkey': (tile_grid, tile_key_grid)
+}
@@ -0,0 +1,56 @@
+import platform
+from qgis.core import QgsFields, QgsField
+from PyQt5.QtCore import QVariant
+from ..geometry import shapely_to_qgsgeometry, bounds_to_qgsgeometry
+from ..cellcache import cell_cache
+# The DGGS instances and grid layouts are re-exported for the modules decoding through get_cell
+from .cellpolygon import DGGS_CELL_POLYGONS, GEODESIC_DGGS, GRID_DGGS, rhealpix_dggs, rhealpix_grid_dggs
+
+if (platform.system() == 'Windows'):
+    from .cellpolygon import isea4t_dggs, isea3h_dggs
+
+# Each decoder returns (cell_polygon, cell_geometry, attributes) or None: the cellpolygon
+# decoder's polygon and attributes plus the cell's QgsGeometry.
+
+def cell_fields(dggs_type):
+    """Output fields matching [cell_id] + attributes of the decoders below."""
+    fields = QgsFields()
+    fields.append(QgsField(dggs_type, QVariant.String))
+    fields.append(QgsField("resolution", QVariant.Int))
+    fields.append(QgsField("center_lat", QVariant.Double))
+    fields.append(QgsField("center_lon", QVariant.Double))
+    if dggs_type in GEODESIC_DGGS:
+        fields.append(QgsField("avg_edge_len", QVariant.Double))
+    else:
+        fields.append(QgsField("cell_width", QVariant.Double))
+        fields.append(QgsField("cell_height", QVariant.Double))
+    fields.append(QgsField("cell_area", QVariant.Double))
+    return fields
+
+def cell_geometry(dggs_type, cell_polygon):
+    # Graticule cells are rectangles built straight from their bounds
+    if dggs_type in GEODESIC_DGGS:
+        return shapely_to_qgsgeometry(cell_polygon)
+    return bounds_to_qgsgeometry(*cell_polygon.bounds)
+
+def cell_decoder(dggs_type, decode_polygon):
+    def decode(cell_id, *dggs):
+        cell = decode_polygon(cell_id, *dggs)
+        if cell is None:
+            return None
+        cell_polygon, attributes = cell
+        return cell_polygon, cell_geometry(dggs_type, cell_polygon), attributes
+    return decode
+
+DGGS_CELL_DECODERS = {dggs_type: cell_decoder(dggs_type, decode_polygon) for dggs_type, decode_polygon in DGGS_CELL_POLYGONS.items()}
+
+def get_cell(dggs_type, cell_id, dggs=None):
+    """
+    Decode a cell through the session-wide cell cache: (cell_polygon, cell_geometry, attributes) or None.
+    dggs is the DGGS instance to decode with instead of the default one (rhealpix_grid_dggs for the
+    rHEALPix grid layout); its cells are cached apart.
+    """
+    if dggs is None:
+        return cell_cache.lookup(dggs_type, cell_id, DGGS_CELL_DECODERS[dggs_type])
+    decode = DGGS_CELL_DECODERS[dggs_type]
+    return cell_cache.lookup((dggs_type, id(dggs)), cell_id, lambda cell_id: decode(cell_id, dggs))
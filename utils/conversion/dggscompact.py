@@ -2,9 +2,9 @@ from vgrid.utils import s2, olc, mercantile
 from vgrid.utils import qtm
 import h3
 
-from vgrid.utils.rhealpixdggs.dggs import RHEALPixDGGS
 from vgrid.utils.rhealpixdggs.ellipsoids import WGS84_ELLIPSOID
 import platform,re
+import numpy as np
 if (platform.system() == 'Windows'):   
     from vgrid.utils.eaggr.enums.shape_string_format import ShapeStringFormat
     from vgrid.utils.eaggr.eaggr import Eaggr
@@ -20,6 +20,13 @@ if (platform.system() == 'Linux'):
 
 
 from shapely.wkt import loads
+from ..geometry import shapely_to_qgsgeometry
+from ..featurewriter import feature_output
+from ..featurereader import read_column, read_columns, attribute_value
+from ..dggsmetrics import DGGS_RESOLUTIONS, DGGS_PARENTS, DGGS_CHILD_COUNTS, pyramid_resolutions
+from .keycompact import key_compact
+from .dggscell import get_cell, cell_fields, rhealpix_grid_dggs
+from .dggsbatch import parse_tilecode
 from shapely.geometry import Polygon
 
 from vgrid.generator.h3grid import fix_h3_antimeridian_cells
@@ -45,7 +52,7 @@ from shapely.geometry import Polygon
 ########################## 
 # H3
 # ########################
-def h3compact(h3_layer: QgsVectorLayer, H3ID_field=None,feedback=None) -> QgsVectorLayer:
+def h3compact(h3_layer: QgsVectorLayer, H3ID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if not H3ID_field:
         H3ID_field = 'h3'
         
@@ -57,17 +64,9 @@ def h3compact(h3_layer: QgsVectorLayer, H3ID_field=None,feedback=None) -> QgsVec
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = h3_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "h3_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    h3_ids = [
-        feature[H3ID_field]
-        for feature in h3_layer.getFeatures()
-        if feature[H3ID_field]
-    ]
+    writer, output = feature_output(fields, h3_layer.crs(), "h3_compacted", create_sink)
+
+    h3_ids = read_column(h3_layer, H3ID_field)
     h3_ids = list(set(h3_ids))
     
     if h3_ids:
@@ -84,44 +83,30 @@ def h3compact(h3_layer: QgsVectorLayer, H3ID_field=None,feedback=None) -> QgsVec
                 if feedback.isCanceled():
                     return None
 
-            cell_boundary = h3.cell_to_boundary(h3_id_compact)
-            filtered_boundary = fix_h3_antimeridian_cells(cell_boundary)
-            reversed_boundary = [(lon, lat) for lat, lon in filtered_boundary]
-            cell_polygon = Polygon(reversed_boundary)
-            
+            cell = get_cell('h3', h3_id_compact)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
             if not cell_polygon.is_valid:
                 continue
-            
-            resolution = h3.get_resolution(h3_id_compact)
-            num_edges = 5 if h3.is_pentagon(h3_id_compact) else 6
-            center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
             h3_feature = QgsFeature(fields)
             h3_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "h3": h3_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                }
-            h3_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([h3_feature])
+            h3_feature.setAttributes([h3_id_compact] + cell_attributes)
+            writer.addFeature(h3_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("H3 Compact completed.")
                 
-        return mem_layer
+        writer.flush()
+        return output
 
 
 ########################## 
 # S2
 # ########################
-def s2compact(s2_layer: QgsVectorLayer, S2ID_field=None, feedback=None) -> QgsVectorLayer:
+def s2compact(s2_layer: QgsVectorLayer, S2ID_field=None, feedback=None, create_sink=None) -> QgsVectorLayer:
     if not S2ID_field:
         S2ID_field = 's2'
 
@@ -133,17 +118,9 @@ def s2compact(s2_layer: QgsVectorLayer, S2ID_field=None, feedback=None) -> QgsVe
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = s2_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "s2_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    s2_tokens = [
-        feature[S2ID_field]
-        for feature in s2_layer.getFeatures()
-        if feature[S2ID_field]
-    ]
+    writer, output = feature_output(fields, s2_layer.crs(), "s2_compacted", create_sink)
+
+    s2_tokens = read_column(s2_layer, S2ID_field)
     
     try:
         s2_ids = [s2.CellId.from_token(token) for token in s2_tokens]
@@ -163,60 +140,34 @@ def s2compact(s2_layer: QgsVectorLayer, S2ID_field=None, feedback=None) -> QgsVe
             if feedback.isCanceled():
                 return None
 
-        s2_id_compact = s2.CellId.from_token(s2_token_compact)
-        s2_cell = s2.Cell(s2_id_compact)    
-        # Get the vertices of the cell (4 vertices for a rectangular cell)
-        vertices = [s2_cell.get_vertex(i) for i in range(4)]
-        # Prepare vertices in (longitude, latitude) format for Shapely
-        shapely_vertices = []
-        for vertex in vertices:
-            lat_lng = s2.LatLng.from_point(vertex)  # Convert Point to LatLng
-            longitude = lat_lng.lng().degrees  # Access longitude in degrees
-            latitude = lat_lng.lat().degrees   # Access latitude in degrees
-            shapely_vertices.append((longitude, latitude))
-
-        # Close the polygon by adding the first vertex again
-        shapely_vertices.append(shapely_vertices[0])  # Closing the polygon
-        # Create a Shapely Polygon
-        cell_polygon = fix_polygon(Polygon(shapely_vertices)) # Fix antimeridian
-            
+        cell = get_cell('s2', s2_token_compact)
+        if not cell:
+            continue
+        cell_polygon, cell_geom, cell_attributes = cell
         if not cell_polygon.is_valid:
             continue
-        
-        resolution = s2_id_compact.level() 
-        num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        
-        cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
         s2_feature = QgsFeature(fields)
         s2_feature.setGeometry(cell_geom)
-        
-        attributes = {
-            "s2": s2_token_compact,
-            "resolution": resolution,
-            "center_lat": center_lat,
-            "center_lon": center_lon,
-            "avg_edge_len": avg_edge_len,
-            "cell_area": cell_area,
-            }
-        s2_feature.setAttributes([attributes[field.name()] for field in fields])
-        mem_provider.addFeatures([s2_feature])
+        s2_feature.setAttributes([s2_token_compact] + cell_attributes)
+        writer.addFeature(s2_feature)
 
     if feedback:
         feedback.setProgress(100)
         feedback.pushInfo("S2 Compact completed.")
             
-    return mem_layer
+    writer.flush()
+    return output
 
 
 ########################## 
 # rHEALPix
 # ########################
-def rhealpixcompact(rhealpix_layer: QgsVectorLayer, rHEALPixID_field=None,feedback=None) -> QgsVectorLayer:
+def rhealpixcompact(rhealpix_layer: QgsVectorLayer, rHEALPixID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if not rHEALPixID_field:
         rHEALPixID_field = 'rhealpix'
 
-    rhealpix_dggs = RHEALPixDGGS()
+    rhealpix_dggs = rhealpix_grid_dggs
     
     fields = QgsFields()
     fields.append(QgsField("rhealpix", QVariant.String))
@@ -226,17 +177,9 @@ def rhealpixcompact(rhealpix_layer: QgsVectorLayer, rHEALPixID_field=None,feedba
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = rhealpix_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "rhealpix_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    rhealpix_ids = [
-        feature[rHEALPixID_field]
-        for feature in rhealpix_layer.getFeatures()
-        if feature[rHEALPixID_field]
-    ]
+    writer, output = feature_output(fields, rhealpix_layer.crs(), "rhealpix_compacted", create_sink)
+
+    rhealpix_ids = read_column(rhealpix_layer, rHEALPixID_field)
     
     if rhealpix_ids:
         try:
@@ -263,7 +206,7 @@ def rhealpixcompact(rhealpix_layer: QgsVectorLayer, rHEALPixID_field=None,feedba
             
             center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
             
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geom = shapely_to_qgsgeometry(cell_polygon)
             rhealpix_feature = QgsFeature(fields)
             rhealpix_feature.setGeometry(cell_geom)
             
@@ -276,18 +219,19 @@ def rhealpixcompact(rhealpix_layer: QgsVectorLayer, rHEALPixID_field=None,feedba
                 "cell_area": cell_area,
                 }
             rhealpix_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([rhealpix_feature])
+            writer.addFeature(rhealpix_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("rHEALPix Compact completed.")
                 
-        return mem_layer
+        writer.flush()
+        return output
 
 ########################## 
 # ISEA4T
 # ########################
-def isea4tcompact(isea4t_layer: QgsVectorLayer, ISEA4TID_field=None,feedback=None) -> QgsVectorLayer:
+def isea4tcompact(isea4t_layer: QgsVectorLayer, ISEA4TID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if platform.system() == 'Windows':    
         if not ISEA4TID_field:
             ISEA4TID_field = 'isea4t'
@@ -302,17 +246,9 @@ def isea4tcompact(isea4t_layer: QgsVectorLayer, ISEA4TID_field=None,feedback=Non
         fields.append(QgsField("avg_edge_len", QVariant.Double))
         fields.append(QgsField("cell_area", QVariant.Double))
 
-        crs = isea4t_layer.crs().toWkt()
-        mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea4t_compacted", "memory")
-        mem_provider = mem_layer.dataProvider()
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
+        writer, output = feature_output(fields, isea4t_layer.crs(), "isea4t_compacted", create_sink)
 
-        isea4t_ids = [
-            feature[ISEA4TID_field]
-            for feature in isea4t_layer.getFeatures()
-            if feature[ISEA4TID_field]
-        ]
+        isea4t_ids = read_column(isea4t_layer, ISEA4TID_field)
 
         if isea4t_ids:
             try:
@@ -327,47 +263,31 @@ def isea4tcompact(isea4t_layer: QgsVectorLayer, ISEA4TID_field=None,feedback=Non
                     feedback.setProgress(int((i / total_cells) * 100))
                     if feedback.isCanceled():
                         return None
+
                 try:
-                    isea4t_cell_compact = DggsCell(isea4t_id_compact)
-                    cell_to_shape = isea4t_dggs.convert_dggs_cell_outline_to_shape_string(isea4t_cell_compact,ShapeStringFormat.WKT)
-                    cell_to_shape_fixed = loads(fix_isea4t_wkt(cell_to_shape))
-                    if isea4t_id_compact.startswith('00') or isea4t_id_compact.startswith('09') or isea4t_id_compact.startswith('14')\
-                        or isea4t_id_compact.startswith('04') or isea4t_id_compact.startswith('19'):
-                        cell_to_shape_fixed = fix_isea4t_antimeridian_cells(cell_to_shape_fixed)                    
-                    cell_polygon = Polygon(list(cell_to_shape_fixed.exterior.coords))                
+                    cell = get_cell('isea4t', isea4t_id_compact)
                 except:
                     raise QgsProcessingException("Compact cells failed. Please check your ISEA4T ID field.")
-                
-                resolution = len(isea4t_id_compact) -2
-                num_edges = 3
-                
-                center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-                
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+                if not cell:
+                    continue
+                cell_polygon, cell_geom, cell_attributes = cell
+
                 ISEA4T_feature = QgsFeature(fields)
                 ISEA4T_feature.setGeometry(cell_geom)
-                
-                attributes = {
-                    "isea4t": isea4t_id_compact,
-                    "resolution": resolution,
-                    "center_lat": center_lat,
-                    "center_lon": center_lon,
-                    "avg_edge_len": avg_edge_len,
-                    "cell_area": cell_area,
-                    }
-                ISEA4T_feature.setAttributes([attributes[field.name()] for field in fields])
-                mem_provider.addFeatures([ISEA4T_feature])
+                ISEA4T_feature.setAttributes([isea4t_id_compact] + cell_attributes)
+                writer.addFeature(ISEA4T_feature)
 
             if feedback:
                 feedback.setProgress(100)
                 feedback.pushInfo("ISEA4T Compact completed.")
                     
-            return mem_layer
+            writer.flush()
+            return output
 
 ########################## 
 # ISEA3H
 # ########################
-def isea3hcompact(isea3h_layer: QgsVectorLayer, ISEA3HID_field=None,feedback=None) -> QgsVectorLayer:
+def isea3hcompact(isea3h_layer: QgsVectorLayer, ISEA3HID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if platform.system() == 'Windows':    
         if not ISEA3HID_field:
             ISEA3HID_field = 'isea3h'
@@ -382,17 +302,9 @@ def isea3hcompact(isea3h_layer: QgsVectorLayer, ISEA3HID_field=None,feedback=Non
         fields.append(QgsField("avg_edge_len", QVariant.Double))
         fields.append(QgsField("cell_area", QVariant.Double))
 
-        crs = isea3h_layer.crs().toWkt()
-        mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea3h_compacted", "memory")
-        mem_provider = mem_layer.dataProvider()
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
+        writer, output = feature_output(fields, isea3h_layer.crs(), "isea3h_compacted", create_sink)
 
-        isea3h_ids = [
-            feature[ISEA3HID_field]
-            for feature in isea3h_layer.getFeatures()
-            if feature[ISEA3HID_field]
-        ]
+        isea3h_ids = read_column(isea3h_layer, ISEA3HID_field)
         
         if isea3h_ids:
             try:
@@ -448,7 +360,7 @@ def isea3hcompact(isea3h_layer: QgsVectorLayer, ISEA3HID_field=None,feedback=Non
                     elif round(avg_edge_len,3) <= 0.001:
                         cell_resolution = 40
                 
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+                cell_geom = shapely_to_qgsgeometry(cell_polygon)
                 isea3h_feature = QgsFeature(fields)
                 isea3h_feature.setGeometry(cell_geom)
                 
@@ -461,19 +373,20 @@ def isea3hcompact(isea3h_layer: QgsVectorLayer, ISEA3HID_field=None,feedback=Non
                     "cell_area": cell_area,
                     }
                 isea3h_feature.setAttributes([attributes[field.name()] for field in fields])
-                mem_provider.addFeatures([isea3h_feature])
+                writer.addFeature(isea3h_feature)
 
             if feedback:
                 feedback.setProgress(100)
                 feedback.pushInfo("ISEA3H Compact completed.")
                     
-            return mem_layer
+            writer.flush()
+            return output
 
 
 ########################## 
 # QTM
 # ########################
-def qtmcompact(qtm_layer: QgsVectorLayer, QTMID_field=None,feedback=None) -> QgsVectorLayer:
+def qtmcompact(qtm_layer: QgsVectorLayer, QTMID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if not QTMID_field:
         QTMID_field = 'qtm'
         
@@ -485,21 +398,13 @@ def qtmcompact(qtm_layer: QgsVectorLayer, QTMID_field=None,feedback=None) -> Qgs
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = qtm_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "qtm_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    qtm_ids = [
-        feature[QTMID_field]
-        for feature in qtm_layer.getFeatures()
-        if feature[QTMID_field]
-    ]
+    writer, output = feature_output(fields, qtm_layer.crs(), "qtm_compacted", create_sink)
+
+    qtm_ids = read_column(qtm_layer, QTMID_field)
     
     if qtm_ids:
         try:
-            qtm_ids_compact = qtm_compact(qtm_ids)
+            qtm_ids_compact = key_compact('qtm', qtm_ids, qtm_compact)
         except:
             raise QgsProcessingException("Compact cells failed. Please check your QTM ID field.")
         
@@ -510,43 +415,32 @@ def qtmcompact(qtm_layer: QgsVectorLayer, QTMID_field=None,feedback=None) -> Qgs
                 feedback.setProgress(int((i / total_cells) * 100))
                 if feedback.isCanceled():
                     return None
+
             try:
-                facet = qtm.qtm_id_to_facet(qtm_id_compact)
-                cell_polygon = qtm.constructGeometry(facet)    
+                cell = get_cell('qtm', qtm_id_compact)
             except:
                 raise QgsProcessingException("Compact cells failed. Please check your QTM ID field.")
-                            
-           
-            resolution = len(qtm_id_compact)
-            num_edges = 3
-            center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
+
             qtm_feature = QgsFeature(fields)
             qtm_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "qtm": qtm_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                }
-            qtm_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([qtm_feature])
+            qtm_feature.setAttributes([qtm_id_compact] + cell_attributes)
+            writer.addFeature(qtm_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("QTM Compact completed.")
                 
-        return mem_layer
+        writer.flush()
+        return output
 
 
 ########################## 
 # OLC
 # ########################
-def olccompact(olc_layer: QgsVectorLayer, OLCID_field=None,feedback=None) -> QgsVectorLayer:
+def olccompact(olc_layer: QgsVectorLayer, OLCID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if not OLCID_field:
         OLCID_field = 'olc'
         
@@ -559,21 +453,13 @@ def olccompact(olc_layer: QgsVectorLayer, OLCID_field=None,feedback=None) -> Qgs
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = olc_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "olc_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    olc_ids = [
-        feature[OLCID_field]
-        for feature in olc_layer.getFeatures()
-        if feature[OLCID_field]
-    ]
+    writer, output = feature_output(fields, olc_layer.crs(), "olc_compacted", create_sink)
+
+    olc_ids = read_column(olc_layer, OLCID_field)
     
     if olc_ids:
         try:
-            olc_ids_compact = olc_compact(olc_ids)
+            olc_ids_compact = key_compact('olc', olc_ids, olc_compact)
         except:
                 raise QgsProcessingException("Compact cells failed. Please check your OLC ID field.")
         
@@ -584,53 +470,32 @@ def olccompact(olc_layer: QgsVectorLayer, OLCID_field=None,feedback=None) -> Qgs
                 feedback.setProgress(int((i / total_cells) * 100))
                 if feedback.isCanceled():
                     return None
+
             try:
-                coord = olc.decode(olc_id_compact)    
-                min_lat, min_lon = coord.latitudeLo, coord.longitudeLo
-                max_lat, max_lon = coord.latitudeHi, coord.longitudeHi        
-                cell_resolution = coord.codeLength 
-
-                # Define the polygon based on the bounding box
-                cell_polygon = Polygon([
-                    [min_lon, min_lat],  # Bottom-left corner
-                    [max_lon, min_lat],  # Bottom-right corner
-                    [max_lon, max_lat],  # Top-right corner
-                    [min_lon, max_lat],  # Top-left corner
-                    [min_lon, min_lat]   # Closing the polygon (same as the first point)
-                ])
+                cell = get_cell('olc', olc_id_compact)
             except:
                 raise QgsProcessingException("Compact cells failed. Please check your OLC ID field.")
-                            
-           
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
+
             olc_feature = QgsFeature(fields)
             olc_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "olc": olc_id_compact,
-                "resolution": cell_resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-                }
-            olc_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([olc_feature])
+            olc_feature.setAttributes([olc_id_compact] + cell_attributes)
+            writer.addFeature(olc_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("OLC Compact completed.")
                 
-        return mem_layer
+        writer.flush()
+        return output
 
 
 ########################## 
 # Geohash
 # ########################
-def geohashcompact(geohash_layer: QgsVectorLayer, GeohashID_field=None,feedback=None) -> QgsVectorLayer:
+def geohashcompact(geohash_layer: QgsVectorLayer, GeohashID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if not GeohashID_field:
         GeohashID_field = 'geohash'
         
@@ -643,21 +508,13 @@ def geohashcompact(geohash_layer: QgsVectorLayer, GeohashID_field=None,feedback=
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = geohash_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "geohash_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    geohash_ids = [
-        feature[GeohashID_field]
-        for feature in geohash_layer.getFeatures()
-        if feature[GeohashID_field]
-    ]
+    writer, output = feature_output(fields, geohash_layer.crs(), "geohash_compacted", create_sink)
+
+    geohash_ids = read_column(geohash_layer, GeohashID_field)
     
     if geohash_ids:
         try:
-            geohash_ids_compact = geohash_compact(geohash_ids)
+            geohash_ids_compact = key_compact('geohash', geohash_ids, geohash_compact)
         except:
                 raise QgsProcessingException("Compact cells failed. Please check your geohash ID field.")
         
@@ -668,41 +525,32 @@ def geohashcompact(geohash_layer: QgsVectorLayer, GeohashID_field=None,feedback=
                 feedback.setProgress(int((i / total_cells) * 100))
                 if feedback.isCanceled():
                     return None
+
             try:
-                cell_polygon = geohash_to_polygon(geohash_id_compact)                
+                cell = get_cell('geohash', geohash_id_compact)
             except:
                 raise QgsProcessingException("Compact cells failed. Please check your geohash ID field.")
-                            
-            resolution =  len(geohash_id_compact)
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
+
             geohash_feature = QgsFeature(fields)
             geohash_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "geohash": geohash_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-                }
-            geohash_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([geohash_feature])
+            geohash_feature.setAttributes([geohash_id_compact] + cell_attributes)
+            writer.addFeature(geohash_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("geohash Compact completed.")
                 
-        return mem_layer
+        writer.flush()
+        return output
 
 
 ########################## 
 # Tilecode
 # ########################
-def tilecodecompact(tilecode_layer: QgsVectorLayer, TilecodeID_field=None,feedback=None) -> QgsVectorLayer:
+def tilecodecompact(tilecode_layer: QgsVectorLayer, TilecodeID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if not TilecodeID_field:
         TilecodeID_field = 'tilecode'
         
@@ -715,21 +563,13 @@ def tilecodecompact(tilecode_layer: QgsVectorLayer, TilecodeID_field=None,feedba
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = tilecode_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "tilecode_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    tilecode_ids = [
-        feature[TilecodeID_field]
-        for feature in tilecode_layer.getFeatures()
-        if feature[TilecodeID_field]
-    ]
+    writer, output = feature_output(fields, tilecode_layer.crs(), "tilecode_compacted", create_sink)
+
+    tilecode_ids = read_column(tilecode_layer, TilecodeID_field)
     
     if tilecode_ids:
         try:
-            tilecode_ids_compact = tilecode_compact(tilecode_ids)
+            tilecode_ids_compact = key_compact('tilecode', tilecode_ids, tilecode_compact)
         except:
             raise QgsProcessingException("Compact cells failed. Please check your tilecode ID field.")
         
@@ -740,57 +580,32 @@ def tilecodecompact(tilecode_layer: QgsVectorLayer, TilecodeID_field=None,feedba
                 feedback.setProgress(int((i / total_cells) * 100))
                 if feedback.isCanceled():
                     return None
+
             try:
-                match = re.match(r'z(\d+)x(\d+)y(\d+)', tilecode_id_compact)
-                # Convert matched groups to integers
-                z = int(match.group(1))
-                x = int(match.group(2))
-                y = int(match.group(3))
-
-                bounds = mercantile.bounds(x, y, z)    
-                min_lat, min_lon = bounds.south, bounds.west
-                max_lat, max_lon = bounds.north, bounds.east
-                cell_polygon = Polygon([
-                    [min_lon, min_lat],  # Bottom-left corner
-                    [max_lon, min_lat],  # Bottom-right corner
-                    [max_lon, max_lat],  # Top-right corner
-                    [min_lon, max_lat],  # Top-left corner
-                    [min_lon, min_lat]   # Closing the polygon (same as the first point)
-                ])
-                
-                resolution = z               
+                cell = get_cell('tilecode', tilecode_id_compact)
             except:
                 raise QgsProcessingException("Compact cells failed. Please check your Tilecode ID field.")
-                            
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
+
             tilecode_feature = QgsFeature(fields)
             tilecode_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "tilecode": tilecode_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-                }
-            tilecode_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([tilecode_feature])
+            tilecode_feature.setAttributes([tilecode_id_compact] + cell_attributes)
+            writer.addFeature(tilecode_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("Tilecode Compact completed.")
                 
-        return mem_layer
+        writer.flush()
+        return output
 
 
 ########################## 
 # Quadkey
 # ########################
-def quadkeycompact(quadkey_layer: QgsVectorLayer, QuadkeyID_field=None,feedback=None) -> QgsVectorLayer:
+def quadkeycompact(quadkey_layer: QgsVectorLayer, QuadkeyID_field=None,feedback=None, create_sink=None) -> QgsVectorLayer:
     if not QuadkeyID_field:
         QuadkeyID_field = 'quadkey'
         
@@ -803,21 +618,13 @@ def quadkeycompact(quadkey_layer: QgsVectorLayer, QuadkeyID_field=None,feedback=
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = quadkey_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "quadkey_compacted", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    quadkey_ids = [
-        feature[QuadkeyID_field]
-        for feature in quadkey_layer.getFeatures()
-        if feature[QuadkeyID_field]
-    ]
+    writer, output = feature_output(fields, quadkey_layer.crs(), "quadkey_compacted", create_sink)
+
+    quadkey_ids = read_column(quadkey_layer, QuadkeyID_field)
     
     if quadkey_ids:
         try:
-            quadkey_ids_compact = quadkey_compact(quadkey_ids)
+            quadkey_ids_compact = key_compact('quadkey', quadkey_ids, quadkey_compact)
         except:
             raise QgsProcessingException("Compact cells failed. Please check your Quadkey ID field.")
         
@@ -828,47 +635,192 @@ def quadkeycompact(quadkey_layer: QgsVectorLayer, QuadkeyID_field=None,feedback=
                 feedback.setProgress(int((i / total_cells) * 100))
                 if feedback.isCanceled():
                     return None
+
             try:
-                quadkey_id_compact_tile = mercantile.quadkey_to_tile(quadkey_id_compact)
-                z = quadkey_id_compact_tile.z
-                x = quadkey_id_compact_tile.x
-                y = quadkey_id_compact_tile.y
-
-                bounds = mercantile.bounds(x, y, z)    
-                min_lat, min_lon = bounds.south, bounds.west
-                max_lat, max_lon = bounds.north, bounds.east
-                cell_polygon = Polygon([
-                    [min_lon, min_lat],  # Bottom-left corner
-                    [max_lon, min_lat],  # Bottom-right corner
-                    [max_lon, max_lat],  # Top-right corner
-                    [min_lon, max_lat],  # Top-left corner
-                    [min_lon, min_lat]   # Closing the polygon (same as the first point)
-                ])                    
-                resolution = z
-                            
+                cell = get_cell('quadkey', quadkey_id_compact)
             except:
                 raise QgsProcessingException("Compact cells failed. Please check your Quadkey ID field.")
-                            
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
+
             quadkey_feature = QgsFeature(fields)
             quadkey_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "quadkey": quadkey_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-                }
-            quadkey_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([quadkey_feature])
+            quadkey_feature.setAttributes([quadkey_id_compact] + cell_attributes)
+            writer.addFeature(quadkey_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("Quadkey Compact completed.")
                 
-        return mem_layer
+        writer.flush()
+        return output
+
+
+##########################
+# Attribute compaction
+# ########################
+COMPACT_AGGREGATES = ['sum', 'mean', 'min', 'max']
+CELL_METRIC_FIELDS = ('resolution', 'center_lat', 'center_lon', 'avg_edge_len', 'cell_width', 'cell_height', 'cell_area')
+
+def aggregate_groups(values, inverse, group_count, aggregate):
+    """Per-group sum, mean, min or max of the columns of values, ignoring NaN (all-NaN groups stay NaN)."""
+    missing = np.isnan(values)
+    result = np.empty((group_count, values.shape[1]))
+    for column in range(values.shape[1]):
+        present = np.bincount(inverse, weights=~missing[:, column], minlength=group_count)
+        if aggregate in ('sum', 'mean'):
+            total = np.bincount(inverse, weights=np.where(missing[:, column], 0., values[:, column]), minlength=group_count)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[:, column] = total / present if aggregate == 'mean' else total
+        else:
+            fill = np.inf if aggregate == 'min' else -np.inf
+            reduce = np.minimum if aggregate == 'min' else np.maximum
+            result[:, column] = fill
+            reduce.at(result[:, column], inverse, np.where(missing[:, column], fill, values[:, column]))
+        result[present == 0, column] = np.nan
+    return result
+
+def compact_attributes(dggs_type, cell_ids, categories=None, values=None, aggregate='mean', feedback=None):
+    """
+    Compact cells in ID space: complete sets of children are replaced by their parent,
+    level by level from the finest resolution, while all children share the same
+    category code (when categories is given). Numeric values (n, k) of merged children
+    are aggregated into the parent. Returns (cell_ids, categories, values).
+    """
+    resolve = DGGS_RESOLUTIONS[dggs_type]
+    resolutions = np.array([resolve(cell_id) for cell_id in cell_ids], dtype=np.int64)
+    cell_ids = np.array(cell_ids, dtype=object)
+    categories = np.zeros(len(cell_ids), dtype=np.int64) if categories is None else np.asarray(categories, dtype=np.int64)
+    values = np.empty((len(cell_ids), 0)) if values is None else np.asarray(values, dtype=float)
+    levels = {
+        int(resolution): (cell_ids[resolutions == resolution], categories[resolutions == resolution], values[resolutions == resolution])
+        for resolution in np.unique(resolutions)
+    }
+
+    compact_ids, compact_categories, compact_values = [], [], []
+    while levels:
+        child_resolution = max(levels)
+        level_ids, level_categories, level_values = levels.pop(child_resolution)
+        parent_resolutions = pyramid_resolutions(dggs_type, child_resolution, 0)
+        if not parent_resolutions:
+            compact_ids.extend(level_ids.tolist())
+            compact_categories.append(level_categories)
+            compact_values.append(level_values)
+            continue
+        parent_resolution = parent_resolutions[0]
+
+        # Hash group-by of the children on their parent ID
+        parent_index = {}
+        inverse = np.array([
+            parent_index.setdefault(DGGS_PARENTS[dggs_type](cell_id, parent_resolution), len(parent_index))
+            for cell_id in level_ids.tolist()
+        ], dtype=np.int64)
+        parents = list(parent_index)
+        counts = np.bincount(inverse, minlength=len(parents))
+        mergeable = counts == np.array([
+            DGGS_CHILD_COUNTS[dggs_type](parent_id, child_resolution) for parent_id in parents
+        ])
+        category_min = np.full(len(parents), np.iinfo(np.int64).max)
+        category_max = np.full(len(parents), np.iinfo(np.int64).min)
+        np.minimum.at(category_min, inverse, level_categories)
+        np.maximum.at(category_max, inverse, level_categories)
+        mergeable &= category_min == category_max
+
+        kept = ~mergeable[inverse]
+        compact_ids.extend(level_ids[kept].tolist())
+        compact_categories.append(level_categories[kept])
+        compact_values.append(level_values[kept])
+
+        merged_ids = np.array(parents, dtype=object)[mergeable]
+        merged_categories = category_min[mergeable]
+        merged_values = aggregate_groups(level_values, inverse, len(parents), aggregate)[mergeable]
+        if parent_resolution in levels:
+            parent_ids, parent_categories, parent_values = levels[parent_resolution]
+            merged_ids = np.concatenate([parent_ids, merged_ids])
+            merged_categories = np.concatenate([parent_categories, merged_categories])
+            merged_values = np.concatenate([parent_values, merged_values])
+        if len(merged_ids):
+            levels[parent_resolution] = (merged_ids, merged_categories, merged_values)
+        if feedback:
+            feedback.pushInfo(f"Resolution {parent_resolution}: {int(mergeable.sum())} parent cells merged.")
+
+    return compact_ids, np.concatenate(compact_categories), np.concatenate(compact_values)
+
+def attributecompact(dggs_layer: QgsVectorLayer, dggs_type, DGGSID_field=None, merge_field=None, aggregate_fields=None,
+                     aggregate='mean', feedback=None, create_sink=None) -> QgsVectorLayer:
+    """
+    Compact a DGGS layer keeping its values: children merge only where merge_field is
+    equal, and the numeric aggregate_fields (default: all numeric fields but the cell
+    metrics) are aggregated with sum, mean, min or max into the merged parents.
+    """
+    if not DGGSID_field:
+        DGGSID_field = dggs_type
+    if aggregate_fields is None:
+        aggregate_fields = [
+            field.name() for field in dggs_layer.fields()
+            if field.isNumeric() and field.name() not in (DGGSID_field, merge_field) + CELL_METRIC_FIELDS
+        ]
+
+    fields = cell_fields(dggs_type)
+    if merge_field:
+        fields.append(dggs_layer.fields().field(merge_field))
+    for field_name in aggregate_fields:
+        fields.append(QgsField(field_name, QVariant.Double))
+
+    writer, output = feature_output(fields, dggs_layer.crs(), f"{dggs_type}_compacted", create_sink)
+
+    rows = read_columns(dggs_layer, [DGGSID_field] + ([merge_field] if merge_field else []) + list(aggregate_fields))
+    if not rows:
+        writer.flush()
+        return output
+
+    unique_rows = {}
+    for row in rows:
+        unique_rows.setdefault(row[0], row)
+    rows = list(unique_rows.values())
+
+    cell_ids = [row[0] for row in rows]
+    categories, category_values = None, []
+    if merge_field:
+        category_codes = {}
+        categories = [category_codes.setdefault(attribute_value(row[1]), len(category_codes)) for row in rows]
+        category_values = list(category_codes)
+    offset = 2 if merge_field else 1
+    values = np.array([
+        [np.nan if attribute_value(value) is None else float(value) for value in row[offset:]] for row in rows
+    ], dtype=float).reshape(len(rows), len(aggregate_fields))
+
+    try:
+        cell_ids, categories, values = compact_attributes(dggs_type, cell_ids, categories, values, aggregate, feedback)
+    except:
+        raise QgsProcessingException(f"Compact cells failed. Please check your {dggs_type.upper()} ID field.")
+
+    total_cells = len(cell_ids)
+    for i, cell_id in enumerate(cell_ids):
+        if feedback:
+            feedback.setProgress(int((i / total_cells) * 100))
+            if feedback.isCanceled():
+                return None
+
+        # rHEALPix parents in the same layout as rhealpixcompact
+        cell = get_cell(dggs_type, cell_id, rhealpix_grid_dggs if dggs_type == 'rhealpix' else None)
+        if not cell:
+            continue
+        cell_polygon, cell_geom, cell_attributes = cell
+
+        feature = QgsFeature(fields)
+        feature.setGeometry(cell_geom)
+        attributes = [cell_id] + cell_attributes
+        if merge_field:
+            attributes.append(category_values[categories[i]])
+        attributes.extend(None if np.isnan(value) else float(value) for value in values[i])
+        feature.setAttributes(attributes)
+        writer.addFeature(feature)
+
+    if feedback:
+        feedback.setProgress(100)
+        feedback.pushInfo(f"{dggs_type.upper()} attribute compact completed.")
+
+    writer.flush()
+    return output
@@ -23,6 +23,12 @@ if (platform.system() == 'Linux'):
 from vgrid.utils.easedggs.dggs.grid_addressing import grid_ids_to_geos
 
 from shapely.wkt import loads
+from ..geometry import shapely_to_qgsgeometry
+from ..featurewriter import feature_output
+from ..featurereader import read_column
+from .dggscell import get_cell
+from .dggsbatch import parse_tilecode
+from .keycompact import key_expand, key_span, olc_step
 from shapely.geometry import Polygon
 
 from vgrid.generator.h3grid import fix_h3_antimeridian_cells
@@ -46,10 +52,57 @@ from qgis.core import (
 from PyQt5.QtCore import QVariant
 
 
+##########################
+# Expansion size
+# ########################
+def h3_expand_count(h3_id, cell_resolution, resolution):
+    return h3.cell_to_children_size(h3_id, resolution)
+
+def olc_expand_count(olc_id, cell_resolution, resolution):
+    return key_span(olc_step, cell_resolution, resolution) or 1
+
+def aperture_expand_count(aperture):
+    return lambda cell_id, cell_resolution, resolution: aperture ** max(resolution - cell_resolution, 0)
+
+# Children of one cell at the target resolution; ISEA3H (aperture 3 hexagons) is an estimate
+DGGS_EXPAND_COUNTS = {
+    'h3': h3_expand_count,
+    's2': aperture_expand_count(4),
+    'rhealpix': aperture_expand_count(9),
+    'isea4t': aperture_expand_count(4),
+    'isea3h': aperture_expand_count(3),
+    'qtm': aperture_expand_count(4),
+    'olc': olc_expand_count,
+    'geohash': aperture_expand_count(32),
+    'tilecode': aperture_expand_count(4),
+    'quadkey': aperture_expand_count(4)
+}
+
+def expanded_cell_count(dggs_type, cell_ids, cell_resolutions, resolution):
+    count = DGGS_EXPAND_COUNTS[dggs_type]
+    return sum(count(cell_id, cell_resolution, resolution) for cell_id, cell_resolution in zip(cell_ids, cell_resolutions))
+
+def check_expand_size(total_cells, max_cells=0, feedback=None):
+    if max_cells and total_cells > max_cells:
+        raise QgsProcessingException(f"Expansion would create {total_cells:,} cells, more than the maximum of {max_cells:,}. "
+                                     "Choose a coarser resolution or raise the maximum output cells.")
+    if feedback:
+        feedback.pushInfo(f"Expanding to {total_cells:,} cells.")
+
+def stream_children(cell_ids, children):
+    # Children of one parent at a time, so that only those are held in memory
+    for cell_id in cell_ids:
+        yield from children(cell_id)
+
+def stream_chunks(chunks):
+    for chunk in chunks:
+        yield from chunk
+
+
 ########################## 
 # H3
 #########################
-def h3expand(h3_layer: QgsVectorLayer, resolution: int, H3ID_field=None, feedback=None) -> QgsVectorLayer:
+def h3expand(h3_layer: QgsVectorLayer, resolution: int, H3ID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if not H3ID_field:
         H3ID_field = 'h3'
 
@@ -61,31 +114,25 @@ def h3expand(h3_layer: QgsVectorLayer, resolution: int, H3ID_field=None, feedbac
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = h3_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "h3_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    h3_ids = [
-        feature[H3ID_field]
-        for feature in h3_layer.getFeatures()
-        if feature[H3ID_field]
-    ]
+    writer, output = feature_output(fields, h3_layer.crs(), "h3_expanded", create_sink)
+
+    h3_ids = read_column(h3_layer, H3ID_field)
     h3_ids = list(set(h3_ids))
     
     if h3_ids:
         try:
-            max_res = max(h3.get_resolution(h3_id) for h3_id in h3_ids)
+            h3_resolutions = [h3.get_resolution(h3_id) for h3_id in h3_ids]
+            max_res = max(h3_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                     return None
-            h3_ids_expand = h3.uncompact_cells(h3_ids, resolution)
+            total_cells = expanded_cell_count('h3', h3_ids, h3_resolutions, resolution)
         except:
             raise QgsProcessingException("Expand cells failed. Please check your H3 cell Ids.")
-            
-        total_cells = len(h3_ids_expand)
+
+        check_expand_size(total_cells, max_cells, feedback)
+        h3_ids_expand = stream_children(h3_ids, lambda h3_id: h3.cell_to_children(h3_id, resolution))
 
         for i, h3_id_expand in enumerate(h3_ids_expand):
             if feedback:
@@ -93,43 +140,30 @@ def h3expand(h3_layer: QgsVectorLayer, resolution: int, H3ID_field=None, feedbac
                 if feedback.isCanceled():
                     return None
 
-            cell_boundary = h3.cell_to_boundary(h3_id_expand)
-            filtered_boundary = fix_h3_antimeridian_cells(cell_boundary)
-            reversed_boundary = [(lon, lat) for lat, lon in filtered_boundary]
-            cell_polygon = Polygon(reversed_boundary)
-
+            cell = get_cell('h3', h3_id_expand)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
             if not cell_polygon.is_valid:
                 continue
-            
-            num_edges = 5 if h3.is_pentagon(h3_id_expand) else 6
-            center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
             h3_feature = QgsFeature(fields)
             h3_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "h3": h3_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-            }
-            h3_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([h3_feature])
+            h3_feature.setAttributes([h3_id_expand] + cell_attributes)
+            writer.addFeature(h3_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("H3 DGGS expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
 
 
 ########################## 
 # S2
 # ########################
-def s2expand(s2_layer: QgsVectorLayer, resolution: int, S2Token_field=None, feedback=None) -> QgsVectorLayer:
+def s2expand(s2_layer: QgsVectorLayer, resolution: int, S2Token_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if not S2Token_field:
         S2Token_field = 's2'
 
@@ -141,34 +175,27 @@ def s2expand(s2_layer: QgsVectorLayer, resolution: int, S2Token_field=None, feed
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = s2_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "s2_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    s2_tokens = [
-        feature[S2Token_field]
-        for feature in s2_layer.getFeatures()
-        if feature[S2Token_field]
-    ]
+    writer, output = feature_output(fields, s2_layer.crs(), "s2_expanded", create_sink)
+
+    s2_tokens = read_column(s2_layer, S2Token_field)
              
     try:
         s2_ids = [s2.CellId.from_token(token) for token in s2_tokens]  
         s2_ids = list(set(s2_ids)) 
+        s2_resolutions = [s2_id.level() for s2_id in s2_ids]
         if s2_ids:   
-            max_res = max(s2_id.level() for s2_id in s2_ids)
+            max_res = max(s2_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                     return None
-            s2_ids_expand = s2_expand(s2_ids, resolution)
-            s2_tokens_expand = [s2_id_expand.to_token() for s2_id_expand in s2_ids_expand]
+        total_cells = expanded_cell_count('s2', s2_ids, s2_resolutions, resolution)
     
     except:
         raise QgsProcessingException("Expand cells failed. Please check your S2 cell Ids.")
-        
-    total_cells = len(s2_tokens_expand)
+
+    check_expand_size(total_cells, max_cells, feedback)
+    s2_tokens_expand = (s2_id_expand.to_token() for s2_id_expand in stream_children(s2_ids, lambda s2_id: s2_expand([s2_id], resolution)))
 
     for i, s2_token_expand in enumerate(s2_tokens_expand):
         if feedback:
@@ -176,50 +203,24 @@ def s2expand(s2_layer: QgsVectorLayer, resolution: int, S2Token_field=None, feed
             if feedback.isCanceled():
                 return None
 
-        s2_id_expand = s2.CellId.from_token(s2_token_expand)
-        s2_cell_expand = s2.Cell(s2_id_expand)    
-        # Get the vertices of the cell (4 vertices for a rectangular cell)
-        vertices = [s2_cell_expand.get_vertex(i) for i in range(4)]
-        # Prepare vertices in (longitude, latitude) format for Shapely
-        shapely_vertices = []
-        for vertex in vertices:
-            lat_lng = s2.LatLng.from_point(vertex)  # Convert Point to LatLng
-            longitude = lat_lng.lng().degrees  # Access longitude in degrees
-            latitude = lat_lng.lat().degrees   # Access latitude in degrees
-            shapely_vertices.append((longitude, latitude))
-
-        # Close the polygon by adding the first vertex again
-        shapely_vertices.append(shapely_vertices[0])  # Closing the polygon
-        # Create a Shapely Polygon
-        cell_polygon = fix_polygon(Polygon(shapely_vertices)) # Fix antimeridian
-                    
+        cell = get_cell('s2', s2_token_expand)
+        if not cell:
+            continue
+        cell_polygon, cell_geom, cell_attributes = cell
         if not cell_polygon.is_valid:
             continue
-        
-        resolution = s2_id_expand.level()
-        num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        
-        cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
         s2_feature = QgsFeature(fields)
         s2_feature.setGeometry(cell_geom)
-        
-        attributes = {
-            "s2": s2_token_expand,
-            "resolution": resolution,
-            "center_lat": center_lat,
-            "center_lon": center_lon,
-            "avg_edge_len": avg_edge_len,
-            "cell_area": cell_area,
-        }
-        s2_feature.setAttributes([attributes[field.name()] for field in fields])
-        mem_provider.addFeatures([s2_feature])
+        s2_feature.setAttributes([s2_token_expand] + cell_attributes)
+        writer.addFeature(s2_feature)
 
     if feedback:
         feedback.setProgress(100)
         feedback.pushInfo("s2 DGGS expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
 
 
 ########################## 
@@ -233,7 +234,7 @@ def get_rhealpix_resolution(rhealpix_dggs, rhealpix_id):
     except Exception as e:
         raise ValueError(f"Invalid cell ID '{rhealpix_id}': {e}")
 
-def rhealpixexpand(rhealpix_layer: QgsVectorLayer, resolution: int, rHealPixID_field=None, feedback=None) -> QgsVectorLayer:
+def rhealpixexpand(rhealpix_layer: QgsVectorLayer, resolution: int, rHealPixID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     rhealpix_dggs = RHEALPixDGGS()
     
     if not rHealPixID_field:
@@ -247,23 +248,16 @@ def rhealpixexpand(rhealpix_layer: QgsVectorLayer, resolution: int, rHealPixID_f
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = rhealpix_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "rhealpix_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    rhealpix_ids = [
-        feature[rHealPixID_field]
-        for feature in rhealpix_layer.getFeatures()
-        if feature[rHealPixID_field]
-    ]
+    writer, output = feature_output(fields, rhealpix_layer.crs(), "rhealpix_expanded", create_sink)
+
+    rhealpix_ids = read_column(rhealpix_layer, rHealPixID_field)
     
     rhealpix_ids = list(set(rhealpix_ids)) 
     
     if rhealpix_ids:
         try:
-            max_res = max(get_rhealpix_resolution(rhealpix_dggs,rhealpix_id) for rhealpix_id in rhealpix_ids)
+            rhealpix_resolutions = [get_rhealpix_resolution(rhealpix_dggs,rhealpix_id) for rhealpix_id in rhealpix_ids]
+            max_res = max(rhealpix_resolutions)
         except Exception as e:
             raise QgsProcessingException(f"Error determining cell resolution from rHEALPix cell Ids: {e}")
 
@@ -272,12 +266,9 @@ def rhealpixexpand(rhealpix_layer: QgsVectorLayer, resolution: int, rHealPixID_f
                 feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
             return None
 
-        try:
-            rhealpix_cells_expand = rhealpix_expand(rhealpix_dggs, rhealpix_ids, resolution)
-        except:
-            raise QgsProcessingException("Expand cells failed. Please check your rHEALPix cell Ids.")
-
-        total_cells = len(rhealpix_cells_expand)
+        total_cells = expanded_cell_count('rhealpix', rhealpix_ids, rhealpix_resolutions, resolution)
+        check_expand_size(total_cells, max_cells, feedback)
+        rhealpix_cells_expand = stream_children(rhealpix_ids, lambda rhealpix_id: rhealpix_expand(rhealpix_dggs, [rhealpix_id], resolution))
 
         for i, rhealpix_cell_expand in enumerate(rhealpix_cells_expand):
             if feedback:
@@ -294,7 +285,7 @@ def rhealpixexpand(rhealpix_layer: QgsVectorLayer, resolution: int, rHealPixID_f
             num_edges = 3 if rhealpix_cell_expand.ellipsoidal_shape() == 'dart' else 4
             center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
             
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geom = shapely_to_qgsgeometry(cell_polygon)
             rhealpix_feature = QgsFeature(fields)
             rhealpix_feature.setGeometry(cell_geom)
             
@@ -307,19 +298,20 @@ def rhealpixexpand(rhealpix_layer: QgsVectorLayer, resolution: int, rHealPixID_f
                 "cell_area": cell_area,
             }
             rhealpix_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([rhealpix_feature])
+            writer.addFeature(rhealpix_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("rHEALPix DGGS expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
 
 
 ########################## 
 # ISEA4T
 #########################
-def isea4texpand(isea4t_layer: QgsVectorLayer, resolution: int, ISEA4TID_field=None, feedback=None) -> QgsVectorLayer:
+def isea4texpand(isea4t_layer: QgsVectorLayer, resolution: int, ISEA4TID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if (platform.system() == 'Windows'):  
         isea4t_dggs = Eaggr(Model.ISEA4T)
         
@@ -334,32 +326,22 @@ def isea4texpand(isea4t_layer: QgsVectorLayer, resolution: int, ISEA4TID_field=N
         fields.append(QgsField("avg_edge_len", QVariant.Double))
         fields.append(QgsField("cell_area", QVariant.Double))
 
-        crs = isea4t_layer.crs().toWkt()
-        mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea4t_expanded", "memory")
-        mem_provider = mem_layer.dataProvider()
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
-
-        isea4t_ids = [
-            feature[ISEA4TID_field]
-            for feature in isea4t_layer.getFeatures()
-            if feature[ISEA4TID_field]
-        ]
+        writer, output = feature_output(fields, isea4t_layer.crs(), "isea4t_expanded", create_sink)
+
+        isea4t_ids = read_column(isea4t_layer, ISEA4TID_field)
         isea4t_ids = list(set(isea4t_ids))
         
         if isea4t_ids:
-            max_res = max(len(isea4t_id)-2 for isea4t_id in isea4t_ids)
+            isea4t_resolutions = [len(isea4t_id)-2 for isea4t_id in isea4t_ids]
+            max_res = max(isea4t_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                 return None
 
-            try:
-                isea4t_cells_expand = isea4t_expand(isea4t_dggs, isea4t_ids, resolution)
-            except:
-                raise QgsProcessingException("Expand cells failed. Please check your ISEA4T cell Ids.")
-
-            total_cells = len(isea4t_cells_expand)
+            total_cells = expanded_cell_count('isea4t', isea4t_ids, isea4t_resolutions, resolution)
+            check_expand_size(total_cells, max_cells, feedback)
+            isea4t_cells_expand = stream_children(isea4t_ids, lambda isea4t_id: isea4t_expand(isea4t_dggs, [isea4t_id], resolution))
 
             for i, isea4t_cell_expand in enumerate(isea4t_cells_expand):
                 if feedback:
@@ -367,41 +349,25 @@ def isea4texpand(isea4t_layer: QgsVectorLayer, resolution: int, ISEA4TID_field=N
                     if feedback.isCanceled():
                         return None
 
-                cell_to_shape = isea4t_dggs.convert_dggs_cell_outline_to_shape_string(isea4t_cell_expand,ShapeStringFormat.WKT)
-                cell_to_shape_fixed = loads(fix_isea4t_wkt(cell_to_shape))
-                isea4t_id_expand = isea4t_cell_expand.get_cell_id()
-                if isea4t_id_expand.startswith('00') or isea4t_id_expand.startswith('09') or isea4t_id_expand.startswith('14')\
-                    or isea4t_id_expand.startswith('04') or isea4t_id_expand.startswith('19'):
-                    cell_to_shape_fixed = fix_isea4t_antimeridian_cells(cell_to_shape_fixed)
-                    
-                cell_polygon = Polygon(list(cell_to_shape_fixed.exterior.coords))
-                
+                isea4t_id = isea4t_cell_expand.get_cell_id()
+                cell = get_cell('isea4t', isea4t_id)
+                if not cell:
+                    continue
+                cell_polygon, cell_geom, cell_attributes = cell
                 if not cell_polygon.is_valid:
                     continue
-                
-                num_edges = 3
-                center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-                
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
                 isea4t_feature = QgsFeature(fields)
                 isea4t_feature.setGeometry(cell_geom)
-                
-                attributes = {
-                    "isea4t": isea4t_id_expand,
-                    "resolution": resolution,
-                    "center_lat": center_lat,
-                    "center_lon": center_lon,
-                    "avg_edge_len": avg_edge_len,
-                    "cell_area": cell_area,
-                }
-                isea4t_feature.setAttributes([attributes[field.name()] for field in fields])
-                mem_provider.addFeatures([isea4t_feature])
+                isea4t_feature.setAttributes([isea4t_id] + cell_attributes)
+                writer.addFeature(isea4t_feature)
 
             if feedback:
                 feedback.setProgress(100)
                 feedback.pushInfo("ISEA4T DGGS expansion completed.")
                     
-        return mem_layer
+        writer.flush()
+        return output
 
 
 ########################## 
@@ -446,7 +412,7 @@ def get_isea3h_resolution(isea3h_dggs, isea3h_id):
         raise ValueError(f"Invalid cell ID '{isea3h_id}': {e}")
 
 
-def isea3hexpand(isea3h_layer: QgsVectorLayer, resolution: int, ISEA3HID_field=None, feedback=None) -> QgsVectorLayer:
+def isea3hexpand(isea3h_layer: QgsVectorLayer, resolution: int, ISEA3HID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if (platform.system() == 'Windows'):  
         isea3h_dggs = Eaggr(Model.ISEA3H)
         
@@ -461,22 +427,15 @@ def isea3hexpand(isea3h_layer: QgsVectorLayer, resolution: int, ISEA3HID_field=N
         fields.append(QgsField("avg_edge_len", QVariant.Double))
         fields.append(QgsField("cell_area", QVariant.Double))
 
-        crs = isea3h_layer.crs().toWkt()
-        mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea3h_expanded", "memory")
-        mem_provider = mem_layer.dataProvider()
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
-
-        isea3h_ids = [
-            feature[ISEA3HID_field]
-            for feature in isea3h_layer.getFeatures()
-            if feature[ISEA3HID_field]
-        ]
+        writer, output = feature_output(fields, isea3h_layer.crs(), "isea3h_expanded", create_sink)
+
+        isea3h_ids = read_column(isea3h_layer, ISEA3HID_field)
         isea3h_ids = list(set(isea3h_ids))
         
         if isea3h_ids:
             try:
-                max_res = max(get_isea3h_resolution(isea3h_dggs,isea3h_id) for isea3h_id in isea3h_ids)
+                isea3h_resolutions = [get_isea3h_resolution(isea3h_dggs,isea3h_id) for isea3h_id in isea3h_ids]
+                max_res = max(isea3h_resolutions)
             except Exception as e:
                 raise QgsProcessingException(f"Error determining cell resolution from rHEALPix cell Ids: {e}")
 
@@ -485,12 +444,9 @@ def isea3hexpand(isea3h_layer: QgsVectorLayer, resolution: int, ISEA3HID_field=N
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                 return None
             
-            try:
-                isea3h_cells_expand = isea3h_expand(isea3h_dggs, isea3h_ids, resolution)
-            except:
-                raise QgsProcessingException("Expand cells failed. Please check your ISEA3H cell Ids.")
-
-            total_cells = len(isea3h_cells_expand)
+            total_cells = expanded_cell_count('isea3h', isea3h_ids, isea3h_resolutions, resolution)
+            check_expand_size(total_cells, max_cells, feedback)
+            isea3h_cells_expand = stream_children(isea3h_ids, lambda isea3h_id: isea3h_expand(isea3h_dggs, [isea3h_id], resolution))
 
             for i, isea3h_cell_expand in enumerate(isea3h_cells_expand):
                 if feedback:
@@ -537,7 +493,7 @@ def isea3hexpand(isea3h_layer: QgsVectorLayer, resolution: int, ISEA3HID_field=N
                     elif round(avg_edge_len,3) <= 0.001:
                         cell_resolution = 40
             
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+                cell_geom = shapely_to_qgsgeometry(cell_polygon)
                 isea3h_feature = QgsFeature(fields)
                 isea3h_feature.setGeometry(cell_geom)
                 
@@ -550,19 +506,20 @@ def isea3hexpand(isea3h_layer: QgsVectorLayer, resolution: int, ISEA3HID_field=N
                     "cell_area": cell_area,
                 }
                 isea3h_feature.setAttributes([attributes[field.name()] for field in fields])
-                mem_provider.addFeatures([isea3h_feature])
+                writer.addFeature(isea3h_feature)
 
             if feedback:
                 feedback.setProgress(100)
                 feedback.pushInfo("isea3h DGGS expansion completed.")
                     
-        return mem_layer
+        writer.flush()
+        return output
 
 
 ########################## 
 # QTM
 #########################
-def qtmexpand(qtm_layer: QgsVectorLayer, resolution: int,QTMID_field=None, feedback=None) -> QgsVectorLayer:
+def qtmexpand(qtm_layer: QgsVectorLayer, resolution: int,QTMID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if not QTMID_field:
         QTMID_field = 'qtm'
 
@@ -574,31 +531,25 @@ def qtmexpand(qtm_layer: QgsVectorLayer, resolution: int,QTMID_field=None, feedb
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = qtm_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "qtm_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    qtm_ids = [
-        feature[QTMID_field]
-        for feature in qtm_layer.getFeatures()
-        if feature[QTMID_field]
-    ]
+    writer, output = feature_output(fields, qtm_layer.crs(), "qtm_expanded", create_sink)
+
+    qtm_ids = read_column(qtm_layer, QTMID_field)
     qtm_ids = list(set(qtm_ids))
     
     if qtm_ids:
         try:
-            max_res = max(len(qtm_id) for qtm_id in qtm_ids)
+            qtm_resolutions = [len(qtm_id) for qtm_id in qtm_ids]
+            max_res = max(qtm_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                     return None
-            qtm_ids_expand = qtm_expand(qtm_ids, resolution)
+            total_cells = expanded_cell_count('qtm', qtm_ids, qtm_resolutions, resolution)
         except:
             raise QgsProcessingException("Expand cells failed. Please check your QTM cell Ids.")
-            
-        total_cells = len(qtm_ids_expand)
+
+        check_expand_size(total_cells, max_cells, feedback)
+        qtm_ids_expand = stream_chunks(key_expand('qtm', qtm_ids, resolution, qtm_expand))
 
         for i, qtm_id_expand in enumerate(qtm_ids_expand):
             if feedback:
@@ -606,41 +557,30 @@ def qtmexpand(qtm_layer: QgsVectorLayer, resolution: int,QTMID_field=None, feedb
                 if feedback.isCanceled():
                     return None
 
-            facet = qtm.qtm_id_to_facet(qtm_id_expand)
-            cell_polygon = qtm.constructGeometry(facet)    
-            
+            cell = get_cell('qtm', qtm_id_expand)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
             if not cell_polygon.is_valid:
                 continue
-            
-            num_edges = 3
-            center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
             qtm_feature = QgsFeature(fields)
             qtm_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "qtm": qtm_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-            }
-            qtm_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([qtm_feature])
+            qtm_feature.setAttributes([qtm_id_expand] + cell_attributes)
+            writer.addFeature(qtm_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("QTM expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
 
 
 ########################## 
 # OLC
 #########################
-def olcexpand(olc_layer: QgsVectorLayer, resolution: int,OLCID_field=None, feedback=None) -> QgsVectorLayer:
+def olcexpand(olc_layer: QgsVectorLayer, resolution: int,OLCID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if not OLCID_field:
         OLCID_field = 'olc'
 
@@ -653,31 +593,25 @@ def olcexpand(olc_layer: QgsVectorLayer, resolution: int,OLCID_field=None, feedb
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = olc_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "olc_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    olc_ids = [
-        feature[OLCID_field]
-        for feature in olc_layer.getFeatures()
-        if feature[OLCID_field]
-    ]
+    writer, output = feature_output(fields, olc_layer.crs(), "olc_expanded", create_sink)
+
+    olc_ids = read_column(olc_layer, OLCID_field)
     olc_ids = list(set(olc_ids))
     
     if olc_ids:
         try:
-            max_res = max(olc.decode(olc_id).codeLength for olc_id in olc_ids)
+            olc_resolutions = [olc.decode(olc_id).codeLength for olc_id in olc_ids]
+            max_res = max(olc_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                     return None
-            olc_ids_expand = olc_expand(olc_ids, resolution)
+            total_cells = expanded_cell_count('olc', olc_ids, olc_resolutions, resolution)
         except:
             raise QgsProcessingException("Expand cells failed. Please check your OLC cell Ids.")
-            
-        total_cells = len(olc_ids_expand)
+
+        check_expand_size(total_cells, max_cells, feedback)
+        olc_ids_expand = stream_chunks(key_expand('olc', olc_ids, resolution, olc_expand))
 
         for i, olc_id_expand in enumerate(olc_ids_expand):
             if feedback:
@@ -685,50 +619,29 @@ def olcexpand(olc_layer: QgsVectorLayer, resolution: int,OLCID_field=None, feedb
                 if feedback.isCanceled():
                     return None
 
-            coord = olc.decode(olc_id_expand)    
-            min_lat, min_lon = coord.latitudeLo, coord.longitudeLo
-            max_lat, max_lon = coord.latitudeHi, coord.longitudeHi        
-
-            # Define the polygon based on the bounding box
-            cell_polygon = Polygon([
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat]   # Closing the polygon (same as the first point)
-            ])    
-            
+            cell = get_cell('olc', olc_id_expand)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
             if not cell_polygon.is_valid:
                 continue
-            
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
             olc_feature = QgsFeature(fields)
             olc_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "olc": olc_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-            }
-            olc_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([olc_feature])
+            olc_feature.setAttributes([olc_id_expand] + cell_attributes)
+            writer.addFeature(olc_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("OLC expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
 
 ########################## 
 # Geohash
 #########################
-def geohashexpand(geohash_layer: QgsVectorLayer, resolution: int,GeohashID_field=None, feedback=None) -> QgsVectorLayer:
+def geohashexpand(geohash_layer: QgsVectorLayer, resolution: int,GeohashID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if not GeohashID_field:
         GeohashID_field = 'geohash'
 
@@ -741,31 +654,25 @@ def geohashexpand(geohash_layer: QgsVectorLayer, resolution: int,GeohashID_field
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = geohash_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "geohash_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    geohash_ids = [
-        feature[GeohashID_field]
-        for feature in geohash_layer.getFeatures()
-        if feature[GeohashID_field]
-    ]
+    writer, output = feature_output(fields, geohash_layer.crs(), "geohash_expanded", create_sink)
+
+    geohash_ids = read_column(geohash_layer, GeohashID_field)
     geohash_ids = list(set(geohash_ids))
     
     if geohash_ids:
         try:
-            max_res = max(len(geohash_id) for geohash_id in geohash_ids)
+            geohash_resolutions = [len(geohash_id) for geohash_id in geohash_ids]
+            max_res = max(geohash_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                     return None
-            geohash_ids_expand = geohash_expand(geohash_ids, resolution)
+            total_cells = expanded_cell_count('geohash', geohash_ids, geohash_resolutions, resolution)
         except:
             raise QgsProcessingException("Expand cells failed. Please check your Geohash cell Ids.")
-            
-        total_cells = len(geohash_ids_expand)
+
+        check_expand_size(total_cells, max_cells, feedback)
+        geohash_ids_expand = stream_chunks(key_expand('geohash', geohash_ids, resolution, geohash_expand))
 
         for i, geohash_id_expand in enumerate(geohash_ids_expand):
             if feedback:
@@ -773,40 +680,30 @@ def geohashexpand(geohash_layer: QgsVectorLayer, resolution: int,GeohashID_field
                 if feedback.isCanceled():
                     return None
 
-            cell_polygon = geohash_to_polygon(geohash_id_expand)
-            
+            cell = get_cell('geohash', geohash_id_expand)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
             if not cell_polygon.is_valid:
                 continue
-            
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
             geohash_feature = QgsFeature(fields)
             geohash_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "geohash": geohash_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-            }
-            geohash_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([geohash_feature])
+            geohash_feature.setAttributes([geohash_id_expand] + cell_attributes)
+            writer.addFeature(geohash_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("Geohash expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
 
 
 ########################## 
 # Tilecode
 #########################
-def tilecodeexpand(tilecode_layer: QgsVectorLayer, resolution: int,TilecodeID_field=None, feedback=None) -> QgsVectorLayer:
+def tilecodeexpand(tilecode_layer: QgsVectorLayer, resolution: int,TilecodeID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if not TilecodeID_field:
         TilecodeID_field = 'tilecode'
 
@@ -819,31 +716,25 @@ def tilecodeexpand(tilecode_layer: QgsVectorLayer, resolution: int,TilecodeID_fi
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = tilecode_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "tilecode_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    tilecode_ids = [
-        feature[TilecodeID_field]
-        for feature in tilecode_layer.getFeatures()
-        if feature[TilecodeID_field]
-    ]
+    writer, output = feature_output(fields, tilecode_layer.crs(), "tilecode_expanded", create_sink)
+
+    tilecode_ids = read_column(tilecode_layer, TilecodeID_field)
     tilecode_ids = list(set(tilecode_ids))
     
     if tilecode_ids:
         try:
-            max_res = max(len(tilecode_id) for tilecode_id in tilecode_ids)
+            tilecode_resolutions = [parse_tilecode(tilecode_id)[0] for tilecode_id in tilecode_ids]
+            max_res = max(tilecode_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                     return None
-            tilecode_ids_expand = tilecode_expand(tilecode_ids, resolution)
+            total_cells = expanded_cell_count('tilecode', tilecode_ids, tilecode_resolutions, resolution)
         except:
             raise QgsProcessingException("Expand cells failed. Please check your tilecode cell Ids.")
-            
-        total_cells = len(tilecode_ids_expand)
+
+        check_expand_size(total_cells, max_cells, feedback)
+        tilecode_ids_expand = stream_chunks(key_expand('tilecode', tilecode_ids, resolution, tilecode_expand))
 
         for i, tilecode_id_expand in enumerate(tilecode_ids_expand):
             if feedback:
@@ -851,54 +742,30 @@ def tilecodeexpand(tilecode_layer: QgsVectorLayer, resolution: int,TilecodeID_fi
                 if feedback.isCanceled():
                     return None
 
-            match = re.match(r'z(\d+)x(\d+)y(\d+)', tilecode_id_expand)
-            z = int(match.group(1))
-            x = int(match.group(2))
-            y = int(match.group(3))
-
-            bounds = mercantile.bounds(x, y, z)    
-            min_lat, min_lon = bounds.south, bounds.west
-            max_lat, max_lon = bounds.north, bounds.east
-            cell_polygon = Polygon([
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat]   # Closing the polygon (same as the first point)
-            ])
-            
+            cell = get_cell('tilecode', tilecode_id_expand)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
             if not cell_polygon.is_valid:
                 continue
-            
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
             tilecode_feature = QgsFeature(fields)
             tilecode_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "tilecode": tilecode_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-            }
-            tilecode_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([tilecode_feature])
+            tilecode_feature.setAttributes([tilecode_id_expand] + cell_attributes)
+            writer.addFeature(tilecode_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("Tilecode expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
 
 
 ########################## 
 # Quadkey
 #########################
-def quadkeyexpand(quadkey_layer: QgsVectorLayer, resolution: int,QuadkeyID_field=None, feedback=None) -> QgsVectorLayer:
+def quadkeyexpand(quadkey_layer: QgsVectorLayer, resolution: int,QuadkeyID_field=None, feedback=None, create_sink=None, max_cells=0) -> QgsVectorLayer:
     if not QuadkeyID_field:
         QuadkeyID_field = 'quadkey'
 
@@ -911,31 +778,25 @@ def quadkeyexpand(quadkey_layer: QgsVectorLayer, resolution: int,QuadkeyID_field
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
 
-    crs = quadkey_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "quadkey_expanded", "memory")
-    mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    quadkey_ids = [
-        feature[QuadkeyID_field]
-        for feature in quadkey_layer.getFeatures()
-        if feature[QuadkeyID_field]
-    ]
+    writer, output = feature_output(fields, quadkey_layer.crs(), "quadkey_expanded", create_sink)
+
+    quadkey_ids = read_column(quadkey_layer, QuadkeyID_field)
     quadkey_ids = list(set(quadkey_ids))
     
     if quadkey_ids:
         try:
-            max_res = max(len(quadkey_id) for quadkey_id in quadkey_ids)
+            quadkey_resolutions = [len(quadkey_id) for quadkey_id in quadkey_ids]
+            max_res = max(quadkey_resolutions)
             if resolution <= max_res:
                 if feedback:
                     feedback.reportError(f"Target expand resolution ({resolution}) must > {max_res}.")
                     return None
-            quadkey_ids_expand = quadkey_expand(quadkey_ids, resolution)
+            total_cells = expanded_cell_count('quadkey', quadkey_ids, quadkey_resolutions, resolution)
         except:
             raise QgsProcessingException("Expand cells failed. Please check your quadkey cell Ids.")
-            
-        total_cells = len(quadkey_ids_expand)
+
+        check_expand_size(total_cells, max_cells, feedback)
+        quadkey_ids_expand = stream_chunks(key_expand('quadkey', quadkey_ids, resolution, quadkey_expand))
 
         for i, quadkey_id_expand in enumerate(quadkey_ids_expand):
             if feedback:
@@ -943,45 +804,21 @@ def quadkeyexpand(quadkey_layer: QgsVectorLayer, resolution: int,QuadkeyID_field
                 if feedback.isCanceled():
                     return None
 
-            quadkey_id_expand_tile = mercantile.quadkey_to_tile(quadkey_id_expand)
-            z = quadkey_id_expand_tile.z
-            x = quadkey_id_expand_tile.x
-            y = quadkey_id_expand_tile.y
-            
-            bounds = mercantile.bounds(x, y, z)    
-            min_lat, min_lon = bounds.south, bounds.west
-            max_lat, max_lon = bounds.north, bounds.east
-            cell_polygon = Polygon([
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat]   # Closing the polygon (same as the first point)
-            ])
-            
+            cell = get_cell('quadkey', quadkey_id_expand)
+            if not cell:
+                continue
+            cell_polygon, cell_geom, cell_attributes = cell
             if not cell_polygon.is_valid:
                 continue
-            
-            center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-            
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
+
             quadkey_feature = QgsFeature(fields)
             quadkey_feature.setGeometry(cell_geom)
-            
-            attributes = {
-                "quadkey": quadkey_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area
-            }
-            quadkey_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([quadkey_feature])
+            quadkey_feature.setAttributes([quadkey_id_expand] + cell_attributes)
+            writer.addFeature(quadkey_feature)
 
         if feedback:
             feedback.setProgress(100)
             feedback.pushInfo("Quadkey expansion completed.")
                 
-    return mem_layer
+    writer.flush()
+    return output
@@ -0,0 +1,218 @@
+import numpy as np
+from vgrid.utils import olc
+from .dggsbatch import lookup_table, decode_chars, parse_tilecode, GEOHASH_TABLE, QUADKEY_TABLE, OLC_TABLE
+
+# Compaction of string-addressed DGGS on integer keys: a cell is (depth, key), where key
+# holds the path from the root, so that the children of a cell are key * arity + [0, arity)
+# and its parent is key // arity. Each depth is compacted once, bottom-up, with numpy.
+
+def digits_to_keys(values, lengths, base):
+    # Digit rows (zero padded at the end) to integers of their first `lengths` digits
+    keys = np.zeros(len(values), dtype=np.int64)
+    for column in range(values.shape[1]):
+        keys = np.where(column < lengths, keys * base + values[:, column], keys)
+    return keys
+
+def keys_to_digits(keys, depth, base):
+    # (n, depth) digit matrix; the leading digit keeps whatever is left above base ** (depth - 1)
+    digits = np.empty((len(keys), depth), dtype=np.int64)
+    for column in range(depth - 1, 0, -1):
+        keys, digits[:, column] = np.divmod(keys, base)
+    digits[:, 0] = keys
+    return digits
+
+def digits_to_strings(digits, alphabet):
+    chars = np.frombuffer(alphabet.encode(), dtype=np.uint8)[digits]
+    return np.ascontiguousarray(chars).view(f'S{digits.shape[1]}').ravel().astype(str).tolist()
+
+def quad_step(depth):
+    return (4, depth - 1) if depth >= 2 else None
+
+
+##########################
+# QTM
+# ########################
+QTM_TABLE = lookup_table('012345678')
+QTM_MAX_LENGTH = 30  # octant digit plus 29 base-4 digits
+
+def qtm_compact_keys(qtm_ids):
+    values, lengths, valid = decode_chars(qtm_ids, QTM_TABLE)
+    valid &= (lengths >= 1) & (lengths <= QTM_MAX_LENGTH)
+    valid &= (values[:, 0] >= 1) & (values[:, 0] <= 8) & np.all(values[:, 1:] <= 3, axis=1)
+    return valid, lengths, digits_to_keys(values, lengths, 4)
+
+def qtm_compact_ids(keys, depth):
+    return digits_to_strings(keys_to_digits(keys, depth, 4), '012345678')
+
+
+##########################
+# OLC
+# ########################
+OLC_MAX_COMPACT_LENGTH = 14  # 20 ** 14 < 2 ** 63
+
+def olc_compact_keys(olc_ids):
+    valid = np.array([olc.isFull(olc_id) for olc_id in olc_ids], dtype=bool)
+    digits = [olc_id.replace(olc.SEPARATOR_, '').replace(olc.PADDING_CHARACTER_, '').upper() for olc_id in olc_ids]
+    values, lengths, valid_chars = decode_chars(digits, OLC_TABLE)
+    valid &= valid_chars & (lengths >= 2) & (lengths <= OLC_MAX_COMPACT_LENGTH)
+    valid &= (lengths > olc.PAIR_CODE_LENGTH_) | (lengths % 2 == 0)
+    return valid, lengths, digits_to_keys(values, lengths, olc.ENCODING_BASE_)
+
+def olc_compact_ids(keys, depth):
+    codes = digits_to_strings(keys_to_digits(keys, depth, olc.ENCODING_BASE_), olc.CODE_ALPHABET_)
+    return [
+        code[:olc.SEPARATOR_POSITION_].ljust(olc.SEPARATOR_POSITION_, olc.PADDING_CHARACTER_) + olc.SEPARATOR_ + code[olc.SEPARATOR_POSITION_:]
+        for code in codes
+    ]
+
+def olc_step(depth):
+    # Pairs of digits (400 children) up to the full 10-digit code, then single grid digits (20)
+    if depth > olc.PAIR_CODE_LENGTH_:
+        return olc.ENCODING_BASE_, depth - 1
+    if depth > 2:
+        return olc.ENCODING_BASE_ ** 2, depth - 2
+    return None
+
+
+##########################
+# Geohash
+# ########################
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_MAX_COMPACT_LENGTH = 12
+
+def geohash_compact_keys(geohash_ids):
+    values, lengths, valid = decode_chars(geohash_ids, GEOHASH_TABLE)
+    valid &= (lengths >= 1) & (lengths <= GEOHASH_MAX_COMPACT_LENGTH)
+    return valid, lengths, digits_to_keys(values, lengths, 32)
+
+def geohash_compact_ids(keys, depth):
+    return digits_to_strings(keys_to_digits(keys, depth, 32), GEOHASH_ALPHABET)
+
+def geohash_step(depth):
+    return (32, depth - 1) if depth >= 2 else None
+
+
+##########################
+# Tilecode / Quadkey
+# ########################
+QUADKEY_MAX_COMPACT_LENGTH = 31
+
+def quadkey_compact_keys(quadkey_ids):
+    values, lengths, valid = decode_chars(quadkey_ids, QUADKEY_TABLE)
+    valid &= (lengths >= 1) & (lengths <= QUADKEY_MAX_COMPACT_LENGTH)
+    return valid, lengths, digits_to_keys(values, lengths, 4)
+
+def quadkey_compact_ids(keys, depth):
+    return digits_to_strings(keys_to_digits(keys, depth, 4), '0123')
+
+def tilecode_compact_keys(tilecode_ids):
+    # Quadkey digits interleave the tile bits: digit = x bit | y bit << 1
+    zxy = np.array([parse_tilecode(tilecode_id) or (-1, 0, 0) for tilecode_id in tilecode_ids], dtype=np.int64).reshape(-1, 3)
+    z, x, y = zxy[:, 0], zxy[:, 1], zxy[:, 2]
+    keys = np.zeros(len(z), dtype=np.int64)
+    for bit in range(int(z.max(initial=0)) - 1, -1, -1):
+        digit = ((x >> bit) & 1) | (((y >> bit) & 1) << 1)
+        keys = np.where(bit < z, keys * 4 + digit, keys)
+    return z >= 0, z, keys
+
+def tilecode_compact_ids(keys, depth):
+    x = np.zeros(len(keys), dtype=np.int64)
+    y = np.zeros(len(keys), dtype=np.int64)
+    for bit in range(depth):
+        digit = (keys >> (2 * bit)) & 3
+        x |= (digit & 1) << bit
+        y |= (digit >> 1) << bit
+    return [f"z{depth}x{tile_x}y{tile_y}" for tile_x, tile_y in zip(x.tolist(), y.tolist())]
+
+def tilecode_step(depth):
+    return (4, depth - 1) if depth >= 1 else None
+
+
+KEY_MAX_DEPTHS = {
+    'qtm': QTM_MAX_LENGTH,
+    'olc': OLC_MAX_COMPACT_LENGTH,
+    'geohash': GEOHASH_MAX_COMPACT_LENGTH,
+    'tilecode': QUADKEY_MAX_COMPACT_LENGTH,
+    'quadkey': QUADKEY_MAX_COMPACT_LENGTH
+}
+
+KEY_COMPACTORS = {
+    'qtm': (qtm_compact_keys, qtm_compact_ids, quad_step),
+    'olc': (olc_compact_keys, olc_compact_ids, olc_step),
+    'geohash': (geohash_compact_keys, geohash_compact_ids, geohash_step),
+    'tilecode': (tilecode_compact_keys, tilecode_compact_ids, tilecode_step),
+    'quadkey': (quadkey_compact_keys, quadkey_compact_ids, quad_step)
+}
+
+def compact_keys(depths, keys, step):
+    """
+    {depth: sorted unique keys} with every complete set of siblings replaced by its parent,
+    repeated up the tree.
+    """
+    levels = {int(depth): np.unique(keys[depths == depth]) for depth in np.unique(depths)}
+    depth = max(levels, default=0)
+    while depth > 0:
+        cells = levels.get(depth)
+        parent_step = step(depth)
+        if cells is not None and len(cells) and parent_step:
+            arity, parent_depth = parent_step
+            parents, counts = np.unique(cells // arity, return_counts=True)
+            full = parents[counts == arity]
+            if len(full):
+                levels[depth] = cells[~np.isin(cells // arity, full)]
+                levels[parent_depth] = np.union1d(levels.get(parent_depth, full[:0]), full)
+        depth -= 1
+    return levels
+
+def key_compact(dggs_type, cell_ids, fallback):
+    """
+    Compact cell IDs of a string-addressed DGGS (sorted, like vgrid's *_compact); IDs that
+    don't fit an integer key go through fallback, the matching vgrid compact function.
+    """
+    cell_ids = list(set(cell_ids))
+    if not cell_ids:
+        return []
+    encode, decode, step = KEY_COMPACTORS[dggs_type]
+    valid, depths, keys = encode(cell_ids)
+    if not valid.all():
+        return fallback(cell_ids)
+    compacted = []
+    for depth, level_keys in compact_keys(depths, keys, step).items():
+        if len(level_keys):
+            compacted.extend(decode(level_keys, depth))
+    return sorted(compacted)
+
+
+##########################
+# Expansion
+# ########################
+KEY_EXPAND_CHUNK_SIZE = 100000
+
+def key_span(step, depth, resolution):
+    """Number of descendants of a depth `depth` cell at `resolution`, or None when no such level exists."""
+    span = 1
+    while resolution > depth:
+        parent_step = step(resolution)
+        if not parent_step:
+            return None
+        arity, resolution = parent_step
+        span *= arity
+    return span if resolution == depth else None
+
+def key_expand(dggs_type, cell_ids, resolution, fallback, chunk_size=KEY_EXPAND_CHUNK_SIZE):
+    """
+    Children of each cell at resolution, yielded parent by parent in chunks of at most
+    chunk_size IDs; cells that don't fit an integer key go through fallback, the matching
+    vgrid expand function. Cells at or below resolution are yielded as they are.
+    """
+    encode, decode, step = KEY_COMPACTORS[dggs_type]
+    valid, depths, keys = encode(cell_ids)
+    for cell_id, is_valid, depth, key in zip(cell_ids, valid.tolist(), depths.tolist(), keys.tolist()):
+        span = key_span(step, depth, resolution) if is_valid else None
+        if depth >= resolution:
+            yield [cell_id]
+        elif span is None or resolution > KEY_MAX_DEPTHS[dggs_type]:
+            yield fallback([cell_id], resolution)
+        else:
+            for start in range(0, span, chunk_size):
+                yield decode(key * span + np.arange(start, min(start + chunk_size, span), dtype=np.int64), resolution)
@@ -1,5 +1,5 @@
 from shapely.geometry import Polygon, box, mapping
-from shapely.wkt import loads as wkt_loads
+from ..geometry import shapely_to_qgsgeometry, qgsgeometry_to_shapely
 import platform,re
 from qgis.core import QgsFeature, QgsGeometry, QgsField, QgsFields,QgsWkbTypes
 
@@ -35,6 +35,9 @@ if (platform.system() == 'Windows'):
     isea3h_dggs = Eaggr(Model.ISEA3H)
 
 from vgrid.conversion.dggscompact import qtm_compact,olc_compact,geohash_compact,tilecode_compact,quadkey_compact
+from .keycompact import key_compact
+from .dggscell import rhealpix_grid_dggs
+from .dggs2qgsfeature import rhealpix2qgsfeature
 
 from vgrid.generator.geohashgrid import initial_geohashes, geohash_to_polygon, expand_geohash_bbox
 
@@ -83,7 +86,7 @@ def point2h3(feature, resolution, feedback):
     
     center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
     
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
     h3_feature = QgsFeature()
     h3_feature.setGeometry(cell_geometry)
     
@@ -156,7 +159,7 @@ def poly2h3(feature, resolution, compact, feedback):
         h3_id = str(bbox_buffer_cell)
         center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
         cell_resolution = h3.get_resolution(h3_id) 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
           # **Check for intersection with the input feature**
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells
@@ -234,7 +237,7 @@ def point2s2(feature, resolution,feedback):
     num_edges = 4
     center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
     
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)        
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)        
     # Create a single QGIS feature
     s2_feature = QgsFeature()
     s2_feature.setGeometry(cell_geometry)
@@ -313,7 +316,7 @@ def poly2s2(feature, resolution,compact,feedback):
         num_edges = 4
         center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
         
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
           # **Check for intersection with the input feature**
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells
@@ -364,7 +367,11 @@ def poly2s2(feature, resolution,compact,feedback):
 #######################
 # QgsFeatures to rHEALPix
 #######################
-rhealpix_dggs = RHEALPixDGGS()
+rhealpix_dggs = rhealpix_grid_dggs
+
+def rhealpixid2qgsfeature(feature, rhealpix_id):
+    """Feature of a cached rHEALPix ID, decoded in the layout qgsfeature2rhealpix encodes with."""
+    return rhealpix2qgsfeature(feature, rhealpix_id, rhealpix_dggs)
 
 def qgsfeature2rhealpix(feature, resolution,compact=None,feedback=None):
     gfeature_geom = feature.geometry()
@@ -394,7 +401,7 @@ def point2rhealpix(feature, resolution,feedback):
         num_edges = 3 
     center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(seed_cell_polygon, num_edges)
         
-    cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
+    cell_geometry = shapely_to_qgsgeometry(seed_cell_polygon)
     
     # Create a single QGIS feature
     rhealpix_feature = QgsFeature()
@@ -458,7 +465,7 @@ def poly2rhealpix(feature, resolution,compact,feedback):
             num_edges = 3 
         center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(seed_cell_polygon, num_edges)
         cell_resolution = resolution
-        cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(seed_cell_polygon)
           # Create a single QGIS feature
         rhealpix_feature = QgsFeature()
         rhealpix_feature.setGeometry(cell_geometry)
@@ -545,7 +552,7 @@ def poly2rhealpix(feature, resolution,compact,feedback):
                 num_edges = 3 
             center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
             cell_resolution = rhelpix_cell.resolution
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geometry = shapely_to_qgsgeometry(cell_polygon)
             if not cell_geometry.intersects(feature_geometry):
                 continue  # Skip non-intersecting cells      
             # Create a single QGIS feature
@@ -626,7 +633,7 @@ def point2isea4t(feature, resolution,feedback):
     num_edges = 3
     center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
    
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
     
     # Create a single QGIS feature
     isea4t_feature = QgsFeature()
@@ -706,7 +713,7 @@ def poly2isea4t(feature, resolution,compact, feedback):
         num_edges = 3
         center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
         cell_resolution = len(isea4t_id)-2
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells      
         
@@ -787,7 +794,7 @@ def point2isea3h(feature, resolution,feedback):
         num_edges = 3 # icosahedron faces
     center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
     
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
     
     # Create a single QGIS feature
     isea3h_feature = QgsFeature()
@@ -865,7 +872,7 @@ def poly2isea3h(feature, resolution,compact, feedback):
         num_edges = 3 if cell_resolution == 0 else 6  
         center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
                 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)
         
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells      
@@ -959,7 +966,7 @@ def point2ease(feature, resolution,feedback):
     num_edges = 4
     center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon,num_edges)  
   
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
     
     # Create a single QGIS feature
     ease_feature = QgsFeature()
@@ -1027,7 +1034,7 @@ def point2qtm(feature, resolution,feedback):
     num_edges = 3
     center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)    
     cell_resolution = resolution
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
    
     qtm_feature = QgsFeature()
     qtm_feature.setGeometry(cell_geometry)
@@ -1067,7 +1074,7 @@ def qtmcompact_from_qgsfeatures(qgs_features,feedback):
 
     qtm_ids = [f["qtm"] for f in qgs_features if f["qtm"]]
 
-    qtm_ids_compact = qtm_compact(qtm_ids)
+    qtm_ids_compact = key_compact('qtm', qtm_ids, qtm_compact)
     qtm_features = []
     total_cells = len(qtm_ids_compact)
     if feedback:
@@ -1082,7 +1089,7 @@ def qtmcompact_from_qgsfeatures(qgs_features,feedback):
         cell_resolution = len(qtm_id_compact)
         num_edges = 3
         center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
         qtm_feature = QgsFeature()
         qtm_feature.setFields(original_fields)
@@ -1138,7 +1145,7 @@ def poly2qtm(feature, resolution,compact,feedback):
                 center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(facet_geom, num_edges)    
                 
                 levelFacets[0].append(facet)
-                cell_geometry = QgsGeometry.fromWkt(facet_geom.wkt)      
+                cell_geometry = shapely_to_qgsgeometry(facet_geom)      
                 
                 if cell_geometry.intersects(feature_geometry) and resolution == 1 :                                         
                     # Create a single QGIS feature
@@ -1185,7 +1192,7 @@ def poly2qtm(feature, resolution,compact,feedback):
                 subdivided_facets = qtm.divideFacet(pf)
                 for j, subfacet in enumerate(subdivided_facets):
                     subfacet_geom = qtm.constructGeometry(subfacet)
-                    cell_geometry = QgsGeometry.fromWkt(subfacet_geom.wkt) 
+                    cell_geometry = shapely_to_qgsgeometry(subfacet_geom) 
                     
                     if cell_geometry.intersects(feature_geometry):  # Only keep intersecting facets
                         new_id = QTMID[lvl - 1][i] + str(j)
@@ -1296,7 +1303,7 @@ def point2olc(feature, resolution,feedback):
     for field in new_fields:
         all_fields.append(field)
     
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon) 
     olc_feature = QgsFeature()
     olc_feature.setGeometry(cell_geometry)
     olc_feature.setFields(all_fields)
@@ -1429,7 +1436,7 @@ def olc_refine_cell(bounds, current_resolution, target_resolution, bbox_poly):
 def olccompact_from_qgsfeatures(qgs_features, feedback):
     original_fields = qgs_features[0].fields()
     olc_ids = [f["olc"] for f in qgs_features if f["olc"]]
-    olc_ids_compact = olc_compact(olc_ids)
+    olc_ids_compact = key_compact('olc', olc_ids, olc_compact)
     olc_features = []
     
     total_cells = len(olc_ids_compact)
@@ -1455,7 +1462,7 @@ def olccompact_from_qgsfeatures(qgs_features, feedback):
         ])
         center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon) 
         
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
         olc_feature = QgsFeature()
         olc_feature.setFields(original_fields)
@@ -1482,7 +1489,7 @@ def poly2olc(feature, resolution,compact,feedback):
     olc_features = []
     
     feature_geometry = feature.geometry()
-    feature_shapely = wkt_loads(feature_geometry.asWkt())
+    feature_shapely = qgsgeometry_to_shapely(feature_geometry)
     fields = QgsFields()
     fields.append(QgsField("resolution", QVariant.Int))
     fields.append(QgsField("olc", QVariant.String))
@@ -1526,7 +1533,7 @@ def poly2olc(feature, resolution,compact,feedback):
             
             cell_polygon = Polygon(resolution_feature["geometry"]["coordinates"][0])
             olc_id = resolution_feature["properties"]["olc"]
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+            cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
             # Compute additional attributes
             cell_resolution = resolution
@@ -1555,7 +1562,7 @@ def poly2olc(feature, resolution,compact,feedback):
             for field in new_fields:
                 all_fields.append(field)
             
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
+            cell_geometry = shapely_to_qgsgeometry(cell_polygon) 
             olc_feature = QgsFeature()
             olc_feature.setGeometry(cell_geometry)
             olc_feature.setFields(all_fields)
@@ -1616,7 +1623,7 @@ def point2geohash(feature, resolution,feedback):
     
     center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)  
     cell_resolution = resolution
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
     # Create a single QGIS feature
     geohash_feature = QgsFeature()
     geohash_feature.setGeometry(cell_geometry)
@@ -1657,7 +1664,7 @@ def geohashcompact_from_qgsfeatures(qgs_features, feedback):
 
     geohash_ids = [f["geohash"] for f in qgs_features if f["geohash"]]
 
-    geohash_ids_compact = geohash_compact(geohash_ids)
+    geohash_ids_compact = key_compact('geohash', geohash_ids, geohash_compact)
     geohash_features = []
       
     total_cells = len(geohash_ids_compact)
@@ -1673,7 +1680,7 @@ def geohashcompact_from_qgsfeatures(qgs_features, feedback):
         
         center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon) 
         
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
         geohash_feature = QgsFeature()
         geohash_feature.setFields(original_fields)
@@ -1700,7 +1707,7 @@ def geohashcompact_from_qgsfeatures(qgs_features, feedback):
 def poly2geohash(feature, resolution,compact, feedback):
     geohash_features = []
     feature_geometry = feature.geometry()    
-    feature_shapely = wkt_loads(feature_geometry.asWkt())
+    feature_shapely = qgsgeometry_to_shapely(feature_geometry)
 
     intersected_geohashes = {gh for gh in initial_geohashes if geohash_to_polygon(gh).intersects(feature_shapely)}
         # Expand geohash bounding box
@@ -1722,7 +1729,7 @@ def poly2geohash(feature, resolution,compact, feedback):
         
         cell_polygon = geohash_to_polygon(gh)
         # if cell_polygon.intersects(feature):
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
             # **Check for intersection with the input feature**
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells
@@ -1840,7 +1847,7 @@ def point2georef(feature, resolution,feedback):
     for field in new_fields:
         all_fields.append(field)
     
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt) 
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon) 
     georef_feature = QgsFeature()
     georef_feature.setGeometry(cell_geometry)
     georef_feature.setFields(all_fields)
@@ -1913,7 +1920,7 @@ def poly2georef(feature, resolution,compact,feedback):
             return []
         cell_polygon = georef_to_polygon(gr)
         # if cell_polygon.intersects(feature):
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
             # **Check for intersection with the input feature**
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells
@@ -2004,7 +2011,7 @@ def point2tilecode(feature, resolution,feedback):
     center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)  
     resolution = tilecode_cell.z 
     
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
     # Create a single QGIS feature
     tilecode_feature = QgsFeature()
@@ -2046,7 +2053,7 @@ def tilecodecompact_from_qgsfeatures(qgs_features, feedback):
 
     tilecode_ids = [f["tilecode"] for f in qgs_features if f["tilecode"]]
 
-    tilecode_ids_compact = tilecode_compact(tilecode_ids)
+    tilecode_ids_compact = key_compact('tilecode', tilecode_ids, tilecode_compact)
     tilecode_features = []
     total_cells = len (tilecode_ids_compact)
     
@@ -2084,7 +2091,7 @@ def tilecodecompact_from_qgsfeatures(qgs_features, feedback):
     
         center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon) 
         
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
         tilecode_feature = QgsFeature()
         tilecode_feature.setFields(original_fields)
@@ -2143,7 +2150,7 @@ def poly2tilecode(feature, resolution,compact,feedback):
         ])
                 
         # if cell_polygon.intersects(feature):
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
             # **Check for intersection with the input feature**
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells
@@ -2233,7 +2240,7 @@ def point2quadkey(feature, resolution, feedback):
     ])
     center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)  
     cell_resolution = quadkey_cell.z 
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+    cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
     # Create a single QGIS feature
     quadkey_feature = QgsFeature()
@@ -2275,7 +2282,7 @@ def quadkeycompact_from_qgsfeatures(qgs_features, feedback):
 
     quadkey_ids = [f["quadkey"] for f in qgs_features if f["quadkey"]]
 
-    quadkey_ids_compact = quadkey_compact(quadkey_ids)
+    quadkey_ids_compact = key_compact('quadkey', quadkey_ids, quadkey_compact)
     quadkey_features = []
    
     total_cells = len (quadkey_ids_compact)
@@ -2309,7 +2316,7 @@ def quadkeycompact_from_qgsfeatures(qgs_features, feedback):
     
         center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon) 
         
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)
 
         quadkey_feature = QgsFeature()
         quadkey_feature.setFields(original_fields)
@@ -2367,7 +2374,7 @@ def poly2quadkey(feature, resolution,compact, feedback):
             [min_lon, min_lat]   # Closing the polygon (same as the first point)
         ])
                 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)    
+        cell_geometry = shapely_to_qgsgeometry(cell_polygon)    
         if not cell_geometry.intersects(feature_geometry):
             continue  # Skip non-intersecting cells
         
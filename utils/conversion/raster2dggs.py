@@ -1,28 +1,25 @@
-import platform,re
+import platform, threading
+from concurrent.futures import ThreadPoolExecutor
 from qgis.core import (
     QgsRasterLayer,
-    QgsRaster,
     QgsFeature,
-    QgsGeometry,
     QgsVectorLayer,
     QgsFields,
-    QgsField,
-    QgsPointXY
+    QgsField
 )
 from PyQt5.QtCore import QVariant
-import math
-from shapely.geometry import Polygon
-from shapely.wkt import loads
-
-import h3 
-from vgrid.utils import s2, qtm, olc, geohash, tilecode
+import numpy as np
+from osgeo import gdal, osr
+from ..geometry import bounds_to_qgsgeometry
+from ..featurewriter import feature_output
+from .dggscell import get_cell
+from .dggsbatch import GRATICULE_BATCH_ENCODERS, GRATICULE_KEY_GRIDS, can_batch_encode, graticule_cells_to_bounds, parse_tilecode
+from .rasterblock import RasterBlockReader, CellAggregator
+from ..dggsmetrics import DGGS_PARENTS, DGGS_CHILD_COUNTS, pyramid_resolutions
+
+import h3
+from vgrid.utils import s2, qtm
 from vgrid.conversion.latlon2dggs import *
-from vgrid.utils import mercantile
-from vgrid.utils.rhealpixdggs.dggs import RHEALPixDGGS
-from vgrid.generator.h3grid import fix_h3_antimeridian_cells
-from vgrid.conversion.dggs2geojson import rhealpix_cell_to_polygon
-from vgrid.generator.settings import graticule_dggs_metrics, geodesic_dggs_metrics
-
 from vgrid.utils.rhealpixdggs.dggs import RHEALPixDGGS
 from vgrid.utils.rhealpixdggs.ellipsoids import WGS84_ELLIPSOID
 
@@ -32,1017 +29,535 @@ if (platform.system() == 'Windows'):
     from vgrid.utils.eaggr.eaggr import Eaggr
     from vgrid.utils.eaggr.shapes.dggs_cell import DggsCell
     from vgrid.utils.eaggr.enums.model import Model
-    from vgrid.utils.eaggr.enums.shape_string_format import ShapeStringFormat
-    from vgrid.generator.isea4tgrid import fix_isea4t_wkt, fix_isea4t_antimeridian_cells
     isea4t_dggs = Eaggr(Model.ISEA4T)
 
-from vgrid.utils.antimeridian import fix_polygon
-
-from pyproj import Geod
-geod = Geod(ellps="WGS84")
-p90_n180, p90_n90, p90_p0, p90_p90, p90_p180 = (90.0, -180.0), (90.0, -90.0), (90.0, 0.0), (90.0, 90.0), (90.0, 180.0)
-p0_n180, p0_n90, p0_p0, p0_p90, p0_p180 = (0.0, -180.0), (0.0, -90.0), (0.0, 0.0), (0.0, 90.0), (0.0, 180.0)
-n90_n180, n90_n90, n90_p0, n90_p90, n90_p180 = (-90.0, -180.0), (-90.0, -90.0), (-90.0, 0.0), (-90.0, 90.0), (-90.0, 180.0)
-
-def qgsgeometry_to_shapely(qgs_geom: QgsGeometry) -> Polygon:
-    if not qgs_geom:
-        return None
-
-    if qgs_geom.isMultipart():
-        rings = qgs_geom.asMultiPolygon()
-    else:
-        rings = [qgs_geom.asPolygon()]
-
-    if not rings or not rings[0]:
-        return None
-
-    exterior = [(pt.x(), pt.y()) for pt in rings[0][0]]
-    interiors = [[(pt.x(), pt.y()) for pt in ring] for ring in rings[0][1:]]
-
-    return Polygon(exterior, interiors)
+GRATICULE_DGGS = ('olc', 'geohash', 'tilecode', 'quadkey')
 
-########################## 
-# H3
+##########################
+# Raster scanning
 # ########################
-def raster2h3(raster_layer: QgsRasterLayer, resolution: int, feedback=None) -> QgsVectorLayer:
-    if not raster_layer.isValid():
-        raise ValueError("Invalid raster layer.")
-
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
-    crs = raster_layer.crs()
-    band_count = provider.bandCount()
-
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
-
-    h3_cells = set()
-
-    for row in range(height):
-        if feedback and feedback.isCanceled():
-            return None
-        for col in range(width):
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            h3_index = h3.latlng_to_cell(y, x, resolution)
-            h3_cells.add(h3_index)
-        if feedback:
-            feedback.setProgress(int(row / height * 100))
-
-    if feedback:
-        feedback.pushInfo(f"{len(h3_cells)} pixels processed.")
-        feedback.setProgress(0)
-        feedback.pushInfo("Generating H3 DGGS...")
-
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "H3 Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
-
+def raster_cell_fields(dggs_type, band_count):
     fields = QgsFields()
-    fields.append(QgsField("h3", QVariant.String))
+    fields.append(QgsField(dggs_type, QVariant.String))
     fields.append(QgsField("resolution", QVariant.Int))
     fields.append(QgsField("center_lat", QVariant.Double))
     fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
+    if dggs_type in GRATICULE_DGGS:
+        fields.append(QgsField("cell_width", QVariant.Double))
+        fields.append(QgsField("cell_height", QVariant.Double))
+    else:
+        fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
     for i in range(band_count):
         fields.append(QgsField(f"band_{i + 1}", QVariant.Double))
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    for i, h3_index in enumerate(h3_cells):
-        if feedback and feedback.isCanceled():
-            return None
-        lat, lon = h3.cell_to_latlng(h3_index)
-        point = QgsPointXY(lon, lat)
-        ident = provider.identify(point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float('nan'))) for i in range(band_count)):
-            continue
-
-        boundary = h3.cell_to_boundary(h3_index)
-        if not boundary:
-            continue
-        fixed_boundary = fix_h3_antimeridian_cells(boundary)
-        ring = [(lon, lat) for lat, lon in fixed_boundary]
-        qgs_ring = [QgsPointXY(lon, lat) for lon, lat in ring]
-        cell_geom = QgsGeometry.fromPolygonXY([qgs_ring])
-        shapely_poly = qgsgeometry_to_shapely(cell_geom)
-
-        num_edges = 5 if h3.is_pentagon(h3_index) else 6
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(shapely_poly, num_edges)
-
-        feature = QgsFeature()
-        feature.setGeometry(cell_geom)
-        attributes = {
-            "h3": h3_index,
-            "resolution": resolution,
-            "center_lat": center_lat,
-            "center_lon": center_lon,
-            "avg_edge_len": avg_edge_len,
-            "cell_area": cell_area,
-        }
-        for i in range(band_count):
-            attributes[f"band_{i + 1}"] = results.get(i + 1, None)
-        feature.setAttributes([attributes[field.name()] for field in fields])
-        mem_provider.addFeatures([feature])
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(h3_cells)))
+    return fields
 
-    if feedback:
-        feedback.setProgress(100)
-        feedback.pushInfo("H3 DGGS generation completed.")
-            
-    return mem_layer
-
-########################## 
-# S2
-# ########################
-def raster2s2(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
-    if not raster_layer.isValid():
-        raise ValueError("Invalid raster layer.")
-
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
-    crs = raster_layer.crs()
-    band_count = provider.bandCount()
 
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
+def raster_cell_ids(reader, dggs_type, resolution, latlon_to_cell, feedback=None):
+    """
+    Cell IDs of all pixel centres with data, scanned in strips of full raster width.
+    Strips that are entirely no data are skipped before any cell is encoded.
+    Graticule DGGS are encoded as NumPy arrays of integer keys and de-duplicated
+    before any ID string is built; the other DGGS are encoded point by point.
+    """
+    batch = can_batch_encode(dggs_type, resolution)
+    cell_keys, cell_ids = [], set()
 
-    s2_tokens = set()
-
-    for row in range(height):
+    for row_offset, rows in reader.strips():
         if feedback and feedback.isCanceled():
             return None
-        for col in range(width):
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            s2_token = latlon2s2(y, x, resolution)
-            s2_tokens.add(s2_token)
+        window = reader.read_valid(row_offset, 0, rows, reader.width)
+        if window is not None:
+            _, valid = window
+            lons, lats = reader.pixel_centers(row_offset, 0, rows, reader.width)
+            lon_grid, lat_grid = np.meshgrid(lons, lats)
+            lat_values, lon_values = lat_grid.ravel()[valid], lon_grid.ravel()[valid]
+            if batch:
+                encode, _ = GRATICULE_BATCH_ENCODERS[dggs_type]
+                cell_keys.append(np.unique(encode(lat_values, lon_values, resolution)))
+            else:
+                cell_ids.update(
+                    latlon_to_cell(lat, lon, resolution)
+                    for lat, lon in zip(lat_values.tolist(), lon_values.tolist())
+                )
         if feedback:
-            feedback.setProgress(int(row / height * 100))
-
-    if feedback:
-        feedback.pushInfo(f"{len(s2_tokens)} pixels processed.")
-        feedback.setProgress(0)
-        feedback.pushInfo("Generating S2 DGGS...")
-
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "S2 Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
-
-    fields = QgsFields()
-    fields.append(QgsField("s2", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    for i in range(band_count):
-        fields.append(QgsField(f"band_{i+1}", QVariant.Double))
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    for i, s2_token in enumerate(s2_tokens):
-        if feedback and feedback.isCanceled():
-            return None
-
-        s2_id = s2.CellId.from_token(s2_token)
-        s2_cell = s2.Cell(s2_id)
-        centroid_latlng = s2.LatLng.from_point(s2_cell.get_center())
-        lat, lon = centroid_latlng.lat().degrees, centroid_latlng.lng().degrees
-        center_point = QgsPointXY(lon, lat)
-
-        ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-            continue
-
-        vertices = [s2_cell.get_vertex(i) for i in range(4)]
-        coords = [(s2.LatLng.from_point(v).lng().degrees, s2.LatLng.from_point(v).lat().degrees) for v in vertices]
-        coords.append(coords[0])  # close ring
-        polygon = fix_polygon(Polygon(coords))
-        qgs_polygon = QgsGeometry.fromPolygonXY([[QgsPointXY(lon, lat) for lon, lat in polygon.exterior.coords]])
-        
-        num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(polygon, num_edges)
-
-        feature = QgsFeature()
-        feature.setGeometry(qgs_polygon)
-        attr_values = [
-            s2_token,
-            resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
+            feedback.setProgress(int(100 * (row_offset + rows) / reader.height))
+
+    if batch:
+        _, key_ids = GRATICULE_BATCH_ENCODERS[dggs_type]
+        return key_ids(np.unique(np.concatenate(cell_keys)), resolution) if cell_keys else []
+    return list(cell_ids)
+
+
+def aggregate_block(reader, aggregator, dggs_type, resolution, latlon_to_cell, row_offset, col_offset, rows, cols):
+    """
+    Add the pixels of one block to a CellAggregator, keyed by cell ID (or by integer
+    key for batch-encoded graticule DGGS). Returns False for an all no-data block.
+    """
+    window = reader.read_valid(row_offset, col_offset, rows, cols)
+    if window is None:
+        return False
+    # Only pixels with data in at least one band are encoded
+    values, valid = window
+    lons, lats = reader.pixel_centers(row_offset, col_offset, rows, cols)
+    lon_grid, lat_grid = np.meshgrid(lons, lats)
+    lat_values, lon_values = lat_grid.ravel()[valid], lon_grid.ravel()[valid]
+    if can_batch_encode(dggs_type, resolution):
+        encode, _ = GRATICULE_BATCH_ENCODERS[dggs_type]
+        cells = encode(lat_values, lon_values, resolution)
+    else:
+        cells = [
+            latlon_to_cell(lat, lon, resolution)
+            for lat, lon in zip(lat_values.tolist(), lon_values.tolist())
         ]
-        attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-        feature.setAttributes(attr_values)
-        mem_provider.addFeatures([feature])
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(s2_tokens)))
-
-    if feedback:
-        feedback.setProgress(100)
-        feedback.pushInfo("S2 DGGS generation completed.")
-    
-
-    return mem_layer
-
-########################## 
-# rHEALpix
-# ########################
-def raster2rhealpix(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
-    rhealpix_dggs = RHEALPixDGGS(ellipsoid=E, north_square=1, south_square=3, N_side=3)
-
-    if not raster_layer.isValid():
-        raise ValueError("Invalid raster layer.")
-
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
-    crs = raster_layer.crs()
-    band_count = provider.bandCount()
-
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
-
-    rhealpix_ids = set()
-    total_pixels = width * height
-    processed_pixels = 0
-
-    for row in range(height):
-        for col in range(width):
-            if feedback and feedback.isCanceled():
-                return None
-
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            rhealpix_id = latlon2rhealpix(y, x, resolution)
-            rhealpix_ids.add(rhealpix_id)
-
-            processed_pixels += 1
-            if feedback and processed_pixels % 10000 == 0:
-                feedback.setProgress(int(100 * processed_pixels / total_pixels))
-
-    if feedback:
-        feedback.pushInfo(f"{len(rhealpix_ids)} pixels processed.")
-        feedback.setProgress(0)
-        feedback.pushInfo("Generating rHEALpix DGGS...")
-
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "rHEALpix Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
-
-    fields = QgsFields()
-    fields.append(QgsField("rhealpix", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    for i in range(band_count):
-        fields.append(QgsField(f"band_{i+1}", QVariant.Double))
-
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    for i, rhealpix_id in enumerate(rhealpix_ids):
+    aggregator.add(aggregator.index(cells), values[:, valid])
+    return True
+
+
+def aggregated_cell_ids(aggregator, dggs_type, resolution):
+    # Integer keys of batch-encoded graticule DGGS -> cell IDs
+    if can_batch_encode(dggs_type, resolution) and aggregator.cell_ids:
+        _, key_ids = GRATICULE_BATCH_ENCODERS[dggs_type]
+        return key_ids(np.array(aggregator.cell_ids, dtype=np.int64), resolution)
+    return list(aggregator.cell_ids)
+
+
+def raster_cell_statistics(reader, dggs_type, resolution, latlon_to_cell, stats, feedback=None):
+    """
+    One pass over the raster blocks: every pixel centre is assigned to its cell and
+    the band values are aggregated per cell with a streaming group-by.
+    Returns the CellAggregator, keyed by integer cell key for batch-encoded graticule
+    DGGS (see aggregated_cell_ids) and by cell ID otherwise.
+    """
+    aggregator = CellAggregator(reader.band_count, stats)
+    total_blocks = sum(1 for _ in reader.blocks())
+
+    skipped_blocks = 0
+    for i, (row_offset, col_offset, rows, cols) in enumerate(reader.blocks()):
         if feedback and feedback.isCanceled():
             return None
-
-        rhealpix_uids = (rhealpix_id[0],) + tuple(map(int, rhealpix_id[1:]))
-        rhealpix_cell = rhealpix_dggs.cell(rhealpix_uids)
-
-        lon, lat = rhealpix_cell.centroid(plane=False)
-        center_point = QgsPointXY(lon, lat)
-
-        ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-            continue
-
-        cell_polygon = rhealpix_cell_to_polygon(rhealpix_cell)
-        num_edges = 3 if rhealpix_cell.ellipsoidal_shape() == 'dart' else 4
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-
-        qgs_polygon = QgsGeometry.fromPolygonXY(
-            [[QgsPointXY(lon, lat) for lon, lat in cell_polygon.exterior.coords]]
-        )
-
-        feature = QgsFeature()
-        feature.setGeometry(qgs_polygon)
-        attr_values = [
-            rhealpix_id,
-            resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-        ]
-        attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-        feature.setAttributes(attr_values)
-
-        mem_provider.addFeatures([feature])
-
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(rhealpix_ids)))
-
-    if feedback:
-        feedback.setProgress(100)
-        feedback.pushInfo("rHEALpix DGGS generation completed.")
-
-    return mem_layer
-
-
-########################## 
-# ISEA4T
-# ########################
-def raster2isea4t(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
-    if (platform.system() == 'Windows'): 
-        isea4t_dggs = Eaggr(Model.ISEA4T)
-
-        if not raster_layer.isValid():
-            raise ValueError("Invalid raster layer.")
-
-        provider = raster_layer.dataProvider()
-        extent = raster_layer.extent()
-        width, height = raster_layer.width(), raster_layer.height()
-        crs = raster_layer.crs()
-        band_count = provider.bandCount()
-
-        pixel_size_x = extent.width() / width
-        pixel_size_y = extent.height() / height
-
-        isea4t_ids = set()
-        total_pixels = width * height
-        processed_pixels = 0
-
-        for row in range(height):
-            for col in range(width):
-                if feedback and feedback.isCanceled():
-                    return None
-
-                x = extent.xMinimum() + col * pixel_size_x
-                y = extent.yMaximum() - row * pixel_size_y
-                isea4t_id = latlon2isea4t(y, x, resolution)
-                isea4t_ids.add(isea4t_id)
-
-                processed_pixels += 1
-                if feedback and processed_pixels % 10000 == 0:
-                    feedback.setProgress(int(100 * processed_pixels / total_pixels))
-
+        if not aggregate_block(reader, aggregator, dggs_type, resolution, latlon_to_cell, row_offset, col_offset, rows, cols):
+            skipped_blocks += 1
         if feedback:
-            feedback.pushInfo(f"{len(isea4t_ids)} pixels processed.")
-            feedback.setProgress(0)
-            feedback.pushInfo("Generating ISEA4T DGGS...")
-
-        mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "isea4t Grid", "memory")
-        mem_provider = mem_layer.dataProvider()
-
-        fields = QgsFields()
-        fields.append(QgsField("isea4t", QVariant.String))
-        fields.append(QgsField("resolution", QVariant.Int))
-        fields.append(QgsField("center_lat", QVariant.Double))
-        fields.append(QgsField("center_lon", QVariant.Double))
-        fields.append(QgsField("avg_edge_len", QVariant.Double))
-        fields.append(QgsField("cell_area", QVariant.Double))
-        for i in range(band_count):
-            fields.append(QgsField(f"band_{i+1}", QVariant.Double))
+            feedback.setProgress(int(100 * (i + 1) / total_blocks))
 
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
+    if feedback and skipped_blocks:
+        feedback.pushInfo(f"{skipped_blocks} of {total_blocks} blocks skipped (no data).")
 
-        for i, isea4t_id in enumerate(isea4t_ids):
-            if feedback and feedback.isCanceled():
-                return None
-                        
-            isea4t_cell=DggsCell(isea4t_id)
-            lat_long_point = isea4t_dggs.convert_dggs_cell_to_point(isea4t_cell)
-            lat, lon = lat_long_point._latitude, lat_long_point._longitude
-            center_point = QgsPointXY(lon, lat)
-
-            ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-            if not ident.isValid():
-                continue
+    return aggregator
 
-            results = ident.results()
-            if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-                continue
 
-            cell_to_shape = isea4t_dggs.convert_dggs_cell_outline_to_shape_string(DggsCell(isea4t_id),ShapeStringFormat.WKT)
-            cell_to_shape_fixed = loads(fix_isea4t_wkt(cell_to_shape))
-            if isea4t_id.startswith('00') or isea4t_id.startswith('09') or isea4t_id.startswith('14')\
-                or isea4t_id.startswith('04') or isea4t_id.startswith('19'):
-                cell_to_shape_fixed = fix_isea4t_antimeridian_cells(cell_to_shape_fixed)
-            
-            num_edges = 3
-            cell_polygon = Polygon(list(cell_to_shape_fixed.exterior.coords))
-            
-            center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-
-            qgs_polygon = QgsGeometry.fromPolygonXY(
-                [[QgsPointXY(lon, lat) for lon, lat in cell_polygon.exterior.coords]]
-            )
-
-            feature = QgsFeature()
-            feature.setGeometry(qgs_polygon)
-            attr_values = [
-                isea4t_id,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-            ]
-            attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-            feature.setAttributes(attr_values)
-
-            mem_provider.addFeatures([feature])
-
-            if feedback and i % 100 == 0:
-                feedback.setProgress(int(100 * i / len(isea4t_ids)))
-
-        if feedback:
-            feedback.setProgress(100)
-            feedback.pushInfo("ISEA4T DGGS generation completed.")
+def raster_cell_feature(cell_id, cell_geom, cell_attributes, band_values):
+    feature = QgsFeature()
+    feature.setGeometry(cell_geom)
+    attr_values = [cell_id] + cell_attributes
+    attr_values.extend(None if np.isnan(value) else value for value in band_values)
+    feature.setAttributes(attr_values)
+    return feature
 
-        return mem_layer
 
-
-########################## 
-# QTM
-# ########################
-def raster2qtm(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
+def decode_raster_cells(dggs_type, cell_ids):
+    """{cell_id: (cell_geometry, attributes)} for the cells that decode."""
+    if dggs_type in GRATICULE_DGGS:
+        return {
+            cell_id: (bounds_to_qgsgeometry(*bounds), cell_attributes)
+            for cell_id, (bounds, cell_attributes) in graticule_cells_to_bounds(dggs_type, cell_ids).items()
+        }
+    cells = {}
+    for cell_id in cell_ids:
+        cell = get_cell(dggs_type, cell_id)
+        if cell:
+            cells[cell_id] = (cell[1], cell[2])
+    return cells
+
+
+def raster_tiled_features(raster_layer: QgsRasterLayer, dggs_type, resolution, latlon_to_cell, stats='mean', workers=None, feedback=None):
+    """
+    Tiled conversion, yielding cell features as the scan goes on.
+    Each row of raster blocks is aggregated block by block in a thread pool (every
+    thread reads through its own provider clone). Partial aggregates are merged so that
+    cells straddling block borders combine their counts, sums and extremes, and cells
+    that no later block row can reach are yielded and dropped: only the cells along the
+    current seam stay in memory.
+    """
     if not raster_layer.isValid():
         raise ValueError("Invalid raster layer.")
 
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
-    crs = raster_layer.crs()
-    band_count = provider.bandCount()
+    reader = RasterBlockReader(raster_layer)
+    thread_data = threading.local()
 
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
-
-    qtm_ids = set()
-    total_pixels = width * height
-    processed_pixels = 0
-
-    for row in range(height):
-        for col in range(width):
+    def aggregate_tile(window):
+        block_reader = getattr(thread_data, 'reader', None)
+        if block_reader is None:
+            block_reader = thread_data.reader = reader.clone()
+        partial = CellAggregator(reader.band_count, stats)
+        if not aggregate_block(block_reader, partial, dggs_type, resolution, latlon_to_cell, *window):
+            return None
+        return partial
+
+    block_rows = {}
+    for window in reader.blocks():
+        block_rows.setdefault(window[0], []).append(window)
+    total_blocks = sum(len(windows) for windows in block_rows.values())
+
+    pending = CellAggregator(reader.band_count, stats)
+    pending_cells = {}  # cell key -> (cell_id, cell_geometry, attributes), None if the cell does not decode
+    done_blocks = 0
+    cell_count = 0
+    # Threads read the raster in place through provider clones. Only the GDAL block reads, the vectorized graticule
+    # encoders and the NumPy aggregation release the GIL, so tiled mode is limited to the
+    # DGGS that can_batch_encode accepts; per-pixel encoders would run one tile at a time.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for row_offset, windows in block_rows.items():
             if feedback and feedback.isCanceled():
-                return None
-
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            qtm_id = latlon2qtm(y, x, resolution)
-            qtm_ids.add(qtm_id)
-
-            processed_pixels += 1
-            if feedback and processed_pixels % 10000 == 0:
-                feedback.setProgress(int(100 * processed_pixels / total_pixels))
+                return
+            for partial in executor.map(aggregate_tile, windows):
+                if partial is not None:
+                    pending.merge(partial)
+            done_blocks += len(windows)
+
+            new_keys = [key for key in pending.cell_ids if key not in pending_cells]
+            if new_keys:
+                new_ids = aggregated_cell_ids(pending.subset([pending.cell_index[key] for key in new_keys]), dggs_type, resolution)
+                decoded = decode_raster_cells(dggs_type, new_ids)
+                for key, cell_id in zip(new_keys, new_ids):
+                    cell = decoded.get(cell_id)
+                    pending_cells[key] = (cell_id,) + cell if cell else None
+
+            # Pixel centres of the remaining rows all lie below this latitude
+            row_bottom = reader.extent.yMaximum() - (row_offset + windows[0][2]) * reader.pixel_size_y
+            last_row = row_offset + windows[0][2] >= reader.height
+            done = [
+                last_row or pending_cells[key] is None or pending_cells[key][1].boundingBox().yMinimum() >= row_bottom
+                for key in pending.cell_ids
+            ]
+            finished, pending = pending.split(done)
+            for key, band_values in zip(finished.cell_ids, finished.results().tolist()):
+                cell = pending_cells.pop(key)
+                if cell is None or all(np.isnan(value) for value in band_values):
+                    continue
+                cell_id, cell_geom, cell_attributes = cell
+                cell_count += 1
+                yield raster_cell_feature(cell_id, cell_geom, cell_attributes, band_values)
+
+            if feedback:
+                feedback.setProgress(int(100 * done_blocks / total_blocks))
 
     if feedback:
-        feedback.pushInfo(f"{len(qtm_ids)} pixels processed.")
-        feedback.setProgress(0)
-        feedback.pushInfo("Generating QTM DGGS...")
-
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "QTM Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
-
-    fields = QgsFields()
-    fields.append(QgsField("qtm", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    for i in range(band_count):
-        fields.append(QgsField(f"band_{i+1}", QVariant.Double))
-
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    for i, qtm_id in enumerate(qtm_ids):
-        if feedback and feedback.isCanceled():
-            return None
-        lat,lon = qtm.qtm_id_to_latlon(qtm_id)
-        center_point = QgsPointXY(lon, lat)
-
-        ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-            continue
-        
-        facet = qtm.qtm_id_to_facet(qtm_id)
-        cell_polygon = qtm.constructGeometry(facet)    
-        resolution = len(qtm_id)
-        num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area = geodesic_dggs_metrics(cell_polygon, num_edges)
-
-        qgs_polygon = QgsGeometry.fromPolygonXY(
-            [[QgsPointXY(lon, lat) for lon, lat in cell_polygon.exterior.coords]]
-        )
-
-        feature = QgsFeature()
-        feature.setGeometry(qgs_polygon)
-        attr_values = [
-            qtm_id,
-            resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-        ]
-        attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-        feature.setAttributes(attr_values)
-
-        mem_provider.addFeatures([feature])
+        feedback.pushInfo(f"{cell_count} cells processed.")
 
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(qtm_ids)))
 
-    if feedback:
-        feedback.setProgress(100)
-        feedback.pushInfo("QTM DGGS generation completed.")
+##########################
+# Resolution pyramid
+# ########################
+def rollup_pyramid(dggs_type, cell_ids, aggregator, resolutions, feedback=None):
+    """
+    Derive coarser levels by rolling the partial aggregates up to parent IDs, each level
+    from the next finer one. Returns (cell_ids, values) of all levels.
+    """
+    levels = [(cell_ids, aggregator)]
+    for parent_resolution in resolutions:
+        child_ids, children = levels[-1]
+        parent_ids = [DGGS_PARENTS[dggs_type](cell_id, parent_resolution) for cell_id in child_ids]
+        parents = children.rollup(parent_ids)
+        levels.append((parents.cell_ids, parents))
+        if feedback:
+            feedback.pushInfo(f"Resolution {parent_resolution}: {len(parents.cell_ids)} cells.")
+    cell_ids = [cell_id for level_ids, _ in levels for cell_id in level_ids]
+    values = np.concatenate([level.results() for _, level in levels])
+    return cell_ids, values
 
-    return mem_layer
 
-########################## 
-# OLC
+##########################
+# Homogeneous compaction
 # ########################
-def raster2olc(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
+def compact_homogeneous(dggs_type, cell_ids, values, resolution, tolerance=0, feedback=None):
+    """
+    Replace complete sets of children by their parent, level by level, while all
+    children hold the same band values (range within tolerance, same no-data bands).
+    The parent takes the children's mean. Returns mixed-resolution (cell_ids, values).
+    """
+    compact_ids, compact_values = [], []
+    level_ids, level_values = list(cell_ids), values
+    child_resolution = resolution
+    for parent_resolution in pyramid_resolutions(dggs_type, resolution, 0):
+        if not level_ids:
+            break
+        parent_ids = [DGGS_PARENTS[dggs_type](cell_id, parent_resolution) for cell_id in level_ids]
+        parents, inverse, counts = np.unique(parent_ids, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+
+        missing = np.isnan(level_values)
+        filled_min = np.where(missing, np.inf, level_values)
+        filled_max = np.where(missing, -np.inf, level_values)
+        mergeable = counts == np.array([
+            DGGS_CHILD_COUNTS[dggs_type](parent_id, child_resolution) for parent_id in parents.tolist()
+        ])
+        parent_values = np.empty((len(parents), level_values.shape[1]))
+        for band in range(level_values.shape[1]):
+            nodata = np.bincount(inverse, weights=missing[:, band], minlength=len(parents))
+            band_min = np.full(len(parents), np.inf)
+            band_max = np.full(len(parents), -np.inf)
+            np.minimum.at(band_min, inverse, filled_min[:, band])
+            np.maximum.at(band_max, inverse, filled_max[:, band])
+            with np.errstate(invalid='ignore'):
+                mergeable &= (nodata == counts) | ((nodata == 0) & (band_max - band_min <= tolerance))
+                parent_values[:, band] = np.bincount(inverse, weights=np.where(missing[:, band], 0., level_values[:, band]),
+                                                     minlength=len(parents)) / (counts - nodata)
+
+        kept = ~mergeable[inverse]
+        compact_ids.extend(cell_id for cell_id, keep in zip(level_ids, kept.tolist()) if keep)
+        compact_values.append(level_values[kept])
+        level_ids = [parent_id for parent_id, merge in zip(parents.tolist(), mergeable.tolist()) if merge]
+        level_values = parent_values[mergeable]
+        child_resolution = parent_resolution
+        if feedback:
+            feedback.pushInfo(f"Resolution {parent_resolution}: {len(level_ids)} parent cells merged.")
+
+    compact_ids.extend(level_ids)
+    compact_values.append(level_values)
+    return compact_ids, np.concatenate(compact_values)
+
+
+def raster_to_dggs(raster_layer: QgsRasterLayer, dggs_type, resolution, latlon_to_cell, cell_center, layer_name, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    """
+    Convert a raster to DGGS cells: every cell containing a pixel centre with data
+    is kept, skipping cells with no data in every band. Band values are the chosen statistic
+    (mean, min, max, sum, count, majority, std) over all pixels whose centre falls in
+    the cell, or with stats='centroid' the value of the pixel at the cell centre.
+    With min_resolution, the pixels are scanned once at resolution and the levels down
+    to min_resolution are added by rolling the aggregates up to parent cells.
+    With compact_tolerance, homogeneous children are merged into their parents.
+    With create_sink, features are written straight to the algorithm's sink.
+    """
     if not raster_layer.isValid():
         raise ValueError("Invalid raster layer.")
 
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
+    reader = RasterBlockReader(raster_layer)
+    band_count = reader.band_count
     crs = raster_layer.crs()
-    band_count = provider.bandCount()
-
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
 
-    olc_ids = set()
-    total_pixels = width * height
-    processed_pixels = 0
-
-    for row in range(height):
-        for col in range(width):
-            if feedback and feedback.isCanceled():
-                return None
-
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            olc_id = latlon2olc(y, x, resolution)
-            olc_ids.add(olc_id)
-
-            processed_pixels += 1
-            if feedback and processed_pixels % 10000 == 0:
-                feedback.setProgress(int(100 * processed_pixels / total_pixels))
+    if stats == 'centroid':
+        cell_ids = raster_cell_ids(reader, dggs_type, resolution, latlon_to_cell, feedback)
+        if cell_ids is None:
+            return None
+    else:
+        aggregator = raster_cell_statistics(reader, dggs_type, resolution, latlon_to_cell, stats, feedback)
+        if aggregator is None:
+            return None
+        cell_ids = aggregated_cell_ids(aggregator, dggs_type, resolution)
+        resolutions = pyramid_resolutions(dggs_type, resolution, min_resolution)
+        cell_ids, values = rollup_pyramid(dggs_type, cell_ids, aggregator, resolutions, feedback)
 
     if feedback:
-        feedback.pushInfo(f"{len(olc_ids)} pixels processed.")
+        feedback.pushInfo(f"{len(cell_ids)} cells processed.")
         feedback.setProgress(0)
-        feedback.pushInfo("Generating OLC DGGS...")
-
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "OLC Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
-
-    fields = QgsFields()
-    fields.append(QgsField("olc", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    for i in range(band_count):
-        fields.append(QgsField(f"band_{i+1}", QVariant.Double))
+        feedback.pushInfo(f"Generating {layer_name.replace(' Grid', '')} DGGS...")
+
+    if dggs_type in GRATICULE_DGGS:
+        cell_bounds = graticule_cells_to_bounds(dggs_type, cell_ids)
+
+    if stats == 'centroid':
+        # Cell centres, then band values at the centres from the provider blocks
+        if dggs_type in GRATICULE_DGGS:
+            cell_ids = [cell_id for cell_id in cell_ids if cell_id in cell_bounds]
+            center_lats = [(cell_bounds[cell_id][0][1] + cell_bounds[cell_id][0][3]) / 2 for cell_id in cell_ids]
+            center_lons = [(cell_bounds[cell_id][0][0] + cell_bounds[cell_id][0][2]) / 2 for cell_id in cell_ids]
+        else:
+            centers = [cell_center(cell_id) for cell_id in cell_ids]
+            center_lats = [lat for lat, _ in centers]
+            center_lons = [lon for _, lon in centers]
+
+        values = reader.sample(np.array(center_lats), np.array(center_lons), feedback)
+        if values is None:
+            return None
+    has_data = ~np.all(np.isnan(values), axis=1)
+
+    if compact_tolerance is not None:
+        total_cells = int(has_data.sum())
+        cell_ids, values = compact_homogeneous(dggs_type, [cell_id for cell_id, keep in zip(cell_ids, has_data.tolist()) if keep],
+                                               values[has_data], resolution, compact_tolerance, feedback)
+        has_data = np.ones(len(cell_ids), dtype=bool)
+        if dggs_type in GRATICULE_DGGS:
+            cell_bounds = graticule_cells_to_bounds(dggs_type, cell_ids)
+        if feedback:
+            feedback.pushInfo(f"Compacted {total_cells} cells to {len(cell_ids)} cells.")
 
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
+    writer, output = feature_output(raster_cell_fields(dggs_type, band_count), crs, layer_name, create_sink)
 
-    for i, olc_id in enumerate(olc_ids):
+    total_cells = len(cell_ids)
+    for i in np.flatnonzero(has_data).tolist():
         if feedback and feedback.isCanceled():
             return None
-        
-        lat,lon = olc.olc_to_latlon(olc_id)
-        center_point = QgsPointXY(lon, lat)
-
-        ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-            continue
-
-        coord = olc.decode(olc_id)    
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = coord.latitudeLo, coord.longitudeLo
-        max_lat, max_lon = coord.latitudeHi, coord.longitudeHi        
-        # Define the polygon based on the bounding box
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
-        
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-
-        qgs_polygon = QgsGeometry.fromPolygonXY(
-            [[QgsPointXY(lon, lat) for lon, lat in cell_polygon.exterior.coords]]
-        )
-
-        feature = QgsFeature()
-        feature.setGeometry(qgs_polygon)
-        attr_values = [
-            olc_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area
-        ]
-        attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-        feature.setAttributes(attr_values)
-
-        mem_provider.addFeatures([feature])
+        cell_id = cell_ids[i]
+        if dggs_type in GRATICULE_DGGS:
+            if cell_id not in cell_bounds:
+                continue
+            bounds, cell_attributes = cell_bounds[cell_id]
+            cell_geom = bounds_to_qgsgeometry(*bounds)
+        else:
+            cell = get_cell(dggs_type, cell_id)
+            if not cell:
+                continue
+            _, cell_geom, cell_attributes = cell
 
+        feature = raster_cell_feature(cell_id, cell_geom, cell_attributes, values[i].tolist())
+        writer.addFeature(feature)
         if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(olc_ids)))
+            feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
-        feedback.pushInfo("OLC DGGS generation completed.")
+        feedback.pushInfo(f"{layer_name.replace(' Grid', '')} DGGS generation completed.")
 
-    return mem_layer
+    writer.flush()
+    return output
 
 
-########################## 
-# Geohash
+##########################
+# Cell raster output
 # ########################
-def raster2geohash(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
+def can_write_cell_raster(dggs_type, resolution):
+    return dggs_type in GRATICULE_KEY_GRIDS and can_batch_encode(dggs_type, resolution)
+
+def raster_to_cell_raster(raster_layer: QgsRasterLayer, dggs_type, resolution, output_path, stats='mean', index_band=False, feedback=None):
+    """
+    Write the per-cell statistics of a graticule DGGS (OLC, Geohash, Tilecode, Quadkey)
+    as a GeoTIFF aligned to the DGGS grid at this resolution, one pixel per cell and one
+    band per input band, without building vector features. With index_band, a last band
+    holds the integer cell key (exact in Float64 up to 2^53).
+    """
     if not raster_layer.isValid():
         raise ValueError("Invalid raster layer.")
+    if not can_write_cell_raster(dggs_type, resolution):
+        raise ValueError(f"Cell raster output is not supported for {dggs_type} at resolution {resolution}.")
 
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
-    crs = raster_layer.crs()
-    band_count = provider.bandCount()
-
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
-
-    geohash_ids = set()
-    total_pixels = width * height
-    processed_pixels = 0
-
-    for row in range(height):
-        for col in range(width):
-            if feedback and feedback.isCanceled():
-                return None
-
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            geohash_id = latlon2geohash(y, x, resolution)
-            geohash_ids.add(geohash_id)
-
-            processed_pixels += 1
-            if feedback and processed_pixels % 10000 == 0:
-                feedback.setProgress(int(100 * processed_pixels / total_pixels))
-
+    reader = RasterBlockReader(raster_layer)
+    aggregator = raster_cell_statistics(reader, dggs_type, resolution, None, stats, feedback)
+    if aggregator is None:
+        return None
+    if not aggregator.cell_ids:
+        raise ValueError("The raster has no pixels with data.")
+    keys = np.array(aggregator.cell_ids, dtype=np.int64)
+    values = aggregator.results()
+
+    grid, key_grid = GRATICULE_KEY_GRIDS[dggs_type]
+    crs, west, north, cell_width, cell_height, _, _ = grid(resolution)
+    columns, rows = key_grid(keys, resolution)
+    column_offset, row_offset = int(columns.min()), int(rows.min())
+    width, height = int(columns.max()) - column_offset + 1, int(rows.max()) - row_offset + 1
     if feedback:
-        feedback.pushInfo(f"{len(geohash_ids)} pixels processed.")
-        feedback.setProgress(0)
-        feedback.pushInfo("Generating Geohash DGGS...")
-
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "Geohash Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
-
-    fields = QgsFields()
-    fields.append(QgsField("geohash", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    for i in range(band_count):
-        fields.append(QgsField(f"band_{i+1}", QVariant.Double))
-
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    for i, geohash_id in enumerate(geohash_ids):
-        if feedback and feedback.isCanceled():
-            return None
-        lat,lon = geohash.decode(geohash_id)
-        center_point = QgsPointXY(lon, lat)
-
-        ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-            continue
-        
-        bbox =  geohash.bbox(geohash_id)
-        min_lat, min_lon = bbox['s'], bbox['w']  # Southwest corner
-        max_lat, max_lon = bbox['n'], bbox['e']  # Northeast corner        
-
-        # Define the polygon based on the bounding box
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])
-        
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-
-        qgs_polygon = QgsGeometry.fromPolygonXY(
-            [[QgsPointXY(lon, lat) for lon, lat in cell_polygon.exterior.coords]]
-        )
-
-        feature = QgsFeature()
-        feature.setGeometry(qgs_polygon)
-        attr_values = [
-            geohash_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area
-        ]
-        attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-        feature.setAttributes(attr_values)
-
-        mem_provider.addFeatures([feature])
-
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(geohash_ids)))
+        feedback.pushInfo(f"Writing {len(keys)} cells to a {width} x {height} cell raster ({crs})...")
+
+    band_count = values.shape[1]
+    dataset = gdal.GetDriverByName('GTiff').Create(
+        output_path, width, height, band_count + (1 if index_band else 0), gdal.GDT_Float64,
+        ['COMPRESS=DEFLATE', 'TILED=YES', 'BIGTIFF=IF_SAFER']
+    )
+    dataset.SetGeoTransform((west + column_offset * cell_width, cell_width, 0, north - row_offset * cell_height, 0, -cell_height))
+    srs = osr.SpatialReference()
+    srs.SetFromUserInput(crs)
+    dataset.SetProjection(srs.ExportToWkt())
+    for band in range(dataset.RasterCount):
+        band_values = np.full((height, width), np.nan)
+        band_values[rows - row_offset, columns - column_offset] = values[:, band] if band < band_count else keys
+        raster_band = dataset.GetRasterBand(band + 1)
+        raster_band.SetNoDataValue(float('nan'))
+        raster_band.SetDescription(f"band_{band + 1}" if band < band_count else f"{dggs_type}_key")
+        raster_band.WriteArray(band_values)
+    dataset.FlushCache()
+    dataset = None
 
     if feedback:
         feedback.setProgress(100)
-        feedback.pushInfo("geohash DGGS generation completed.")
+    return output_path
 
-    return mem_layer
 
-########################## 
-# Tilecode
+##########################
+# H3
 # ########################
-def raster2tilecode(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
-    if not raster_layer.isValid():
-        raise ValueError("Invalid raster layer.")
-
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
-    crs = raster_layer.crs()
-    band_count = provider.bandCount()
-
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
+def h3_cell_center(h3_id):
+    return h3.cell_to_latlng(h3_id)
 
-    tilecode_ids = set()
-    total_pixels = width * height
-    processed_pixels = 0
+def raster2h3(raster_layer: QgsRasterLayer, resolution: int, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 'h3', resolution, h3.latlng_to_cell, h3_cell_center, "H3 Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-    for row in range(height):
-        for col in range(width):
-            if feedback and feedback.isCanceled():
-                return None
+##########################
+# S2
+# ########################
+def s2_cell_center(s2_token):
+    s2_cell = s2.Cell(s2.CellId.from_token(s2_token))
+    centroid_latlng = s2.LatLng.from_point(s2_cell.get_center())
+    return centroid_latlng.lat().degrees, centroid_latlng.lng().degrees
 
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            tilecode_id = latlon2tilecode(y, x, resolution)
-            tilecode_ids.add(tilecode_id)
+def raster2s2(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 's2', resolution, latlon2s2, s2_cell_center, "S2 Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-            processed_pixels += 1
-            if feedback and processed_pixels % 10000 == 0:
-                feedback.setProgress(int(100 * processed_pixels / total_pixels))
+##########################
+# rHEALpix
+# ########################
+rhealpix_dggs = RHEALPixDGGS(ellipsoid=E, north_square=1, south_square=3, N_side=3)
 
-    if feedback:
-        feedback.pushInfo(f"{len(tilecode_ids)} pixels processed.")
-        feedback.setProgress(0)
-        feedback.pushInfo("Generating Tilecode DGGS...")
+def rhealpix_cell_center(rhealpix_id):
+    rhealpix_uids = (rhealpix_id[0],) + tuple(map(int, rhealpix_id[1:]))
+    lon, lat = rhealpix_dggs.cell(rhealpix_uids).centroid(plane=False)
+    return lat, lon
 
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "tilecode Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
+def raster2rhealpix(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 'rhealpix', resolution, latlon2rhealpix, rhealpix_cell_center, "rHEALpix Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-    fields = QgsFields()
-    fields.append(QgsField("tilecode", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    for i in range(band_count):
-        fields.append(QgsField(f"band_{i+1}", QVariant.Double))
+##########################
+# ISEA4T
+# ########################
+def isea4t_cell_center(isea4t_id):
+    lat_long_point = isea4t_dggs.convert_dggs_cell_to_point(DggsCell(isea4t_id))
+    return lat_long_point._latitude, lat_long_point._longitude
 
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
+def raster2isea4t(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    if (platform.system() == 'Windows'):
+        return raster_to_dggs(raster_layer, 'isea4t', resolution, latlon2isea4t, isea4t_cell_center, "isea4t Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-    for i, tilecode_id in enumerate(tilecode_ids):
-        if feedback and feedback.isCanceled():
-            return None
-        lat,lon = tilecode.tilecode2latlon(tilecode_id)
-        center_point = QgsPointXY(lon, lat)
-
-        ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-            continue
-        
-        match = re.match(r'z(\d+)x(\d+)y(\d+)', tilecode_id)
-        z = int(match.group(1))
-        x = int(match.group(2))
-        y = int(match.group(3))
-
-        bounds = mercantile.bounds(x, y, z)    
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])        
-
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-
-        qgs_polygon = QgsGeometry.fromPolygonXY(
-            [[QgsPointXY(lon, lat) for lon, lat in cell_polygon.exterior.coords]]
-        )
-
-        feature = QgsFeature()
-        feature.setGeometry(qgs_polygon)
-        attr_values = [
-            tilecode_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area
-        ]
-        attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-        feature.setAttributes(attr_values)
-
-        mem_provider.addFeatures([feature])
+##########################
+# QTM
+# ########################
+def raster2qtm(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 'qtm', resolution, latlon2qtm, qtm.qtm_id_to_latlon, "QTM Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(tilecode_ids)))
+##########################
+# OLC
+# ########################
+def raster2olc(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 'olc', resolution, latlon2olc, None, "OLC Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-    if feedback:
-        feedback.setProgress(100)
-        feedback.pushInfo("Tilecode DGGS generation completed.")
+##########################
+# Geohash
+# ########################
+def raster2geohash(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 'geohash', resolution, latlon2geohash, None, "Geohash Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-    return mem_layer
+##########################
+# Tilecode
+# ########################
+def raster2tilecode(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 'tilecode', resolution, latlon2tilecode, None, "tilecode Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
 
-########################## 
+##########################
 # Quadkey
 # ########################
-def raster2quadkey(raster_layer: QgsRasterLayer, resolution, feedback=None) -> QgsVectorLayer:
-    if not raster_layer.isValid():
-        raise ValueError("Invalid raster layer.")
-
-    provider = raster_layer.dataProvider()
-    extent = raster_layer.extent()
-    width, height = raster_layer.width(), raster_layer.height()
-    crs = raster_layer.crs()
-    band_count = provider.bandCount()
-
-    pixel_size_x = extent.width() / width
-    pixel_size_y = extent.height() / height
-
-    quadkey_ids = set()
-    total_pixels = width * height
-    processed_pixels = 0
-
-    for row in range(height):
-        for col in range(width):
-            if feedback and feedback.isCanceled():
-                return None
-
-            x = extent.xMinimum() + col * pixel_size_x
-            y = extent.yMaximum() - row * pixel_size_y
-            quadkey_id = latlon2quadkey(y, x, resolution)
-            quadkey_ids.add(quadkey_id)
-
-            processed_pixels += 1
-            if feedback and processed_pixels % 10000 == 0:
-                feedback.setProgress(int(100 * processed_pixels / total_pixels))
-
-    if feedback:
-        feedback.pushInfo(f"{len(quadkey_ids)} pixels processed.")
-        feedback.setProgress(0)
-        feedback.pushInfo("Generating Quadkey DGGS...")
-
-    mem_layer = QgsVectorLayer(f"Polygon?crs={crs.authid()}", "Quadkey Grid", "memory")
-    mem_provider = mem_layer.dataProvider()
-
-    fields = QgsFields()
-    fields.append(QgsField("quadkey", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    for i in range(band_count):
-        fields.append(QgsField(f"band_{i+1}", QVariant.Double))
-
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
-
-    for i, quadkey_id in enumerate(quadkey_ids):
-        if feedback and feedback.isCanceled():
-            return None
-        lat,lon = tilecode.quadkey2latlon(quadkey_id)
-        center_point = QgsPointXY(lon, lat)
-
-        ident = provider.identify(center_point, QgsRaster.IdentifyFormatValue)
-        if not ident.isValid():
-            continue
-
-        results = ident.results()
-        if all(results.get(i + 1) is None or math.isnan(results.get(i + 1, float("nan"))) for i in range(band_count)):
-            continue
-        
-        tile = mercantile.quadkey_to_tile(quadkey_id)    
-        # Format as tilecode_id
-        z = tile.z
-        x = tile.x
-        y = tile.y
-        
-        bounds = mercantile.bounds(x, y, z)    
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-        cell_polygon = Polygon([
-            [min_lon, min_lat],  # Bottom-left corner
-            [max_lon, min_lat],  # Bottom-right corner
-            [max_lon, max_lat],  # Top-right corner
-            [min_lon, max_lat],  # Top-left corner
-            [min_lon, min_lat]   # Closing the polygon (same as the first point)
-        ])        
-
-        center_lat, center_lon, cell_width, cell_height, cell_area = graticule_dggs_metrics(cell_polygon)
-
-        qgs_polygon = QgsGeometry.fromPolygonXY(
-            [[QgsPointXY(lon, lat) for lon, lat in cell_polygon.exterior.coords]]
-        )
-
-        feature = QgsFeature()
-        feature.setGeometry(qgs_polygon)
-        attr_values = [
-            quadkey_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area
-        ]
-        attr_values.extend(results.get(i + 1, None) for i in range(band_count))
-        feature.setAttributes(attr_values)
-
-        mem_provider.addFeatures([feature])
-
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / len(quadkey_ids)))
-
-    if feedback:
-        feedback.setProgress(100)
-        feedback.pushInfo("Quadkey DGGS generation completed.")
-
-    return mem_layer
-
+def raster2quadkey(raster_layer: QgsRasterLayer, resolution, feedback=None, stats='mean', min_resolution=None, compact_tolerance=None, create_sink=None) -> QgsVectorLayer:
+    return raster_to_dggs(raster_layer, 'quadkey', resolution, latlon2quadkey, None, "Quadkey Grid", feedback, stats, min_resolution, compact_tolerance, create_sink)
+
+
+# Point encoders for the tiled conversion (raster_tiled_features)
+RASTER_LATLON_TO_CELL = {
+    'h3': h3.latlng_to_cell,
+    's2': latlon2s2,
+    'rhealpix': latlon2rhealpix,
+    'qtm': latlon2qtm,
+    'olc': latlon2olc,
+    'geohash': latlon2geohash,
+    'tilecode': latlon2tilecode,
+    'quadkey': latlon2quadkey
+}
+if (platform.system() == 'Windows'):
+    RASTER_LATLON_TO_CELL['isea4t'] = latlon2isea4t
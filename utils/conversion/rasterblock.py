@@ -0,0 +1,309 @@
+import copy
+import numpy as np
+from qgis.core import Qgis, QgsRectangle
+
+RASTER_BLOCK_SIZE = 512         # pixels per side of a provider block
+RASTER_STRIP_PIXELS = 1 << 20   # pixels per strip when scanning pixel centres
+
+RASTER_DTYPES = {
+    Qgis.Byte: np.uint8,
+    Qgis.UInt16: np.uint16,
+    Qgis.Int16: np.int16,
+    Qgis.UInt32: np.uint32,
+    Qgis.Int32: np.int32,
+    Qgis.Float32: np.float32,
+    Qgis.Float64: np.float64
+}
+if hasattr(Qgis, 'Int8'):  # QGIS >= 3.30
+    RASTER_DTYPES[Qgis.Int8] = np.int8
+
+
+def block_to_array(block):
+    """QgsRasterBlock -> float64 NumPy array (rows, cols), NaN where the block has no data."""
+    rows, cols = block.height(), block.width()
+    dtype = RASTER_DTYPES.get(block.dataType())
+    if dtype is not None:
+        values = np.frombuffer(bytes(block.data()), dtype=dtype, count=rows * cols).reshape(rows, cols).astype(np.float64)
+    else:
+        # Types without a NumPy equivalent (complex, ARGB) go through value()
+        values = np.array([[block.value(row, col) for col in range(cols)] for row in range(rows)], dtype=np.float64)
+    if block.hasNoDataValue():
+        values[values == block.noDataValue()] = np.nan
+    return values
+
+
+class RasterBlockReader:
+    """
+    Reads a raster layer through its data provider in pixel-aligned blocks,
+    as NumPy arrays of shape (band_count, rows, cols) with NaN for no data.
+    """
+    def __init__(self, raster_layer, block_size=RASTER_BLOCK_SIZE):
+        self.provider = raster_layer.dataProvider()
+        self.extent = raster_layer.extent()
+        self.width, self.height = raster_layer.width(), raster_layer.height()
+        self.band_count = self.provider.bandCount()
+        self.pixel_size_x = self.extent.width() / self.width
+        self.pixel_size_y = self.extent.height() / self.height
+        self.block_size = block_size
+        # User-defined no data ranges are flagged by the provider but not written into the block values
+        self.user_nodata = [self.provider.userNoDataValues(band + 1) for band in range(self.band_count)]
+
+    def clone(self):
+        """Reader over a clone of the data provider, for use from another thread."""
+        reader = copy.copy(self)
+        reader.provider = self.provider.clone()
+        return reader
+
+    def strips(self):
+        # (row_offset, rows) strips of full raster width
+        strip_rows = max(1, min(self.height, RASTER_STRIP_PIXELS // max(self.width, 1)))
+        for row_offset in range(0, self.height, strip_rows):
+            yield row_offset, min(strip_rows, self.height - row_offset)
+
+    def blocks(self):
+        # (row_offset, col_offset, rows, cols) tiles covering the raster
+        for row_offset in range(0, self.height, self.block_size):
+            for col_offset in range(0, self.width, self.block_size):
+                yield row_offset, col_offset, min(self.block_size, self.height - row_offset), min(self.block_size, self.width - col_offset)
+
+    def pixel_centers(self, row_offset, col_offset, rows, cols):
+        """1D arrays of pixel-centre longitudes (cols) and latitudes (rows) of a window."""
+        lons = self.extent.xMinimum() + (np.arange(col_offset, col_offset + cols) + 0.5) * self.pixel_size_x
+        lats = self.extent.yMaximum() - (np.arange(row_offset, row_offset + rows) + 0.5) * self.pixel_size_y
+        return lons, lats
+
+    def read(self, row_offset, col_offset, rows, cols):
+        x_min = self.extent.xMinimum() + col_offset * self.pixel_size_x
+        y_max = self.extent.yMaximum() - row_offset * self.pixel_size_y
+        block_extent = QgsRectangle(x_min, y_max - rows * self.pixel_size_y, x_min + cols * self.pixel_size_x, y_max)
+        values = np.empty((self.band_count, rows, cols), dtype=np.float64)
+        for band in range(self.band_count):
+            values[band] = block_to_array(self.provider.block(band + 1, block_extent, cols, rows))
+            for nodata_range in self.user_nodata[band]:
+                values[band][(values[band] >= nodata_range.min()) & (values[band] <= nodata_range.max())] = np.nan
+        return values
+
+    def read_valid(self, row_offset, col_offset, rows, cols):
+        """
+        Values of a window flattened to (band_count, rows * cols) and a mask of the pixels
+        with data in at least one band, or None when the whole window is no data.
+        """
+        values = self.read(row_offset, col_offset, rows, cols).reshape(self.band_count, -1)
+        valid = ~np.all(np.isnan(values), axis=0)
+        if not valid.any():
+            return None
+        return values, valid
+
+    def pixel_index(self, lats, lons):
+        """Row/column of the pixels containing each point, -1 outside the raster."""
+        cols = np.floor((np.asarray(lons) - self.extent.xMinimum()) / self.pixel_size_x).astype(np.int64)
+        rows = np.floor((self.extent.yMaximum() - np.asarray(lats)) / self.pixel_size_y).astype(np.int64)
+        outside = (cols < 0) | (cols >= self.width) | (rows < 0) | (rows >= self.height)
+        cols[outside] = -1
+        rows[outside] = -1
+        return rows, cols
+
+    def sample(self, lats, lons, feedback=None):
+        """
+        Band values at each point, shape (n, band_count), NaN outside the raster or on no data.
+        Points are grouped by block so that every block is read once.
+        """
+        rows, cols = self.pixel_index(lats, lons)
+        values = np.full((len(rows), self.band_count), np.nan)
+        inside = np.flatnonzero(rows >= 0)
+        if not len(inside):
+            return values
+
+        block_ids = (rows[inside] // self.block_size) * ((self.width + self.block_size - 1) // self.block_size) + cols[inside] // self.block_size
+        order = np.argsort(block_ids, kind='stable')
+        inside, block_ids = inside[order], block_ids[order]
+        starts = np.flatnonzero(np.r_[True, block_ids[1:] != block_ids[:-1]])
+        ends = np.r_[starts[1:], len(block_ids)]
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            if feedback and feedback.isCanceled():
+                return None
+            points = inside[start:end]
+            row_offset = rows[points[0]] // self.block_size * self.block_size
+            col_offset = cols[points[0]] // self.block_size * self.block_size
+            block = self.read(row_offset, col_offset,
+                              min(self.block_size, self.height - row_offset), min(self.block_size, self.width - col_offset))
+            values[points] = block[:, rows[points] - row_offset, cols[points] - col_offset].T
+            if feedback:
+                feedback.setProgress(int(100 * (i + 1) / len(starts)))
+        return values
+
+
+##########################
+# Per-cell aggregation
+# ########################
+RASTER_STATISTICS = ['mean', 'min', 'max', 'sum', 'count', 'majority', 'std', 'centroid']
+
+class CellAggregator:
+    """
+    Streaming group-by of pixel values over cell IDs.
+    Blocks are added one at a time; per-cell running counts, sums, extremes and
+    value frequencies are kept per band, so the raster is never held in memory.
+    Cells are numbered in order of first appearance (see cell_ids).
+    """
+    def __init__(self, band_count, stats='mean'):
+        self.band_count = band_count
+        self.stats = stats
+        self.cell_ids = []
+        self.cell_index = {}
+        self.count = np.zeros((band_count, 0))
+        self.sum = np.zeros((band_count, 0))
+        self.sum_sq = np.zeros((band_count, 0))
+        self.min = np.zeros((band_count, 0))
+        self.max = np.zeros((band_count, 0))
+        self.frequencies = [{} for _ in range(band_count)]
+
+    def grow(self):
+        extra = len(self.cell_ids) - self.count.shape[1]
+        if extra <= 0:
+            return
+        pad = lambda array, fill: np.concatenate([array, np.full((self.band_count, extra), fill)], axis=1)
+        self.count = pad(self.count, 0.)
+        self.sum = pad(self.sum, 0.)
+        self.sum_sq = pad(self.sum_sq, 0.)
+        self.min = pad(self.min, np.inf)
+        self.max = pad(self.max, -np.inf)
+
+    def index(self, cells):
+        """Global cell numbers for an array (or list) of cell keys, one entry per pixel."""
+        local_cells, inverse = np.unique(np.asarray(cells), return_inverse=True)
+        local_index = np.empty(len(local_cells), dtype=np.int64)
+        for i, cell in enumerate(local_cells.tolist()):
+            index = self.cell_index.get(cell)
+            if index is None:
+                index = self.cell_index[cell] = len(self.cell_ids)
+                self.cell_ids.append(cell)
+            local_index[i] = index
+        self.grow()
+        return local_index[inverse.ravel()]
+
+    def merge(self, other):
+        """Combine the partial aggregates of another aggregator, e.g. of a neighbouring tile."""
+        if not other.cell_ids:
+            return
+        cells = self.index(other.cell_ids)
+        self.count[:, cells] += other.count
+        self.sum[:, cells] += other.sum
+        self.sum_sq[:, cells] += other.sum_sq
+        self.min[:, cells] = np.minimum(self.min[:, cells], other.min)
+        self.max[:, cells] = np.maximum(self.max[:, cells], other.max)
+        cells = cells.tolist()
+        for frequencies, other_frequencies in zip(self.frequencies, other.frequencies):
+            for (cell, value), frequency in other_frequencies.items():
+                key = (cells[cell], value)
+                frequencies[key] = frequencies.get(key, 0) + frequency
+
+    def subset(self, cells):
+        """New aggregator holding only the given cell numbers, renumbered in that order."""
+        cells = np.asarray(cells, dtype=np.int64)
+        subset = CellAggregator(self.band_count, self.stats)
+        subset.cell_ids = [self.cell_ids[cell] for cell in cells.tolist()]
+        subset.cell_index = {cell_id: i for i, cell_id in enumerate(subset.cell_ids)}
+        subset.count = self.count[:, cells]
+        subset.sum = self.sum[:, cells]
+        subset.sum_sq = self.sum_sq[:, cells]
+        subset.min = self.min[:, cells]
+        subset.max = self.max[:, cells]
+        if self.stats == 'majority':
+            renumber = {cell: i for i, cell in enumerate(cells.tolist())}
+            subset.frequencies = [
+                {(renumber[cell], value): frequency for (cell, value), frequency in frequencies.items() if cell in renumber}
+                for frequencies in self.frequencies
+            ]
+        return subset
+
+    def split(self, done):
+        """(finished, pending) aggregators from a boolean mask over the cell numbers."""
+        done = np.asarray(done, dtype=bool)
+        return self.subset(np.flatnonzero(done)), self.subset(np.flatnonzero(~done))
+
+    def rollup(self, parent_ids):
+        """
+        New aggregator over parent cells, parent_ids giving the parent of each cell in order.
+        Counts, sums and frequencies add up and extremes combine, so the result equals a
+        direct aggregation of the pixels at the parent resolution.
+        """
+        parents = CellAggregator(self.band_count, self.stats)
+        cells = parents.index(parent_ids)
+        for band in range(self.band_count):
+            np.add.at(parents.count[band], cells, self.count[band])
+            np.add.at(parents.sum[band], cells, self.sum[band])
+            np.add.at(parents.sum_sq[band], cells, self.sum_sq[band])
+            np.minimum.at(parents.min[band], cells, self.min[band])
+            np.maximum.at(parents.max[band], cells, self.max[band])
+        cells = cells.tolist()
+        for frequencies, child_frequencies in zip(parents.frequencies, self.frequencies):
+            for (cell, value), frequency in child_frequencies.items():
+                key = (cells[cell], value)
+                frequencies[key] = frequencies.get(key, 0) + frequency
+        return parents
+
+    def add(self, cells, values):
+        """cells: (k,) cell numbers from index(); values: (band_count, k) pixel values, NaN for no data."""
+        n = len(self.cell_ids)
+        for band in range(self.band_count):
+            band_values = values[band]
+            valid = ~np.isnan(band_values)
+            band_cells, band_values = cells[valid], band_values[valid]
+            if not len(band_cells):
+                continue
+            self.count[band] += np.bincount(band_cells, minlength=n)
+            if self.stats in ('mean', 'sum', 'std'):
+                self.sum[band] += np.bincount(band_cells, weights=band_values, minlength=n)
+            if self.stats == 'std':
+                self.sum_sq[band] += np.bincount(band_cells, weights=band_values * band_values, minlength=n)
+            if self.stats in ('min', 'max'):
+                # Sort by cell then value: the first/last entry of each run is the block min/max
+                order = np.lexsort((band_values, band_cells))
+                sorted_cells, sorted_values = band_cells[order], band_values[order]
+                starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+                run_cells = sorted_cells[starts]
+                if self.stats == 'min':
+                    self.min[band, run_cells] = np.minimum(self.min[band, run_cells], sorted_values[starts])
+                else:
+                    ends = np.r_[starts[1:], len(sorted_cells)] - 1
+                    self.max[band, run_cells] = np.maximum(self.max[band, run_cells], sorted_values[ends])
+            if self.stats == 'majority':
+                pairs, pair_counts = np.unique(np.column_stack([band_cells, band_values]), axis=0, return_counts=True)
+                frequencies = self.frequencies[band]
+                for (cell, value), pair_count in zip(pairs.tolist(), pair_counts.tolist()):
+                    key = (int(cell), value)
+                    frequencies[key] = frequencies.get(key, 0) + pair_count
+
+    def results(self):
+        """(n_cells, band_count) array of the statistic, NaN for cells without data in a band."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.stats == 'count':
+                values = self.count.copy()
+            elif self.stats == 'sum':
+                values = np.where(self.count > 0, self.sum, np.nan)
+            elif self.stats == 'mean':
+                values = self.sum / self.count
+            elif self.stats == 'std':
+                # Sample standard deviation, 0 for single-pixel cells
+                mean = self.sum / self.count
+                variance = (self.sum_sq - self.count * mean * mean) / (self.count - 1)
+                values = np.where(self.count > 1, np.sqrt(np.clip(variance, 0, None)), 0.)
+                values[self.count == 0] = np.nan
+            elif self.stats == 'min':
+                values = np.where(self.count > 0, self.min, np.nan)
+            elif self.stats == 'max':
+                values = np.where(self.count > 0, self.max, np.nan)
+            elif self.stats == 'majority':
+                values = np.full(self.count.shape, np.nan)
+                for band, frequencies in enumerate(self.frequencies):
+                    best = {}
+                    for (cell, value), frequency in frequencies.items():
+                        current = best.get(cell)
+                        # Most frequent value, ties go to the smallest value
+                        if current is None or frequency > current[0] or (frequency == current[0] and value < current[1]):
+                            best[cell] = (frequency, value)
+                    for cell, (_, value) in best.items():
+                        values[band, cell] = value
+            else:
+                raise ValueError(f"Unsupported statistic: {self.stats}")
+        return values.T
@@ -0,0 +1,221 @@
+import bisect, platform
+from collections import Counter
+import h3
+from pyproj import Geod
+from vgrid.utils import s2, olc
+from vgrid.stats.s2stats import s2_metrics
+from vgrid.stats.rhealpixstats import rhealpix_metrics
+from vgrid.stats.qtmstats import qtm_metrics
+from vgrid.stats.olcstats import olc_metrics
+from vgrid.stats.geohashstats import geohash_metrics
+from vgrid.stats.tilecodestats import tilecode_metrics
+from vgrid.stats.quadkeystats import quadkey_metrics
+if (platform.system() == 'Windows'):
+    from vgrid.utils.eaggr.eaggr import Eaggr
+    from vgrid.utils.eaggr.enums.model import Model
+    from vgrid.stats.isea4tstats import isea4t_metrics
+
+from .featurereader import read_column
+from .conversion.dggsbatch import parse_tilecode
+
+geod = Geod(ellps="WGS84")
+
+RESOLUTION_SAMPLE_SIZE = 1000
+OLC_RESOLUTIONS = (2, 4, 6, 8, 10, 11, 12)
+
+##########################
+# Per-resolution metrics
+# ########################
+class ResolutionMetrics:
+    """
+    Average cell area (m2) and edge length (m) per resolution of one DGGS. Tables are
+    filled once when built, or per resolution on first use when lazy (for DGGS whose
+    metrics need the DGGS library to build a cell, like ISEA4T).
+    """
+    def __init__(self, resolutions, metrics, lazy=False):
+        self.resolutions = list(resolutions)
+        self._metrics = metrics
+        self._table = {}
+        if not lazy:
+            for resolution in self.resolutions:
+                self.metrics(resolution)
+
+    def metrics(self, resolution):
+        """(avg_area, avg_edge_length) at resolution."""
+        if resolution not in self._table:
+            self._table[resolution] = self._metrics(resolution)
+        return self._table[resolution]
+
+    def area(self, resolution):
+        return self.metrics(resolution)[0]
+
+    def edge_length(self, resolution):
+        return self.metrics(resolution)[1]
+
+    def nearest(self, area, min_resolution=None, max_resolution=None):
+        """Resolution whose average cell area is closest to area, within the given bounds."""
+        candidates = [
+            resolution for resolution in self.resolutions
+            if (min_resolution is None or resolution >= min_resolution) and (max_resolution is None or resolution <= max_resolution)
+        ]
+        if not candidates:
+            return None
+        # Areas shrink as the resolution grows: bisect on negated areas, computing only the probed ones
+        index = bisect.bisect_left(_NegatedAreas(self, candidates), -area)
+        neighbours = candidates[max(index - 1, 0):index + 1]
+        return min(neighbours, key=lambda resolution: abs(self.area(resolution) - area))
+
+
+class _NegatedAreas:
+    def __init__(self, metrics, resolutions):
+        self.metrics = metrics
+        self.resolutions = resolutions
+
+    def __len__(self):
+        return len(self.resolutions)
+
+    def __getitem__(self, index):
+        return -self.metrics.area(self.resolutions[index])
+
+
+def area_edge(metrics):
+    # vgrid *_metrics return (num_cells, avg_edge_length, avg_area)
+    return lambda resolution: (metrics(resolution)[2], metrics(resolution)[1])
+
+def h3_area_edge(resolution):
+    return h3.average_hexagon_area(resolution, unit='m^2'), h3.average_hexagon_edge_length(resolution, unit='m')
+
+_isea4t_dggs = []
+
+def isea4t_area_edge(resolution):
+    if not _isea4t_dggs:
+        _isea4t_dggs.append(Eaggr(Model.ISEA4T))
+    _, avg_edge_length, avg_area, _ = isea4t_metrics(_isea4t_dggs[0], resolution)
+    return avg_area, avg_edge_length
+
+DGGS_METRICS = {
+    'h3': ResolutionMetrics(range(16), h3_area_edge),
+    's2': ResolutionMetrics(range(31), area_edge(s2_metrics)),
+    'rhealpix': ResolutionMetrics(range(16), area_edge(rhealpix_metrics)),
+    'qtm': ResolutionMetrics(range(1, 25), area_edge(qtm_metrics)),
+    'olc': ResolutionMetrics([2, 4, 6, 8, 10, 11, 12, 13, 14, 15], area_edge(olc_metrics)),
+    'geohash': ResolutionMetrics(range(1, 11), area_edge(geohash_metrics)),
+    'tilecode': ResolutionMetrics(range(30), area_edge(tilecode_metrics)),
+    'quadkey': ResolutionMetrics(range(30), area_edge(quadkey_metrics))
+}
+if (platform.system() == 'Windows'):
+    DGGS_METRICS['isea4t'] = ResolutionMetrics(range(26), isea4t_area_edge, lazy=True)
+
+def dggs_metrics(dggs_type):
+    if dggs_type not in DGGS_METRICS:
+        raise ValueError(f"Unsupported DGGS type: {dggs_type}")
+    return DGGS_METRICS[dggs_type]
+
+
+##########################
+# Source resolution
+# ########################
+DGGS_RESOLUTIONS = {
+    'h3': h3.get_resolution,
+    's2': lambda s2_token: s2.CellId.from_token(s2_token).level(),
+    'rhealpix': lambda rhealpix_id: len(rhealpix_id) - 1,
+    'isea4t': lambda isea4t_id: len(isea4t_id) - 2,
+    'qtm': len,
+    'olc': lambda olc_id: olc.decode(olc_id).codeLength,
+    'geohash': len,
+    'tilecode': lambda tilecode_id: parse_tilecode(tilecode_id)[0],
+    'quadkey': len
+}
+
+def detect_resolution(layer, dggs_type, field_name, sample_size=RESOLUTION_SAMPLE_SIZE, feedback=None):
+    """
+    Most common resolution among the first sample_size cell IDs of a layer (None when
+    there are none); mixed resolutions are reported through feedback.
+    """
+    resolve = DGGS_RESOLUTIONS[dggs_type]
+    counts = Counter(resolve(cell_id) for cell_id in read_column(layer, field_name, sample_size))
+    if not counts:
+        return None
+    resolution = counts.most_common(1)[0][0]
+    if feedback and len(counts) > 1:
+        feedback.pushInfo(f"Mixed {dggs_type} resolutions {min(counts)}-{max(counts)} in the sampled cells; using {resolution}.")
+    return resolution
+
+def pixel_area(lon, lat, pixel_width, pixel_height):
+    """Geodesic area (m2) of a pixel of the given size in degrees, centred at (lon, lat)."""
+    half_width, half_height = abs(pixel_width) / 2, abs(pixel_height) / 2
+    lons = [lon - half_width, lon + half_width, lon + half_width, lon - half_width]
+    lats = [lat - half_height, lat - half_height, lat + half_height, lat + half_height]
+    return abs(geod.polygon_area_perimeter(lons, lats)[0])
+
+
+##########################
+# Parent cells
+# ########################
+def olc_parent(olc_id, resolution):
+    # Codes up to 8 digits are zero-padded before the '+' separator
+    if resolution <= 8:
+        return olc_id[:resolution] + '0' * (8 - resolution) + '+'
+    return olc_id[:resolution + 1]
+
+def tilecode_parent(tilecode_id, resolution):
+    z, x, y = parse_tilecode(tilecode_id)
+    return f"z{resolution}x{x >> (z - resolution)}y{y >> (z - resolution)}"
+
+def s2_parent(s2_token, resolution):
+    return s2.CellId.from_token(s2_token).parent(resolution).to_token()
+
+def h3_parent(h3_id, resolution):
+    return h3.cell_to_parent(h3_id, resolution)
+
+def prefix_parent(offset):
+    # DGGS whose IDs are a prefix path: the parent ID is the first resolution + offset characters
+    return lambda cell_id, resolution: cell_id[:resolution + offset]
+
+DGGS_PARENTS = {
+    'h3': h3_parent,
+    's2': s2_parent,
+    'rhealpix': prefix_parent(1),
+    'isea4t': prefix_parent(2),
+    'qtm': prefix_parent(0),
+    'olc': olc_parent,
+    'geohash': prefix_parent(0),
+    'tilecode': tilecode_parent,
+    'quadkey': prefix_parent(0)
+}
+
+def pyramid_resolutions(dggs_type, resolution, min_resolution):
+    """Coarser resolutions from resolution - 1 down to min_resolution that the DGGS supports."""
+    if min_resolution is None or min_resolution < 0:
+        return []
+    lowest = {'qtm': 2, 'geohash': 1, 'quadkey': 1}.get(dggs_type, 0)
+    resolutions = range(resolution - 1, max(min_resolution, lowest) - 1, -1)
+    if dggs_type == 'olc':
+        return [res for res in resolutions if res in OLC_RESOLUTIONS]
+    return list(resolutions)
+
+
+##########################
+# Child cells
+# ########################
+def h3_child_count(h3_id, resolution):
+    return len(h3.cell_to_children(h3_id, resolution))
+
+def olc_child_count(olc_id, resolution):
+    # Pair digits split a cell into 20 x 20, grid digits (after 10) into 4 x 5
+    return 400 if resolution <= 10 else 20
+
+def constant_child_count(count):
+    return lambda cell_id, resolution: count
+
+DGGS_CHILD_COUNTS = {
+    'h3': h3_child_count,
+    's2': constant_child_count(4),
+    'rhealpix': constant_child_count(9),
+    'isea4t': constant_child_count(4),
+    'qtm': constant_child_count(4),
+    'olc': olc_child_count,
+    'geohash': constant_child_count(32),
+    'tilecode': constant_child_count(4),
+    'quadkey': constant_child_count(4)
+}
@@ -0,0 +1,69 @@
+from qgis.core import QgsFeatureRequest
+from qgis.PyQt.QtCore import QVariant
+
+##########################
+# Column reads
+# ########################
+def columns_request(layer, field_names, limit=None):
+    """QgsFeatureRequest fetching only the given attributes and no geometry."""
+    request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry).setSubsetOfAttributes(field_names, layer.fields())
+    if limit is not None:
+        request.setLimit(limit)
+    return request
+
+
+def id_request(layer, field_name, limit=None):
+    """QgsFeatureRequest fetching only one attribute and no geometry."""
+    return columns_request(layer, [field_name], limit)
+
+
+def read_column(layer, field_name, limit=None):
+    """
+    Non-empty values of one field, in feature order. Works on layers and on
+    processing feature sources; geometries are never fetched or decoded.
+    """
+    return [
+        feature[field_name]
+        for feature in layer.getFeatures(id_request(layer, field_name, limit))
+        if feature[field_name]
+    ]
+
+
+def read_columns(layer, field_names):
+    """
+    Rows of values of several fields, in feature order, skipping features whose
+    first field is empty. Geometries are never fetched.
+    """
+    return [
+        [feature[field_name] for field_name in field_names]
+        for feature in layer.getFeatures(columns_request(layer, field_names))
+        if feature[field_names[0]]
+    ]
+
+
+def first_value(layer, field_name):
+    """First non-empty value of a field, or None."""
+    for feature in layer.getFeatures(id_request(layer, field_name)):
+        if feature[field_name]:
+            return feature[field_name]
+    return None
+
+
+def attribute_value(value):
+    # NULL attributes come back as a null QVariant on older QGIS versions
+    return None if isinstance(value, QVariant) and value.isNull() else value
+
+
+##########################
+# Batched reads
+# ########################
+def feature_batches(features, batch_size):
+    """Lists of at most batch_size features from an iterator."""
+    batch = []
+    for feature in features:
+        batch.append(feature)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,81 @@
+from qgis.core import QgsFeatureSink, QgsVectorLayer, QgsWkbTypes
+
+FEATURE_BATCH_SIZE = 1000
+
+##########################
+# Batched feature output
+# ########################
+class FeatureBatchWriter:
+    """
+    Buffers features and hands them to a QgsFeatureSink (or a memory layer's data
+    provider) in batches. Call flush() once all features are added.
+    """
+    def __init__(self, sink, batch_size=FEATURE_BATCH_SIZE):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.count = 0
+        self._features = []
+
+    def addFeature(self, feature):
+        self._features.append(feature)
+        if len(self._features) >= self.batch_size:
+            self.flush()
+
+    def addFeatures(self, features):
+        for feature in features:
+            self.addFeature(feature)
+
+    def flush(self):
+        if self._features:
+            self.sink.addFeatures(self._features, QgsFeatureSink.FastInsert)
+            self.count += len(self._features)
+            self._features = []
+
+
+class SinkFactory:
+    """
+    Creates a processing algorithm's output sink on demand, once the conversion
+    function knows its output fields: create_sink(fields, wkb_type, crs) -> sink.
+    """
+    def __init__(self, algorithm, parameters, output_name, context):
+        self.algorithm = algorithm
+        self.parameters = parameters
+        self.output_name = output_name
+        self.context = context
+        self.sink = None
+        self.sink_id = None
+
+    def __call__(self, fields, wkb_type, crs):
+        (self.sink, self.sink_id) = self.algorithm.parameterAsSink(
+            self.parameters,
+            self.output_name,
+            self.context,
+            fields,
+            wkb_type,
+            crs
+        )
+        return self.sink
+
+
+def feature_output(fields, crs, layer_name, create_sink=None, wkb_type=QgsWkbTypes.Polygon):
+    """
+    (writer, output): with create_sink the features go straight to the algorithm's sink,
+    which is returned as output; otherwise into a new memory layer returned as output.
+    """
+    if create_sink:
+        sink = create_sink(fields, wkb_type, crs)
+        return FeatureBatchWriter(sink), sink
+    mem_layer = QgsVectorLayer(f"{QgsWkbTypes.displayString(wkb_type)}?crs={crs.toWkt()}", layer_name, "memory")
+    mem_provider = mem_layer.dataProvider()
+    mem_provider.addAttributes(fields)
+    mem_layer.updateFields()
+    return FeatureBatchWriter(mem_provider), mem_layer
+
+
+def write_layer(layer, create_sink):
+    """Write all features of a layer to a new sink; returns the sink."""
+    sink = create_sink(layer.fields(), layer.wkbType(), layer.crs())
+    writer = FeatureBatchWriter(sink)
+    writer.addFeatures(layer.getFeatures())
+    writer.flush()
+    return sink
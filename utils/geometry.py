@@ -0,0 +1,57 @@
+from qgis.core import QgsGeometry, QgsLineString, QgsPolygon, QgsRectangle
+from shapely import wkb as shapely_wkb
+try:
+    # Shapely 2.x vectorized WKB reader
+    from shapely import from_wkb as shapely_from_wkb
+except ImportError:
+    shapely_from_wkb = None
+
+
+##########################
+# Coordinates -> QgsGeometry
+# ########################
+def coords_to_qgsgeometry(coords):
+    """Build a polygon QgsGeometry from a ring of (lon, lat) coordinates, without a WKT round trip."""
+    xs = [c[0] for c in coords]
+    ys = [c[1] for c in coords]
+    if not xs:
+        return QgsGeometry()
+    exterior = QgsLineString(xs, ys)
+    exterior.close()
+    polygon = QgsPolygon()
+    polygon.setExteriorRing(exterior)
+    return QgsGeometry(polygon)
+
+
+def bounds_to_qgsgeometry(min_lon, min_lat, max_lon, max_lat):
+    """Build a rectangular cell QgsGeometry from its bounds."""
+    return QgsGeometry.fromRect(QgsRectangle(min_lon, min_lat, max_lon, max_lat))
+
+
+##########################
+# shapely <-> QgsGeometry
+# ########################
+def shapely_to_qgsgeometry(shapely_geom):
+    """Convert a shapely geometry to QgsGeometry (coordinate arrays for simple polygons, WKB otherwise)."""
+    if shapely_geom is None or shapely_geom.is_empty:
+        return QgsGeometry()
+    if shapely_geom.geom_type == 'Polygon' and not shapely_geom.interiors:
+        return coords_to_qgsgeometry(shapely_geom.exterior.coords)
+    qgs_geom = QgsGeometry()
+    qgs_geom.fromWkb(shapely_geom.wkb)
+    return qgs_geom
+
+
+def qgsgeometry_to_shapely(qgs_geom):
+    """Convert a QgsGeometry to shapely via WKB."""
+    if qgs_geom is None or qgs_geom.isNull():
+        return None
+    return shapely_wkb.loads(bytes(qgs_geom.asWkb()))
+
+
+def qgsgeometries_to_shapely(qgs_geoms):
+    """Convert an iterable of QgsGeometry to a list of shapely geometries in one WKB batch."""
+    wkbs = [bytes(g.asWkb()) for g in qgs_geoms if g is not None and not g.isNull()]
+    if shapely_from_wkb is not None:
+        return list(shapely_from_wkb(wkbs))
+    return [shapely_wkb.loads(w) for w in wkbs]
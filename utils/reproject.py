@@ -0,0 +1,34 @@
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsFeatureRequest,
+    QgsProject
+)
+
+WGS84_CRS = QgsCoordinateReferenceSystem("EPSG:4326")
+
+
+def needs_transform(source_crs, destination_crs):
+    # Layers without a valid CRS are assumed to be in the destination CRS already
+    return (source_crs is not None and source_crs.isValid()
+            and destination_crs is not None and destination_crs.isValid()
+            and source_crs != destination_crs)
+
+
+def crs_request(source_crs, destination_crs, transform_context=None, request=None):
+    """
+    Return a QgsFeatureRequest delivering geometries in destination_crs.
+    The provider iterator reprojects each feature as it is fetched,
+    so no intermediate reprojected layer is created.
+    """
+    if request is None:
+        request = QgsFeatureRequest()
+    if needs_transform(source_crs, destination_crs):
+        if transform_context is None:
+            transform_context = QgsProject.instance().transformContext()
+        request.setDestinationCrs(destination_crs, transform_context)
+    return request
+
+
+def wgs84_request(source_crs, transform_context=None, request=None):
+    """Return a QgsFeatureRequest delivering geometries in EPSG:4326."""
+    return crs_request(source_crs, WGS84_CRS, transform_context, request)
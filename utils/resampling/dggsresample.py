@@ -1,192 +1,56 @@
-from vgrid.utils import s2, olc, geohash, mercantile
 from ...utils.resampling import dggsgrid
 
-import h3
-import os, re
-from vgrid.stats.s2stats import s2_metrics
-from vgrid.stats.rhealpixstats import rhealpix_metrics
-from vgrid.stats.isea4tstats import isea4t_metrics
-from vgrid.stats.qtmstats import qtm_metrics
-from vgrid.stats.olcstats import olc_metrics
-from vgrid.stats.geohashstats import geohash_metrics
-from vgrid.stats.tilecodestats import tilecode_metrics
-from vgrid.stats.quadkeystats import quadkey_metrics
-from shapely.wkt import loads as load_wkt
-
-from shapely.geometry import shape
-from vgrid.generator import h3grid, s2grid, rhealpixgrid, isea4tgrid, qtmgrid, olcgrid, geohashgrid, tilecodegrid, quadkeygrid
+import os
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
 from numbers import Number
-from vgrid.utils.rhealpixdggs.dggs import RHEALPixDGGS
-from vgrid.utils.rhealpixdggs.ellipsoids import WGS84_ELLIPSOID
-from pyproj import Geod
+from ..featurewriter import feature_output, write_layer
+from ..featurereader import feature_batches, attribute_value
+from ..dggsmetrics import dggs_metrics, detect_resolution, DGGS_PARENTS, pyramid_resolutions
+from ..conversion.dggscell import cell_fields, rhealpix_grid_dggs
+from .weighttable import OverlapWeights, overlap_weights, aggregate_overlaps, missing_values, RESAMPLE_METHODS, NUMERIC_RESAMPLE_METHODS
+from .resamplepool import resample_partition, start_process_pool
+
+import numpy as np
+import shapely
+from shapely import STRtree
 import platform
 if (platform.system() == 'Windows'):
     from vgrid.utils.eaggr.eaggr import Eaggr
-    from vgrid.utils.eaggr.shapes.dggs_cell import DggsCell
     from vgrid.utils.eaggr.enums.model import Model
-    from vgrid.utils.eaggr.enums.shape_string_format import ShapeStringFormat
-    from vgrid.generator.settings import isea4t_res_accuracy_dict
 
 from qgis.core import (
     QgsFeature,
+    QgsFeatureRequest,
     QgsField,
-    QgsFields,
     QgsGeometry,
-    QgsVectorLayer,
-    QgsWkbTypes,
 )
 from qgis.PyQt.QtCore import QVariant
-from shapely.wkt import loads as load_wkt
-from numbers import Number
-
 
-geod = Geod(ellps="WGS84")
-E = WGS84_ELLIPSOID
 
 def get_nearest_resolution(qgs_features, from_dggs, to_dggs, from_field=None, feedback=None): 
     if not from_field:
         from_field = from_dggs
 
     try:
-        for feature in qgs_features.getFeatures():  # Use getFeatures() to iterate through the features
-            from_dggs_id = feature[from_field]
-            break
-        else:
+        # Only a sample of the ID column is read, without geometries
+        from_resolution = detect_resolution(qgs_features, from_dggs, from_field, feedback=feedback)
+        if from_resolution is None:
             raise ValueError("No features provided.")
-    except Exception as e:
+    except Exception:
         if feedback:
             feedback.reportError(f"No valid DGGS IDs found in <{from_field}> field.")
         return
 
     try:
-        if from_dggs == 'h3':
-            from_resolution = h3.get_resolution(from_dggs_id)
-            from_area = h3.average_hexagon_area(from_resolution, unit='m^2')
-
-        elif from_dggs == 's2':
-            s2_id = s2.CellId.from_token(from_dggs_id)
-            from_resolution = s2_id.level()
-            _, _, from_area = s2_metrics(from_resolution)
-
-        elif from_dggs == 'rhealpix':
-            rhealpix_uids = (from_dggs_id[0],) + tuple(map(int, from_dggs_id[1:]))
-            rhealpix_dggs = RHEALPixDGGS(ellipsoid=E, north_square=1, south_square=3, N_side=3)
-            rhealpix_cell = rhealpix_dggs.cell(rhealpix_uids)
-            from_resolution = rhealpix_cell.resolution
-            _, _, from_area = rhealpix_metrics(from_resolution)
-
-        elif from_dggs == 'isea4t':
-            if platform.system() == 'Windows':
-                from_resolution = len(from_dggs_id) - 2
-                isea4t_dggs = Eaggr(Model.ISEA4T)
-                _, _, from_area, _ = isea4t_metrics(isea4t_dggs, from_resolution)
-
-        elif from_dggs == 'qtm':
-            from_resolution = len(from_dggs_id)
-            _, _, from_area = qtm_metrics(from_resolution)
-
-        elif from_dggs == 'olc':
-            coord = olc.decode(from_dggs_id)
-            from_resolution = coord.codeLength
-            _, _, from_area = olc_metrics(from_resolution)
-
-        elif from_dggs == 'geohash':
-            from_resolution = len(from_dggs_id)
-            _, _, from_area = geohash_metrics(from_resolution)
-
-        elif from_dggs == 'tilecode':
-            match = re.match(r'z(\d+)x(\d+)y(\d+)', from_dggs_id)
-            from_resolution = int(match.group(1))
-            _, _, from_area = tilecode_metrics(from_resolution)
-
-        elif from_dggs == 'quadkey':
-            tile = mercantile.quadkey_to_tile(from_dggs_id)
-            from_resolution = tile.z
-            _, _, from_area = quadkey_metrics(from_resolution)
-
+        from_area = dggs_metrics(from_dggs).area(from_resolution)
     except Exception as e:
         if feedback:
             feedback.reportError(f"Failed to calculate area from {from_dggs}: {str(e)}")
         return
 
-    nearest_resolution = None
-    min_diff = float('inf')
-
     try:
-        if to_dggs == 'h3':
-            for res in range(16):
-                avg_area = h3.average_hexagon_area(res, unit='m^2')
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
-        elif to_dggs == 's2':
-            for res in range(31):
-                _, _, avg_area = s2_metrics(res)
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
-        elif to_dggs == 'rhealpix':
-            for res in range(16):
-                _, _, avg_area = rhealpix_metrics(res)
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
-        elif to_dggs == 'isea4t':
-            if platform.system() == 'Windows':
-                isea4t_dggs = Eaggr(Model.ISEA4T)
-                for res in range(26):
-                    _, _, avg_area, _ = isea4t_metrics(isea4t_dggs, res)
-                    diff = abs(avg_area - from_area)
-                    if diff < min_diff:
-                        min_diff = diff
-                        nearest_resolution = res
-
-        elif to_dggs == 'qtm':
-            for res in range(1, 25):
-                _, _, avg_area = qtm_metrics(res)
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
-        elif to_dggs == 'olc':
-            for res in [2, 4, 6, 8, 10, 11, 12, 13, 14, 15]:
-                _, _, avg_area = olc_metrics(res)
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
-        elif to_dggs == 'geohash':
-            for res in range(1, 11):
-                _, _, avg_area = geohash_metrics(res)
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
-        elif to_dggs == 'tilecode':
-            for res in range(30):
-                _, _, avg_area = tilecode_metrics(res)
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
-        elif to_dggs == 'quadkey':
-            for res in range(30):
-                _, _, avg_area = quadkey_metrics(res)
-                diff = abs(avg_area - from_area)
-                if diff < min_diff:
-                    min_diff = diff
-                    nearest_resolution = res
-
+        nearest_resolution = dggs_metrics(to_dggs).nearest(from_area)
     except Exception as e:
         if feedback:
             feedback.reportError(f"Failed to calculate nearest resolution for {to_dggs}: {str(e)}")
@@ -203,8 +67,7 @@ def generate_grid(qgs_features, to_dggs, resolution, feedback=None):
     elif to_dggs == 's2':
         dggs_grid = dggsgrid.generate_s2_grid(resolution, qgs_features,feedback)
     elif to_dggs == 'rhealpix':
-        rhealpix_dggs = RHEALPixDGGS()
-        dggs_grid = dggsgrid.generate_rhealpix_grid(rhealpix_dggs,resolution, qgs_features,feedback)
+        dggs_grid = dggsgrid.generate_rhealpix_grid(rhealpix_grid_dggs,resolution, qgs_features,feedback)
     elif to_dggs == 'isea4t':
         if (platform.system() == 'Windows'): 
             isea4t_dggs = Eaggr(Model.ISEA4T)
@@ -224,82 +87,380 @@ def generate_grid(qgs_features, to_dggs, resolution, feedback=None):
 
     return dggs_grid
 
-def resampling(layer1, layer2, resample_field, feedback=None):
-    try:
-        layer1_features = []
-        for feature in layer1.getFeatures():
-            if resample_field not in feature.fields().names():
-                raise ValueError(f"There is no <{resample_field}> field in the input layer1 features.")
-            geom = load_wkt(feature.geometry().asWkt())
-            value = feature[resample_field]
-            layer1_features.append((geom, value))
-    except ValueError as e:
+RESAMPLE_BATCH_SIZE = 1000
+
+def resample_field_names(resample_fields):
+    """Resample fields as a list: a single field name or a list of names."""
+    if not resample_fields:
+        return []
+    if isinstance(resample_fields, str):
+        return [resample_fields]
+    return list(resample_fields)
+
+def read_source_cells(layer, resample_fields, dggs_field=None):
+    """
+    Source cell IDs (when dggs_field is given), geometries (shapely array) and an
+    (n, k) object array of the resample_fields values (None where NULL).
+    """
+    resample_fields = resample_field_names(resample_fields)
+    request = QgsFeatureRequest().setSubsetOfAttributes([dggs_field] + resample_fields if dggs_field else resample_fields, layer.fields())
+    cell_ids, wkbs, values = [], [], []
+    for feature in layer.getFeatures(request):
+        geometry = feature.geometry()
+        if geometry is None or geometry.isNull() or (dggs_field and not feature[dggs_field]):
+            continue
+        if dggs_field:
+            cell_ids.append(feature[dggs_field])
+        wkbs.append(bytes(geometry.asWkb()))
+        values.append([attribute_value(feature[field]) for field in resample_fields])
+    return cell_ids, shapely.from_wkb(wkbs), np.array(values, dtype=object).reshape(len(values), len(resample_fields))
+
+def method_values(method, values, resample_fields):
+    """
+    Source values as the resampling method needs them: floats (NaN where NULL) for the
+    numeric methods, untouched otherwise. Also returns the fields holding non-numeric values.
+    """
+    if method not in NUMERIC_RESAMPLE_METHODS:
+        return values, []
+    numeric = np.vectorize(lambda value: value is None or (isinstance(value, Number) and not isinstance(value, bool)), otypes=[bool])
+    valid = numeric(values).reshape(values.shape).all(axis=0)
+    invalid_fields = [field for field, is_valid in zip(resample_fields, valid.tolist()) if not is_valid]
+    if invalid_fields:
+        return None, invalid_fields
+    return np.where(missing_values(values), np.nan, values).astype(float), []
+
+def resampled_field(layer_fields, resample_field, method):
+    """Output field of a resampled field: the source field for majority, integer counts, doubles otherwise."""
+    if method == 'majority':
+        return QgsField(layer_fields.field(resample_field))
+    if method == 'count':
+        return QgsField(resample_field, QVariant.Int)
+    return QgsField(resample_field, QVariant.Double)
+
+def append_resampled_fields(fields, layer_fields, resample_fields, method):
+    """
+    Append an output field per resample field to fields and return their indexes. A name
+    already in fields (a cell metric such as resolution or cell_area) gets a _<method>
+    suffix, since QgsFields.append would drop the duplicate and shift the later values.
+    """
+    field_indexes = []
+    for resample_field in resample_fields:
+        field = resampled_field(layer_fields, resample_field, method)
+        name = resample_field
+        while fields.indexOf(name) >= 0:
+            name = f"{name}_{method}"
+        field.setName(name)
+        fields.append(field)
+        field_indexes.append(fields.indexOf(name))
+    return field_indexes
+
+def output_value(value, method):
+    if method == 'count':
+        return int(value)
+    if method == 'majority':
+        return value
+    return None if np.isnan(value) else round(value, 3)
+
+def report_non_numeric(fields, feedback=None):
+    msg = f"Non-numeric value found in <{', '.join(fields)}>. Resampled field calculation failed."
+    if feedback:
+        feedback.reportError(msg)
+    else:
+        print(msg)
+
+def resampling(layer1, layer2, resample_fields, feedback=None, create_sink=None, method='sum'):
+    """
+    Resampling of one or more fields of layer1 onto the cells of layer2 with a resampling
+    method (see aggregate_overlaps): overlaps are computed once per batch of target cells
+    and all fields are reduced over the same weights together.
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unsupported resampling method: {method}")
+    resample_fields = resample_field_names(resample_fields)
+    missing_fields = [field for field in resample_fields if field not in layer1.fields().names()]
+    if missing_fields:
+        msg = f"There is no <{', '.join(missing_fields)}> field in the input layer1 features."
         if feedback:
-            feedback.reportError(str(e))
+            feedback.reportError(msg)
         else:
-            print(e)
-        return layer2
-
-    # Prepare output layer with same geometry and attributes + resample_field
+            print(msg)
+        return write_layer(layer2, create_sink) if create_sink else layer2
+
+    # Source cells are indexed once; each batch of target cells is matched and
+    # intersected in bulk instead of testing every source cell per target cell
+    _, source_geoms, source_values = read_source_cells(layer1, resample_fields)
+    source_values, invalid_fields = method_values(method, source_values, resample_fields)
+    if invalid_fields:
+        report_non_numeric(invalid_fields, feedback)
+        return None
+    source_areas = shapely.area(source_geoms)
+    source_tree = STRtree(source_geoms)
+
+    # Prepare output layer with same geometry and attributes + resample_fields
     fields = layer2.fields()
-    if resample_field not in fields.names():
-        fields.append(QgsField(resample_field, QVariant.Double))
+    field_indexes = append_resampled_fields(fields, layer1.fields(), resample_fields, method)
 
-    output_layer = QgsVectorLayer("Polygon?crs=" + layer2.crs().authid(), "resampled", "memory")
-    output_layer.startEditing()
-    output_layer.dataProvider().addAttributes(fields)
-    output_layer.updateFields()
+    writer, output_layer = feature_output(fields, layer2.crs(), "resampled", create_sink)
 
     total = layer2.featureCount()
     resampled_count = 0
+    done = 0
 
     if feedback:
         feedback.pushInfo(f"Starting resampling on {total} features...")
 
-    for i, feature in enumerate(layer2.getFeatures()):
+    for batch in feature_batches(layer2.getFeatures(), RESAMPLE_BATCH_SIZE):
         if feedback and feedback.isCanceled():
             feedback.reportError("Operation cancelled.")
-            return output_layer
+            return None
+
+        target_geoms = shapely.from_wkb([
+            bytes(target.geometry().asWkb()) if target.hasGeometry() else None for target in batch
+        ])
+        target_index, source_index, weights = overlap_weights(target_geoms, source_tree, source_geoms, source_areas)
+        resampled_values = aggregate_overlaps(method, target_index, source_index, weights, source_areas, source_values, len(batch))
+        intersected = np.bincount(target_index, minlength=len(batch)) > 0
+
+        for target, resampled_row, has_parts in zip(batch, resampled_values.tolist(), intersected.tolist()):
+            if not has_parts:
+                continue
+            new_feat = QgsFeature(fields)
+            new_feat.setGeometry(target.geometry())
+            attrs = list(target.attributes())
+            attrs.extend([None] * (fields.count() - len(attrs)))
+            for field_index, resampled_value in zip(field_indexes, resampled_row):
+                attrs[field_index] = output_value(resampled_value, method)
+            new_feat.setAttributes(attrs)
+            writer.addFeature(new_feat)
+            resampled_count += 1
+
+        done += len(batch)
+        if feedback:
+            feedback.setProgress(int(done / max(total, 1) * 100))
 
-        layer2_geom = load_wkt(feature.geometry().asWkt())
-        resampled_value = 0.0
-        intersected_parts = []
+    writer.flush()
 
-        for l1_geom, l1_value in layer1_features:
-            if layer2_geom.intersects(l1_geom):
-                if not isinstance(l1_value, Number):
-                    msg = f"Non-numeric value found in <{resample_field}>. Resampled field calculation failed."
-                    if feedback:
-                        feedback.reportError(msg)
-                    return output_layer
+    if feedback:
+        feedback.setProgress(100)
+        feedback.pushInfo(f"Resampling complete. {resampled_count} features updated.")
 
-                intersection = layer2_geom.intersection(l1_geom)
-                if not intersection.is_empty:
-                    proportion = intersection.area / l1_geom.area
-                    resampled_value += l1_value * proportion
-                    intersected_parts.append(intersection)
+    return output_layer
 
-        if not intersected_parts:
+def resampling_with_weights(dggs_layer, dggstype_from, dggstype_to, resolution, dggs_field, resample_fields, weights_path,
+                            feedback=None, create_sink=None, method='sum'):
+    """
+    Resampling through an overlap weight table saved at weights_path: the table is
+    reused when it was built for the same DGGS pair and resolution and covers all input
+    cells, otherwise it is built from the generated grid and saved.
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unsupported resampling method: {method}")
+    if not dggs_field:
+        dggs_field = dggstype_from
+    resample_fields = resample_field_names(resample_fields)
+    from_ids, from_geoms, from_values = read_source_cells(dggs_layer, resample_fields, dggs_field)
+    from_values, invalid_fields = method_values(method, from_values, resample_fields)
+    if invalid_fields:
+        report_non_numeric(invalid_fields, feedback)
+        return None
+
+    key = {'from_dggs': dggstype_from, 'to_dggs': dggstype_to, 'to_resolution': resolution}
+    weights = OverlapWeights.load(weights_path, key)
+    positions = weights.source_positions(from_ids) if weights else None
+    if positions is None:
+        if feedback and os.path.exists(weights_path):
+            feedback.pushInfo(f"The overlap weight table in {weights_path} does not match these cells; it will be replaced.")
+        grid = generate_grid(dggs_layer, dggstype_to, resolution, feedback)
+        if grid is None:
+            return None
+        to_ids, to_wkbs = [], []
+        for feature in grid.getFeatures():
+            to_ids.append(feature[dggstype_to])
+            to_wkbs.append(bytes(feature.geometry().asWkb()))
+        if feedback:
+            feedback.pushInfo(f"Computing overlap weights of {len(from_ids)} x {len(to_ids)} cells...")
+        weights = OverlapWeights.build(key, from_ids, from_geoms, to_ids, shapely.from_wkb(to_wkbs), feedback)
+        if weights is None:
+            return None
+        weights.save(weights_path)
+        positions = np.arange(len(from_ids))
+        if feedback:
+            feedback.pushInfo(f"Overlap weight table saved to {weights_path}.")
+    elif feedback:
+        feedback.pushInfo(f"Using the overlap weight table in {weights_path}.")
+
+    # Cells of the table that are not in this layer have no value and are ignored
+    values = np.full((len(weights.from_ids), len(resample_fields)), np.nan if method in NUMERIC_RESAMPLE_METHODS else None)
+    values[positions] = from_values
+    areas = np.zeros(len(weights.from_ids))
+    areas[positions] = shapely.area(from_geoms)
+    present = np.zeros(len(weights.from_ids))
+    present[positions] = 1.
+    resampled_values = weights.aggregate(method, values, areas)
+    covered = weights.covered(present)
+
+    fields = cell_fields(dggstype_to)
+    append_resampled_fields(fields, dggs_layer.fields(), resample_fields, method)
+    writer, output_layer = feature_output(fields, dggs_layer.crs(), "resampled", create_sink)
+
+    total = len(weights.to_ids)
+    resampled_count = 0
+    for i, (to_id, resampled_row, is_covered) in enumerate(zip(weights.to_ids, resampled_values.tolist(), covered.tolist())):
+        if feedback:
+            if feedback.isCanceled():
+                return None
+            feedback.setProgress(int(i / total * 100))
+        if not is_covered:
             continue
-
+        cell = dggsgrid.grid_cell(dggstype_to, to_id)
+        if not cell:
+            continue
+        cell_polygon, cell_geom, cell_attributes = cell
         new_feat = QgsFeature(fields)
-        new_feat.setGeometry(QgsGeometry.fromWkt(layer2_geom.wkt))
-        attrs = list(feature.attributes())
-        if len(attrs) < fields.count():
-            attrs.append(round(resampled_value, 3))
-        else:
-            idx = fields.indexOf(resample_field)
-            attrs[idx] = round(resampled_value, 3)
-        new_feat.setAttributes(attrs)
-
-        output_layer.addFeature(new_feat)
+        new_feat.setGeometry(cell_geom)
+        new_feat.setAttributes([to_id] + cell_attributes + [output_value(resampled_value, method) for resampled_value in resampled_row])
+        writer.addFeature(new_feat)
         resampled_count += 1
 
+    writer.flush()
+
+    if feedback:
+        feedback.setProgress(100)
+        feedback.pushInfo(f"Resampling complete. {resampled_count} features updated.")
+
+    return output_layer
+
+##########################
+# Chunked resampling
+# ########################
+RESAMPLE_PARTITION_CELLS = 5000
+
+def partition_resolution(dggs_type, resolution, partition_cells=RESAMPLE_PARTITION_CELLS):
+    """Coarser resolution whose cells each hold about partition_cells cells at resolution (None if there is none)."""
+    coarser = pyramid_resolutions(dggs_type, resolution, 0)
+    if not coarser:
+        return None
+    metrics = dggs_metrics(dggs_type)
+    return metrics.nearest(metrics.area(resolution) * partition_cells, min(coarser), max(coarser))
+
+def bounded_map(executor, function, items, window):
+    """executor.map with at most window tasks in flight, so results stream out as they finish in order."""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def partition_sources(parent_id, dggs_type, source_tree):
+    """
+    Indexes of the source cells that may overlap the children of parent_id: those within
+    the parent cell's envelope grown by half its size, as H3 children reach past their parent.
+    """
+    if parent_id is None:
+        return np.arange(len(source_tree.geometries))
+    cell = dggsgrid.grid_cell(dggs_type, parent_id)
+    if not cell:
+        return np.arange(len(source_tree.geometries))
+    min_x, min_y, max_x, max_y = cell[0].bounds
+    margin_x, margin_y = (max_x - min_x) / 2, (max_y - min_y) / 2
+    return source_tree.query(shapely.box(min_x - margin_x, min_y - margin_y, max_x + margin_x, max_y + margin_y))
+
+def resampling_chunked(dggs_layer, dggstype_to, resolution, resample_fields, method='sum', workers=None,
+                       feedback=None, create_sink=None):
+    """
+    Resampling partitioned by coarse parent cell: target cells are grouped under their
+    parent at partition_resolution, and each partition is decoded, overlaid and reduced in
+    a process pool that receives only its cell IDs and the source cells around it.
+    Partitions run in this process when no pool can be started. Results are written to the
+    output in order as partitions complete; the target grid is never held as a whole layer.
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unsupported resampling method: {method}")
+    resample_fields = resample_field_names(resample_fields)
+    missing_fields = [field for field in resample_fields if field not in dggs_layer.fields().names()]
+    if missing_fields:
+        if feedback:
+            feedback.reportError(f"There is no <{', '.join(missing_fields)}> field in the input features.")
+        return None
+
+    _, source_geoms, source_values = read_source_cells(dggs_layer, resample_fields)
+    source_values, invalid_fields = method_values(method, source_values, resample_fields)
+    if invalid_fields:
+        report_non_numeric(invalid_fields, feedback)
+        return None
+    source_tree = STRtree(source_geoms)
+    source_wkbs = np.array(shapely.to_wkb(source_geoms), dtype=object)
+
+    cell_ids = dggsgrid.grid_cell_ids(dggstype_to, resolution, source_geoms, source_tree, feedback)
+    if cell_ids is None:
+        return None
+    parent_resolution = partition_resolution(dggstype_to, resolution)
+    partitions = {}
+    for cell_id in cell_ids:
+        parent_id = DGGS_PARENTS[dggstype_to](cell_id, parent_resolution) if parent_resolution is not None else None
+        partitions.setdefault(parent_id, []).append(cell_id)
+    parent_ids = sorted(partitions, key=str)
+    if feedback:
+        feedback.pushInfo(f"Resampling {len(cell_ids)} candidate cells in {len(partitions)} partitions...")
+
+    def partition_task(parent_id):
+        # Built lazily, so only the partitions in flight hold their source subsets
+        sources = partition_sources(parent_id, dggstype_to, source_tree)
+        return dggstype_to, method, partitions[parent_id], source_wkbs[sources], source_values[sources]
+
+    fields = cell_fields(dggstype_to)
+    append_resampled_fields(fields, dggs_layer.fields(), resample_fields, method)
+    writer, output_layer = feature_output(fields, dggs_layer.crs(), "resampled", create_sink)
+
+    total = len(partitions)
+    resampled_count = 0
+
+    def write_partition(results):
+        nonlocal resampled_count
+        for cell_id, cell_wkb, cell_attributes, resampled_row in results:
+            cell_geom = QgsGeometry()
+            cell_geom.fromWkb(cell_wkb)
+            new_feat = QgsFeature(fields)
+            new_feat.setGeometry(cell_geom)
+            new_feat.setAttributes([cell_id] + cell_attributes + [output_value(resampled_value, method) for resampled_value in resampled_row])
+            writer.addFeature(new_feat)
+            resampled_count += 1
+
+    # Processes rather than threads: decoding the target cells is Python-level work that
+    # holds the GIL. Workers import no QGIS module (see resamplepool).
+    workers = workers or os.cpu_count() or 1
+    done = 0
+    executor = start_process_pool(workers, feedback)
+    if executor is not None:
+        window = 2 * workers
+        try:
+            with executor:
+                for results in bounded_map(executor, resample_partition, map(partition_task, parent_ids), window):
+                    if feedback:
+                        if feedback.isCanceled():
+                            executor.shutdown(cancel_futures=True)
+                            feedback.reportError("Operation cancelled.")
+                            return None
+                        feedback.setProgress(int(done / total * 100))
+                    write_partition(results)
+                    done += 1
+        except BrokenProcessPool as e:
+            if feedback:
+                feedback.pushInfo(f"A worker process failed ({e!r}).")
+    if done < total and feedback:
+        feedback.pushInfo(f"Resampling {total - done} partitions in this process.")
+    for parent_id in parent_ids[done:]:
         if feedback:
-            feedback.setProgress(int((i + 1) / total * 100))
+            if feedback.isCanceled():
+                feedback.reportError("Operation cancelled.")
+                return None
+            feedback.setProgress(int(done / total * 100))
+        write_partition(resample_partition(partition_task(parent_id)))
+        done += 1
 
-    output_layer.commitChanges()
-    output_layer.updateExtents()
+    writer.flush()
 
     if feedback:
         feedback.setProgress(100)
@@ -307,14 +468,23 @@ def resampling(layer1, layer2, resample_field, feedback=None):
 
     return output_layer
 
-def resample(dggs_layer, dggstype_from, dggstype_to, resolution, dggs_field=None, resample_field=None, feedback=None):
+def resample(dggs_layer, dggstype_from, dggstype_to, resolution, dggs_field=None, resample_fields=None, feedback=None, create_sink=None,
+             weights_path=None, method='sum', workers=0):
     resampled_features = None
     if resolution == -1:
         resolution = get_nearest_resolution(dggs_layer, dggstype_from, dggstype_to,dggs_field)
         if feedback:
             feedback.pushInfo(f"Nearest resolution: {resolution}")
+    resample_fields = resample_field_names(resample_fields)
+    if resolution and resample_fields and weights_path:
+        return resampling_with_weights(dggs_layer, dggstype_from, dggstype_to, resolution, dggs_field, resample_fields,
+                                       weights_path, feedback, create_sink, method)
+    if resolution and resample_fields and workers:
+        return resampling_chunked(dggs_layer, dggstype_to, resolution, resample_fields, method, workers, feedback, create_sink)
     if resolution:
         resampled_features = generate_grid(dggs_layer, dggstype_to, resolution, feedback)
-        if resample_field: 
-            resampled_features = resampling(dggs_layer, resampled_features,resample_field, feedback)
-    return resampled_features
\ No newline at end of file
+        if resample_fields:
+            resampled_features = resampling(dggs_layer, resampled_features, resample_fields, feedback, create_sink, method)
+        elif create_sink and resampled_features:
+            resampled_features = write_layer(resampled_features, create_sink)
+    return resampled_features
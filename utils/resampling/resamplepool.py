@@ -0,0 +1,95 @@
+import os, sys, platform
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import shapely
+from shapely import STRtree
+from ..conversion.cellpolygon import cell_polygon, GRID_DGGS
+from .weighttable import overlap_weights, aggregate_overlaps
+
+# Worker side of chunked resampling. Nothing here imports QGIS: a spawned worker imports
+# this module, cellpolygon and weighttable only, so it starts on a plain Python
+# interpreter, inside or outside QGIS.
+
+POOL_START_TIMEOUT = 60
+
+##########################
+# Partition worker
+# ########################
+def resample_partition(task):
+    """
+    Decode the target cells of a partition and reduce the source cells shipped with them.
+    Returns (cell_id, cell WKB, cell attributes, resampled values) for the target cells
+    that overlap a source cell.
+    """
+    dggs_type, method, cell_ids, source_wkbs, source_values = task
+    if not len(source_wkbs):
+        return []
+    source_geoms = shapely.from_wkb(source_wkbs)
+    source_areas = shapely.area(source_geoms)
+    cells = []
+    for cell_id in cell_ids:
+        cell = cell_polygon(dggs_type, cell_id, GRID_DGGS.get(dggs_type))
+        if cell:
+            cells.append((cell_id,) + tuple(cell))
+    if not cells:
+        return []
+    target_geoms = np.array([cell[1] for cell in cells], dtype=object)
+    target_index, source_index, weights = overlap_weights(target_geoms, STRtree(source_geoms), source_geoms, source_areas)
+    resampled_values = aggregate_overlaps(method, target_index, source_index, weights, source_areas, source_values, len(cells))
+    intersected = np.bincount(target_index, minlength=len(cells)) > 0
+    return [
+        (cell_id, shapely.to_wkb(polygon), attributes, resampled_row)
+        for (cell_id, polygon, attributes), resampled_row, has_parts in zip(cells, resampled_values.tolist(), intersected.tolist())
+        if has_parts
+    ]
+
+def pool_ready():
+    return os.getpid()
+
+
+##########################
+# Process pool
+# ########################
+def python_executable():
+    """
+    Python interpreter to spawn workers with, or None. Inside QGIS sys.executable is the
+    QGIS binary, which must never be spawned, so the interpreter QGIS embeds is looked up
+    under sys.exec_prefix.
+    """
+    if os.path.basename(sys.executable).lower().startswith('python'):
+        return sys.executable
+    if platform.system() == 'Windows':
+        names = ['pythonw.exe', 'python.exe']
+    else:
+        names = [f"bin/python{sys.version_info.major}.{sys.version_info.minor}", f"bin/python{sys.version_info.major}"]
+    for name in names:
+        path = os.path.join(sys.exec_prefix, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def start_process_pool(workers, feedback=None):
+    """
+    Spawned process pool with a worker known to be up, or None when no pool can be
+    started here (no Python interpreter found, or the first worker fails or times out).
+    """
+    executable = python_executable()
+    if executable is None:
+        if feedback:
+            feedback.pushInfo("No Python interpreter found to start worker processes.")
+        return None
+    # Spawned rather than forked: forking the multi-threaded QGIS process is unsafe
+    context = multiprocessing.get_context('spawn')
+    context.set_executable(executable)
+    executor = None
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        executor.submit(pool_ready).result(timeout=POOL_START_TIMEOUT)
+    except Exception as e:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if feedback:
+            feedback.pushInfo(f"Worker processes could not be started ({e!r}).")
+        return None
+    return executor
@@ -0,0 +1,222 @@
+import json, os, sqlite3
+import numpy as np
+import shapely
+from shapely import STRtree
+try:
+    # Sparse matrix product when scipy is available
+    from scipy.sparse import csr_matrix
+except ImportError:
+    csr_matrix = None
+
+WEIGHT_TABLE_VERSION = 1
+WEIGHT_BATCH_SIZE = 1000
+
+##########################
+# Overlap weights
+# ########################
+def overlap_weights(target_geoms, source_tree, source_geoms, source_areas):
+    """
+    Overlaps of target cells with source cells found through the source STRtree, as
+    (target_index, source_index, weight) arrays; weight is the share of the source
+    cell's area that falls inside the target cell. Cells that only share an edge or a
+    corner do not overlap.
+    """
+    target_index, source_index = source_tree.query(target_geoms, predicate='intersects')
+    areas = shapely.area(shapely.intersection(target_geoms[target_index], source_geoms[source_index]))
+    overlapping = areas > 0
+    target_index, source_index = target_index[overlapping], source_index[overlapping]
+    return target_index, source_index, areas[overlapping] / source_areas[source_index]
+
+def weighted_sums(target_index, source_index, weights, values, target_count):
+    """(target_count, k) sums of (n, k) source values scaled by weights, all columns in one pass."""
+    contributions = values[source_index] * weights[:, None]
+    # Added onto a float array: bincount of an empty index returns integers even with float weights
+    sums = np.zeros((target_count, values.shape[1]))
+    for column in range(values.shape[1]):
+        sums[:, column] += np.bincount(target_index, weights=contributions[:, column], minlength=target_count)
+    return sums
+
+
+##########################
+# Overlap aggregation
+# ########################
+RESAMPLE_METHODS = ['sum', 'mean', 'min', 'max', 'majority', 'count']
+NUMERIC_RESAMPLE_METHODS = ('sum', 'mean', 'min', 'max')
+
+def missing_values(values):
+    """Mask of the missing entries: NaN in float arrays, None in object arrays."""
+    if values.dtype == object:
+        return np.vectorize(lambda value: value is None, otypes=[bool])(values).reshape(values.shape)
+    return np.isnan(values)
+
+def majority_values(target_index, areas, column, target_count):
+    """Per target, the value of column covering the largest overlap area (None where there is none)."""
+    result = np.full(target_count, None, dtype=object)
+    present = ~missing_values(column)
+    if not present.any():
+        return result
+    codes, categories = {}, []
+    for value in column[present].tolist():
+        if value not in codes:
+            codes[value] = len(categories)
+            categories.append(value)
+    category_index = np.array([codes[value] for value in column[present].tolist()], dtype=np.int64)
+    # Group by (target, category) on a combined key, then keep the largest area per target
+    keys, inverse = np.unique(target_index[present] * len(categories) + category_index, return_inverse=True)
+    key_areas = np.bincount(np.ravel(inverse), weights=areas[present])
+    key_targets = keys // len(categories)
+    order = np.lexsort((-key_areas, key_targets))
+    first = order[np.r_[True, np.diff(key_targets[order]) != 0]]
+    result[key_targets[first]] = np.array(categories, dtype=object)[keys[first] % len(categories)]
+    return result
+
+def aggregate_overlaps(method, target_index, source_index, fractions, source_areas, values, target_count):
+    """
+    (target_count, k) reduction of (n, k) source values over the overlaps of each target
+    cell: sum (area-proportional share, for counts and totals), mean (weighted by overlap
+    area, for densities and rates), min, max, majority (value covering the largest
+    overlap area, any type) or count (overlapping cells with a value). Missing values are
+    ignored; targets without any get NaN (None for majority).
+    """
+    values = values[source_index]
+    missing = missing_values(values)
+    if method == 'majority':
+        areas = fractions * source_areas[source_index]
+        return np.column_stack([
+            majority_values(target_index, areas, values[:, column], target_count) for column in range(values.shape[1])
+        ]).reshape(target_count, values.shape[1])
+
+    present = np.column_stack([
+        np.bincount(target_index, weights=~missing[:, column], minlength=target_count) for column in range(values.shape[1])
+    ]).reshape(target_count, values.shape[1])
+    if method == 'count':
+        return present.astype(np.int64)
+
+    values = np.where(missing, np.nan, values).astype(float)
+    if method == 'sum':
+        result = weighted_sums(target_index, np.arange(len(values)), fractions, np.where(missing, 0., values), target_count)
+    elif method == 'mean':
+        areas = fractions * source_areas[source_index]
+        totals = weighted_sums(target_index, np.arange(len(values)), areas, np.where(missing, 0., values), target_count)
+        weights = weighted_sums(target_index, np.arange(len(values)), areas, (~missing).astype(float), target_count)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = totals / weights
+    elif method in ('min', 'max'):
+        fill = np.inf if method == 'min' else -np.inf
+        reduce = np.minimum if method == 'min' else np.maximum
+        result = np.full((target_count, values.shape[1]), fill)
+        reduce.at(result, target_index, np.where(missing, fill, values))
+    else:
+        raise ValueError(f"Unsupported resampling method: {method}")
+    result[present == 0] = np.nan
+    return result
+
+
+class OverlapWeights:
+    """
+    Sparse weight table between two DGGS grids: one (from_id, to_id, fraction) row per
+    overlapping pair of cells, fraction being the share of the from cell's area inside
+    the to cell. The table depends only on the grids, so it can be saved once and
+    applied to any number of value columns.
+    """
+    def __init__(self, key, from_ids, to_ids, from_index, to_index, fractions):
+        self.key = key
+        self.from_ids = list(from_ids)
+        self.to_ids = list(to_ids)
+        self.from_index = np.asarray(from_index, dtype=np.int64)
+        self.to_index = np.asarray(to_index, dtype=np.int64)
+        self.fractions = np.asarray(fractions, dtype=float)
+        self._matrix = None
+
+    @classmethod
+    def build(cls, key, from_ids, from_geoms, to_ids, to_geoms, feedback=None):
+        from_geoms = np.asarray(from_geoms, dtype=object)
+        to_geoms = np.asarray(to_geoms, dtype=object)
+        from_tree = STRtree(from_geoms)
+        from_areas = shapely.area(from_geoms)
+        from_index, to_index, fractions = [], [], []
+        for start in range(0, len(to_geoms), WEIGHT_BATCH_SIZE):
+            if feedback:
+                if feedback.isCanceled():
+                    return None
+                feedback.setProgress(int(start / len(to_geoms) * 100))
+            target_index, source_index, weights = overlap_weights(to_geoms[start:start + WEIGHT_BATCH_SIZE], from_tree, from_geoms, from_areas)
+            to_index.append(target_index + start)
+            from_index.append(source_index)
+            fractions.append(weights)
+        if not fractions:
+            return cls(key, from_ids, to_ids, [], [], [])
+        return cls(key, from_ids, to_ids, np.concatenate(from_index), np.concatenate(to_index), np.concatenate(fractions))
+
+    def source_positions(self, from_ids):
+        """Table position of each source ID, or None when the table does not cover them all."""
+        lookup = {from_id: i for i, from_id in enumerate(self.from_ids)}
+        positions = [lookup.get(from_id) for from_id in from_ids]
+        if None in positions:
+            return None
+        return np.array(positions, dtype=np.int64)
+
+    def apply(self, values):
+        """(len(to_ids), k) area-weighted sums of (len(from_ids), k) source values."""
+        values = np.asarray(values, dtype=float).reshape(len(self.from_ids), -1)
+        if csr_matrix is not None:
+            if self._matrix is None:
+                self._matrix = csr_matrix((self.fractions, (self.to_index, self.from_index)),
+                                          shape=(len(self.to_ids), len(self.from_ids)))
+            return np.asarray(self._matrix @ values)
+        return weighted_sums(self.to_index, self.from_index, self.fractions, values, len(self.to_ids))
+
+    def aggregate(self, method, values, from_areas):
+        """
+        (len(to_ids), k) reduction of (len(from_ids), k) source values with a resampling
+        method (see aggregate_overlaps); sums go through the sparse product.
+        """
+        if method != 'sum':
+            return aggregate_overlaps(method, self.to_index, self.from_index, self.fractions, from_areas, values, len(self.to_ids))
+        missing = np.isnan(values)
+        result = self.apply(np.where(missing, 0., values))
+        result[self.apply(~missing) == 0] = np.nan
+        return result
+
+    def covered(self, present):
+        """Flags of the to cells overlapping at least one present from cell."""
+        return np.bincount(self.to_index, weights=present[self.from_index], minlength=len(self.to_ids)) > 0
+
+    def save(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE weight_meta (name TEXT PRIMARY KEY, value TEXT)")
+            connection.execute("CREATE TABLE overlap_weights (from_id TEXT, to_id TEXT, fraction REAL)")
+            connection.executemany("INSERT INTO weight_meta VALUES (?, ?)", [
+                ('version', str(WEIGHT_TABLE_VERSION)),
+                ('key', json.dumps(self.key, sort_keys=True)),
+                ('from_ids', json.dumps(self.from_ids))
+            ])
+            connection.executemany("INSERT INTO overlap_weights VALUES (?, ?, ?)", zip(
+                (self.from_ids[i] for i in self.from_index.tolist()),
+                (self.to_ids[i] for i in self.to_index.tolist()),
+                self.fractions.tolist()
+            ))
+        connection.close()
+
+    @classmethod
+    def load(cls, path, key):
+        """The table saved at path, or None when there is none or it was built for another key."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            connection = sqlite3.connect(path)
+            try:
+                meta = dict(connection.execute("SELECT name, value FROM weight_meta"))
+                if meta.get('version') != str(WEIGHT_TABLE_VERSION) or meta.get('key') != json.dumps(key, sort_keys=True):
+                    return None
+                rows = connection.execute("SELECT from_id, to_id, fraction FROM overlap_weights").fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return None
+        from_ids = json.loads(meta['from_ids'])
+        lookup = {from_id: i for i, from_id in enumerate(from_ids)}
+        to_ids, to_index = np.unique(np.array([row[1] for row in rows], dtype=object), return_inverse=True) if rows else ([], [])
+        return cls(key, from_ids, list(to_ids), [lookup[row[0]] for row in rows], np.ravel(to_index), [row[2] for row in rows])